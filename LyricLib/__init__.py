@@ -15,8 +15,62 @@ Terms & Conditions: License.md in the root directory
 # Email TriM-Organization@hotmail.com
 # 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
 
-from .main import Lyric
-from .subclass import TimeStamp, SubtitleBlock, MetaInfo
+from importlib import import_module
+
+from .main import Lyric, FrozenLyric
+from .subclass import (
+    TimeStamp,
+    SubtitleBlock,
+    FrozenSubtitleBlock,
+    MetaInfo,
+    FrozenMetaInfo,
+)
+from .types import SortedDict, SortedWindow
+from .limits import ParseLimits, SERVICE_PARSE_LIMITS
+from .textpool import TextPool, DEFAULT_TEXT_POOL
+from .karaoke import KaraokeTrack, KaraokeWord
+from .wordtiming import split_words, fill_word_timing, fill_word_timing_files
+from .durations import infer_durations
+from .render import SubtitleRenderer, FrameSequence, fit_block, fit_lyric
+from .header import (
+    read_lrc_meta,
+    read_lrc_meta_files,
+    patch_lrc_header,
+    patch_lrc_headers,
+)
+from .formats import (
+    load,
+    loads,
+    dump,
+    dumps,
+    sniff_format,
+    decode_bytes,
+    register_format,
+    LyricFormat,
+)
+from .columnar import (
+    iter_columns,
+    iter_record_batches,
+    write_parquet,
+    write_arrow,
+    to_numpy,
+)
+from .aio import afrom_lrc, ato_lrc, agather_lrc
+from .instrument import (
+    PipelineMetrics,
+    PipelineObserver,
+    LoggingObserver,
+    add_observer,
+    remove_observer,
+)
+from .validate import (
+    ValidationIssue,
+    ValidationReport,
+    validate_lyric,
+    validate_lrc_file,
+    validate_lrc_files,
+)
+from .lrc.tags import ID_TAGS, register_id_tag, unregister_id_tag
 from .lrc.constants import (
     LRC_ID_TAG2META_NAME,
     STABLE_LRC_TIME_FORMAT_STYLE,
@@ -31,13 +85,92 @@ __all__ = [
     #
     # 主类
     "Lyric",
+    "FrozenLyric",
     #
     # 副类
     "TimeStamp",
     "SubtitleBlock",
+    "FrozenSubtitleBlock",
     "MetaInfo",
+    "FrozenMetaInfo",
+    "SortedDict",
+    "SortedWindow",
+    "ParseLimits",
+    "TextPool",
+    "KaraokeTrack",
+    "KaraokeWord",
+    #
+    # 检查
+    "ValidationIssue",
+    "ValidationReport",
+    "validate_lyric",
+    "validate_lrc_file",
+    "validate_lrc_files",
+    #
+    # ID 标签
+    "register_id_tag",
+    "unregister_id_tag",
+    #
+    # 文件头
+    "read_lrc_meta",
+    "read_lrc_meta_files",
+    "patch_lrc_header",
+    "patch_lrc_headers",
+    #
+    # 格式
+    "LyricFormat",
+    "load",
+    "loads",
+    "dump",
+    "dumps",
+    "sniff_format",
+    "decode_bytes",
+    "register_format",
+    #
+    # 列式导出
+    "iter_columns",
+    "iter_record_batches",
+    "write_parquet",
+    "write_arrow",
+    "to_numpy",
+    #
+    # 存储
+    "LyricStore",
+    "LineHit",
+    #
+    # 压缩包
+    "iter_archive",
+    "iter_archive_lyrics",
+    "load_archive",
+    #
+    # 异步
+    "afrom_lrc",
+    "ato_lrc",
+    "agather_lrc",
+    #
+    # 计量
+    "PipelineMetrics",
+    "PipelineObserver",
+    "LoggingObserver",
+    "add_observer",
+    "remove_observer",
+    #
+    # 字词时间
+    "split_words",
+    "fill_word_timing",
+    "fill_word_timing_files",
+    "infer_durations",
+    #
+    # 渲染
+    "SubtitleRenderer",
+    "FrameSequence",
+    "fit_block",
+    "fit_lyric",
     #
     # 常量
+    "SERVICE_PARSE_LIMITS",
+    "DEFAULT_TEXT_POOL",
+    "ID_TAGS",
     "LRC_ID_TAG2META_NAME",
     "STABLE_LRC_TIME_FORMAT_STYLE",
     "LRC_TAG_PATTERN",
@@ -46,3 +179,25 @@ __all__ = [
     "LRC_ENHANCE_TIME_PATTERN_N",
 ]
 __author__ = (("金羿", "Eilles"), ("Baby2016", "Baby2016"), ("thecasttim", "thecasttim"))
+
+_LAZY_EXPORTS = {
+    "LyricStore": ".store",
+    "LineHit": ".store",
+    "iter_archive": ".archive",
+    "iter_archive_lyrics": ".archive",
+    "load_archive": ".archive",
+}
+"""首次取用时才载入的名称及其所在模块，以免 import LyricLib 时载入 sqlite3 等"""
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+"""
+供 asyncio 使用的歌词读写接口
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import io
+import os
+import codecs
+import asyncio
+from concurrent.futures import Executor
+from typing import Dict, Iterable, Optional, Union, TYPE_CHECKING
+
+from .limits import ParseLimits
+from .lrc.constants import STABLE_LRC_TIME_FORMAT_STYLE
+
+if TYPE_CHECKING:
+    from .main import Lyric
+
+
+def _read_lrc_text(
+    lrc_path: str, lrc_encoding: str, limits: Optional[ParseLimits]
+) -> str:
+    """读入歌词文件，于线程中执行"""
+    if limits is not None:
+        limits.check("max_bytes", os.path.getsize(lrc_path))
+    with codecs.open(lrc_path, "r", encoding=lrc_encoding) as f:
+        return f.read()
+
+
+def _parse_lrc_text(lrc_raw_text: str, options: dict) -> "Lyric":
+    """解析歌词文本，可于进程池中执行"""
+    from .main import Lyric
+
+    return Lyric.from_lrc_str(lrc_raw_text, **options)
+
+
+def _dump_lrc_text(lyric: "Lyric", options: dict) -> str:
+    """将歌词写为文本，可于进程池中执行"""
+    buffer = io.StringIO()
+    lyric.to_lrc(buffer, **options)
+    return buffer.getvalue()
+
+
+def _write_text(path: str, text: str, encoding: str):
+    """写入文件，于线程中执行"""
+    with open(path, "w", encoding=encoding) as f:
+        f.write(text)
+
+
+async def afrom_lrc(
+    lrc_path: str,
+    lrc_encoding: str = "utf-8",
+    executor: Optional[Executor] = None,
+    limits: Optional[ParseLimits] = None,
+    **options,
+) -> "Lyric":
+    """
+    异步地从LRC歌词文件获取歌词对象
+
+    文件于默认线程池中读入，解析交由 executor 执行，均不阻塞事件循环
+
+    Parameters
+    ----------
+    lrc_path: str
+        LRC歌词文件地址
+    lrc_encoding: str
+        LRC歌词文件所使用的字符编码
+    executor: Executor, optional
+        执行解析的执行器，为 None 时使用事件循环的默认线程池；
+        传入 ProcessPoolExecutor 可使解析不受全局解释器锁的限制，
+        此时 text_pool 与 observer 仅在子进程中生效
+    limits: ParseLimits, optional
+        解析时的资源上限，读入前先以文件大小判断
+    options:
+        传给 Lyric.from_lrc_str 的其余参数
+
+    Returns
+    -------
+    Lyric
+        歌词对象
+    """
+    loop = asyncio.get_running_loop()
+    lrc_raw_text = await loop.run_in_executor(
+        None, _read_lrc_text, lrc_path, lrc_encoding, limits
+    )
+    return await loop.run_in_executor(
+        executor,
+        _parse_lrc_text,
+        lrc_raw_text,
+        dict(options, limits=limits),
+    )
+
+
+async def ato_lrc(
+    lyric: "Lyric",
+    lrc_path: str,
+    lrc_encoding: str = "utf-8",
+    executor: Optional[Executor] = None,
+    time_format_style: str = STABLE_LRC_TIME_FORMAT_STYLE,
+    **options,
+):
+    """
+    异步地将歌词保存为LRC文件
+
+    歌词交由 executor 写为文本，再于默认线程池中写入文件
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象，写出期间请勿修改
+    lrc_path: str
+        LRC歌词文件地址
+    lrc_encoding: str
+        LRC歌词文件所使用的字符编码
+    executor: Executor, optional
+        执行写出的执行器，为 None 时使用事件循环的默认线程池
+    time_format_style: str
+        时间标签的格式
+    options:
+        传给 Lyric.to_lrc 的其余参数
+    """
+    loop = asyncio.get_running_loop()
+    text = await loop.run_in_executor(
+        executor,
+        _dump_lrc_text,
+        lyric,
+        dict(options, time_format_style=time_format_style),
+    )
+    await loop.run_in_executor(None, _write_text, lrc_path, text, lrc_encoding)
+
+
+async def agather_lrc(
+    lrc_paths: Iterable[str],
+    limit: int = 8,
+    lrc_encoding: str = "utf-8",
+    executor: Optional[Executor] = None,
+    return_exceptions: bool = False,
+    **options,
+) -> Dict[str, Union["Lyric", BaseException]]:
+    """
+    异步地批量读入LRC歌词文件，同时进行的读入不超过 limit 个
+
+    Parameters
+    ----------
+    lrc_paths: Iterable[str]
+        LRC歌词文件地址
+    limit: int
+        同时进行的读入数
+    lrc_encoding: str
+        LRC歌词文件所使用的字符编码
+    executor: Executor, optional
+        执行解析的执行器，参见 afrom_lrc
+    return_exceptions: bool
+        为 True 时，出错的文件以其异常对应；否则遇到首个错误即抛出
+    options:
+        传给 afrom_lrc 的其余参数
+
+    Returns
+    -------
+    Dict[str, Lyric | BaseException]
+        以文件地址对应其歌词对象
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def load(lrc_path: str) -> "Lyric":
+        async with semaphore:
+            return await afrom_lrc(lrc_path, lrc_encoding, executor, **options)
+
+    lrc_paths = list(lrc_paths)
+    results = await asyncio.gather(
+        *(load(path) for path in lrc_paths), return_exceptions=return_exceptions
+    )
+    return dict(zip(lrc_paths, results))
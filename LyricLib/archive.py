@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+
+"""
+直接由 zip、tar（含 tar.gz 等）与 gzip 压缩包读入歌词，无需先解压到磁盘
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import os
+import gzip
+import tarfile
+import zipfile
+import traceback
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+from .exceptions import InvalidFileError, UnsupportedFormatError
+from .formats import decode_bytes, formats, loads
+from .limits import ParseLimits
+
+if TYPE_CHECKING:
+    from .main import Lyric
+
+DEFAULT_BATCH_MEMBERS = 64
+"""启用进程池时每次分派给子进程的成员数"""
+
+Member = Tuple[str, bytes]
+"""压缩包中的一个成员：(成员名称, 内容)"""
+
+Reader = Tuple[str, Callable[[], bytes]]
+"""压缩包中的一个成员：(成员名称, 读出其内容的函数)"""
+
+_WorkerResult = List[Tuple[str, Optional["Lyric"], Union[str, BaseException, None]]]
+"""一批成员的结果：(成员名称, 歌词对象, 子进程中的错误信息或本进程中的异常)"""
+
+
+def archive_kind(path: str) -> str:
+    """
+    判断压缩包的种类
+
+    Parameters
+    ----------
+    path: str
+        压缩包地址
+
+    Returns
+    -------
+    str
+        "zip"、"tar" 或 "gzip"
+
+    Raises
+    ------
+    UnsupportedFormatError
+        不是受支持的压缩包
+    """
+    if zipfile.is_zipfile(path):
+        return "zip"
+    if tarfile.is_tarfile(path):
+        return "tar"
+    with open(path, "rb") as f:
+        if f.read(2) == b"\x1f\x8b":
+            return "gzip"
+    raise UnsupportedFormatError(os.path.splitext(path)[1] or os.path.basename(path))
+
+
+def _readable_suffixes() -> FrozenSet[str]:
+    """注册表中可以读入的格式的扩展名"""
+    return frozenset(
+        extension
+        for lyric_format in formats().values()
+        if lyric_format.module is not None
+        for extension in lyric_format.extensions
+    )
+
+
+def _wanted(name: str, suffixes: Optional[FrozenSet[str]]) -> bool:
+    """是否读入此成员：跳过目录、隐藏文件与 macOS 的附属文件，并按扩展名筛选"""
+    base = name.rsplit("/", 1)[-1]
+    if not base or base.startswith(".") or name.startswith("__MACOSX/"):
+        return False
+    return suffixes is None or os.path.splitext(base)[1].lower() in suffixes
+
+
+def _normalize_suffixes(
+    suffixes: Optional[Iterable[str]], all_members: bool
+) -> Optional[FrozenSet[str]]:
+    if all_members:
+        return None
+    if suffixes is None:
+        return _readable_suffixes()
+    return frozenset(
+        suffix.lower() if suffix.startswith(".") else "." + suffix.lower()
+        for suffix in suffixes
+    )
+
+
+def _zip_name(info: zipfile.ZipInfo) -> str:
+    """成员名称；未标明 UTF-8 的名称按 utf-8、gb18030 的顺序重新解码"""
+    if info.flag_bits & 0x800:
+        return info.filename
+    try:
+        return decode_bytes(info.filename.encode("cp437"))[0]
+    except (UnicodeEncodeError, InvalidFileError):
+        return info.filename
+
+
+def _check_size(limits: Optional[ParseLimits], size: int):
+    if limits is not None:
+        limits.check("max_bytes", size)
+
+
+def _zip_readers(
+    archive: zipfile.ZipFile,
+    suffixes: Optional[FrozenSet[str]],
+    limits: Optional[ParseLimits],
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Iterator[Reader]:
+    for info in archive.infolist()[start:stop]:
+        name = _zip_name(info)
+        if info.is_dir() or not _wanted(name, suffixes):
+            continue
+
+        def read(info: zipfile.ZipInfo = info) -> bytes:
+            _check_size(limits, info.file_size)
+            return archive.read(info)
+
+        yield name, read
+
+
+def _tar_readers(
+    path: str, suffixes: Optional[FrozenSet[str]], limits: Optional[ParseLimits]
+) -> Iterator[Reader]:
+    # 以流模式顺序读取，压缩的 tar 无需回溯；各成员须在取下一个成员之前读出
+    with tarfile.open(path, "r|*") as archive:
+        for member in archive:
+            if not member.isfile() or not _wanted(member.name, suffixes):
+                continue
+
+            def read(member: tarfile.TarInfo = member) -> bytes:
+                _check_size(limits, member.size)
+                f = archive.extractfile(member)
+                return b"" if f is None else f.read()
+
+            yield member.name, read
+
+
+def _gzip_readers(
+    path: str, suffixes: Optional[FrozenSet[str]], limits: Optional[ParseLimits]
+) -> Iterator[Reader]:
+    name = os.path.basename(path)
+    if name.lower().endswith(".gz"):
+        name = name[:-3]
+    if not _wanted(name, suffixes):
+        return
+
+    def read() -> bytes:
+        with gzip.open(path, "rb") as f:
+            if limits is None or limits.max_bytes is None:
+                return f.read()
+            # 解压后的大小事先无从得知，至多多读一个字节以判断是否超出
+            data = f.read(limits.max_bytes + 1)
+        _check_size(limits, len(data))
+        return data
+
+    yield name, read
+
+
+def _readers(
+    path: str, suffixes: Optional[FrozenSet[str]], limits: Optional[ParseLimits]
+) -> Iterator[Reader]:
+    """按成员顺序给出各成员的名称与读出函数"""
+    kind = archive_kind(path)
+    if kind == "zip":
+        with zipfile.ZipFile(path) as archive:
+            yield from _zip_readers(archive, suffixes, limits)
+    elif kind == "tar":
+        yield from _tar_readers(path, suffixes, limits)
+    else:
+        yield from _gzip_readers(path, suffixes, limits)
+
+
+def iter_archive(
+    path: Union[str, "os.PathLike[str]"],
+    suffixes: Optional[Iterable[str]] = None,
+    all_members: bool = False,
+    limits: Optional[ParseLimits] = None,
+) -> Iterator[Member]:
+    """
+    逐个读出压缩包中的成员，同一时刻仅有一个成员的内容在内存中
+
+    Parameters
+    ----------
+    path: str | PathLike
+        压缩包地址，zip、tar（含 tar.gz、tar.bz2、tar.xz）或单个文件的 gzip
+    suffixes: Iterable[str], optional
+        仅读出这些扩展名的成员；缺省时为格式注册表中可以读入的格式的扩展名
+    all_members: bool
+        为 True 时不按扩展名筛选
+    limits: ParseLimits, optional
+        读出之前先以成员大小与 max_bytes 比较，超出则抛出 LimitExceededError
+
+    Returns
+    -------
+    Iterator[Tuple[str, bytes]]
+        (成员名称, 内容)，按成员在压缩包中的顺序
+    """
+    path = os.fspath(path)
+    for name, read in _readers(
+        path, _normalize_suffixes(suffixes, all_members), limits
+    ):
+        yield name, read()
+
+
+def _load_member(
+    name: str,
+    data: bytes,
+    fmt: Optional[str],
+    encoding: Optional[str],
+    options: dict,
+) -> "Lyric":
+    """经字节解码与格式识别解析一个成员"""
+    return loads(data, fmt, encoding, name, **options)
+
+
+def _error_text(error: BaseException) -> str:
+    return "".join(traceback.format_exception_only(type(error), error)).strip()
+
+
+def _member_error(name: str, error: BaseException) -> InvalidFileError:
+    """
+    成员的错误：InvalidFileError 及其子类原样给出，其余以 InvalidFileError 转述，
+    使启用进程池与否时出错的成员均得到 InvalidFileError
+    """
+    if isinstance(error, InvalidFileError):
+        return error
+    wrapped = InvalidFileError(name, _error_text(error))
+    wrapped.__cause__ = error
+    return wrapped
+
+
+def _load_batch(
+    members: List[Member],
+    fmt: Optional[str],
+    encoding: Optional[str],
+    options: dict,
+) -> _WorkerResult:
+    """解析一批成员，于子进程中执行；错误以文本带回，以免异常对象无法还原"""
+    results: _WorkerResult = []
+    for name, data in members:
+        try:
+            results.append(
+                (name, _load_member(name, data, fmt, encoding, options), None)
+            )
+        except Exception as error:
+            results.append((name, None, _error_text(error)))
+    return results
+
+
+def _load_zip_range(
+    path: str,
+    start: int,
+    stop: int,
+    suffixes: Optional[FrozenSet[str]],
+    fmt: Optional[str],
+    encoding: Optional[str],
+    options: dict,
+) -> _WorkerResult:
+    """子进程自行打开 zip，读出并解析第 start 至 stop 个成员，免去传递成员内容"""
+    results: _WorkerResult = []
+    with zipfile.ZipFile(path) as archive:
+        for name, read in _zip_readers(
+            archive, suffixes, options.get("limits"), start, stop
+        ):
+            try:
+                lyric = _load_member(name, read(), fmt, encoding, options)
+            except Exception as error:
+                results.append((name, None, _error_text(error)))
+            else:
+                results.append((name, lyric, None))
+    return results
+
+
+def iter_archive_lyrics(
+    path: Union[str, "os.PathLike[str]"],
+    fmt: Optional[str] = None,
+    encoding: Optional[str] = None,
+    suffixes: Optional[Iterable[str]] = None,
+    max_workers: Optional[int] = 1,
+    batch_members: int = DEFAULT_BATCH_MEMBERS,
+    return_exceptions: bool = False,
+    **options,
+) -> Iterator[Tuple[str, Union["Lyric", BaseException]]]:
+    """
+    逐个解析压缩包中的歌词，按成员顺序给出
+
+    每个成员的内容均经 decode_bytes 判断编码、经 sniff_format 识别格式后解析；
+    结果可直接交给 LyricStore.add_many 或 iter_columns 等批量接口
+
+    启用进程池时按成员范围分派：zip 由各子进程自行打开并读出所分得的范围，
+    tar 与 gzip 只能顺序读取，由本进程读出后按批分派；
+    同时在途的批数不超过进程数的两倍，内存占用与压缩包大小无关
+
+    Parameters
+    ----------
+    path: str | PathLike
+        压缩包地址
+    fmt: str, optional
+        格式名称，缺省时逐个识别
+    encoding: str, optional
+        成员的字符编码，缺省时逐个判断
+    suffixes: Iterable[str], optional
+        仅解析这些扩展名的成员，参见 iter_archive
+    max_workers: int, optional
+        进程数，为 1 时不启用进程池，为 None 时按处理器数
+    batch_members: int
+        每次分派给子进程的成员数
+    return_exceptions: bool
+        为 True 时，出错的成员以其异常对应；否则遇到首个错误即抛出。
+        无论是否启用进程池，异常均为 InvalidFileError 或其子类：
+        超出解析限制、无法读取等其余错误，以及子进程中的错误，
+        均以带有原错误信息的 InvalidFileError 转述
+    options:
+        传给各格式 loads 的其余参数，如 strict、limits
+
+    Returns
+    -------
+    Iterator[Tuple[str, Lyric | BaseException]]
+        (成员名称, 歌词对象)
+    """
+    path = os.fspath(path)
+    wanted = _normalize_suffixes(suffixes, False)
+    limits = options.get("limits")
+
+    if max_workers == 1:
+        for name, read in _readers(path, wanted, limits):
+            try:
+                yield name, _load_member(name, read(), fmt, encoding, options)
+            except Exception as error:
+                failure = _member_error(name, error)
+                if not return_exceptions:
+                    if failure is error:
+                        raise
+                    raise failure from error
+                yield name, failure
+        return
+
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Future] = deque()
+
+        def submit_batches() -> Iterator[Future]:
+            if archive_kind(path) == "zip":
+                with zipfile.ZipFile(path) as archive:
+                    count = len(archive.infolist())
+                for start in range(0, count, batch_members):
+                    yield executor.submit(
+                        _load_zip_range,
+                        path,
+                        start,
+                        min(start + batch_members, count),
+                        wanted,
+                        fmt,
+                        encoding,
+                        options,
+                    )
+                return
+            batch: List[Member] = []
+            for name, read in _readers(path, wanted, limits):
+                try:
+                    batch.append((name, read()))
+                except Exception as error:
+                    # 本进程中读出失败的成员不经子进程，以已完成的结果占住其次序
+                    if batch:
+                        yield executor.submit(
+                            _load_batch, batch, fmt, encoding, options
+                        )
+                        batch = []
+                    failed: Future = Future()
+                    failed.set_result([(name, None, error)])
+                    yield failed
+                    continue
+                if len(batch) >= batch_members:
+                    yield executor.submit(_load_batch, batch, fmt, encoding, options)
+                    batch = []
+            if batch:
+                yield executor.submit(_load_batch, batch, fmt, encoding, options)
+
+        def drain() -> Iterator[Tuple[str, Union["Lyric", BaseException]]]:
+            for name, lyric, message in pending.popleft().result():
+                if message is None:
+                    yield name, lyric  # type: ignore
+                    continue
+                error = (
+                    _member_error(name, message)
+                    if isinstance(message, BaseException)
+                    else InvalidFileError(name, message)
+                )
+                if not return_exceptions:
+                    raise error
+                yield name, error
+
+        for future in submit_batches():
+            pending.append(future)
+            if len(pending) >= window:
+                yield from drain()
+        while pending:
+            yield from drain()
+
+
+def load_archive(
+    path: Union[str, "os.PathLike[str]"],
+    fmt: Optional[str] = None,
+    encoding: Optional[str] = None,
+    suffixes: Optional[Iterable[str]] = None,
+    max_workers: Optional[int] = None,
+    batch_members: int = DEFAULT_BATCH_MEMBERS,
+    return_exceptions: bool = False,
+    **options,
+) -> Dict[str, Union["Lyric", BaseException]]:
+    """
+    解析压缩包中的全部歌词
+
+    参数同 iter_archive_lyrics，但 max_workers 缺省时启用进程池
+
+    Returns
+    -------
+    Dict[str, Lyric | BaseException]
+        以成员名称对应其歌词对象
+    """
+    return dict(
+        iter_archive_lyrics(
+            path,
+            fmt,
+            encoding,
+            suffixes,
+            max_workers,
+            batch_members,
+            return_exceptions,
+            **options,
+        )
+    )
@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+
+"""
+将大量歌词展开为列式表格，分批写入 Parquet、Arrow IPC 或 NumPy 结构化数组，供数据分析使用
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import importlib
+from types import ModuleType
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    from .main import Lyric
+
+LINE_COLUMNS = (
+    "song_id",
+    "line_index",
+    "row",
+    "start_ms",
+    "duration_ms",
+    "text",
+    "word_start_ms",
+)
+"""
+行表的各列，每条记录为一句中的一行
+- song_id 歌曲标识
+- line_index 此句在歌曲中按时间顺序的序号，自 0 起
+- row 此行在句中的序号，自 0 起；中西对照时译文为第 1 行
+- start_ms 此句的开始时间（毫秒）
+- duration_ms 此句的持续时间（毫秒），未设置时为空（NumPy 中为 -1）
+- text 此行的文本
+- word_start_ms 此行各字词的开始时间（毫秒），无字词标签时为空列表
+"""
+
+WORD_COLUMNS = ("song_id", "line_index", "row", "word_index", "start_ms", "text")
+"""
+字词表的各列，每条记录为一个带时间标签的字词
+- song_id、line_index、row 同行表
+- word_index 此字词在行中的序号，自 0 起
+- start_ms 此字词的开始时间（毫秒）
+- text 此字词的文本
+"""
+
+DEFAULT_BATCH_ROWS = 65536
+"""每批的记录数"""
+
+Columns = Dict[str, List[Any]]
+"""一批记录，以列名对应其各值"""
+
+SongsLike = Union[Mapping[Any, "Lyric"], Iterable[Tuple[Any, "Lyric"]]]
+"""歌曲：以歌曲标识对应歌词的映射，或 (歌曲标识, 歌词) 的可迭代对象，可为生成器以逐首读入"""
+
+
+def _import_optional(name: str, extra: str) -> ModuleType:
+    """导入可选依赖，未安装时给出安装提示"""
+    try:
+        return importlib.import_module(name)
+    except ImportError as error:
+        raise ImportError(
+            '需要安装 {}，可执行 pip install "LyricLib[{}]"'.format(
+                name.split(".")[0], extra
+            )
+        ) from error
+
+
+def _transpose(records: List[tuple], names: Tuple[str, ...]) -> Columns:
+    """将逐条记录转为各列"""
+    return {name: list(column) for name, column in zip(names, zip(*records))}
+
+
+def _iter_songs(songs: SongsLike) -> Iterable[Tuple[Any, "Lyric"]]:
+    return songs.items() if isinstance(songs, Mapping) else songs
+
+
+def iter_columns(
+    songs: SongsLike,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    words: bool = True,
+) -> Iterator[Tuple[str, Columns]]:
+    """
+    逐首展开歌词，每满 batch_rows 条记录给出一批，不依赖任何第三方库
+
+    行表与字词表于同一次遍历中展开，各自满批即给出，故 songs 只需遍历一次；
+    同一行的字词总在同一批中，故字词表的一批可能略多于 batch_rows 条。
+    字词与行按序号对应：句中第 i 行的字词取自 word_extension[i]
+
+    Parameters
+    ----------
+    songs: Mapping[Any, Lyric] | Iterable[Tuple[Any, Lyric]]
+        歌曲；歌曲标识将转为字符串
+    batch_rows: int
+        每批的记录数上限
+    words: bool
+        是否同时展开字词表
+
+    Returns
+    -------
+    Iterator[Tuple[str, Dict[str, List[Any]]]]
+        (表格名称, 一批记录)，表格名称为 "lines" 或 "words"
+    """
+    line_rows: List[tuple] = []
+    word_rows: List[tuple] = []
+
+    for song_id, lyric in _iter_songs(songs):
+        song_id = str(song_id)
+        for line_index, (start, block) in enumerate(lyric.lyrics.items()):
+            start_ms = start.in_milliseconds
+            duration_ms = (
+                None if block.duration is None else block.duration.in_milliseconds
+            )
+            extension = block.word_extension or ()
+            for row_index, row in enumerate(block.context):
+                word_starts = []
+                if row_index < len(extension):
+                    for word_index, (time, parts) in enumerate(
+                        extension[row_index].items()
+                    ):
+                        word_ms = time.in_milliseconds
+                        word_starts.append(word_ms)
+                        if words:
+                            word_rows.append(
+                                (
+                                    song_id,
+                                    line_index,
+                                    row_index,
+                                    word_index,
+                                    word_ms,
+                                    "".join(parts),
+                                )
+                            )
+                    if len(word_rows) >= batch_rows:
+                        yield "words", _transpose(word_rows, WORD_COLUMNS)
+                        word_rows = []
+                line_rows.append(
+                    (
+                        song_id,
+                        line_index,
+                        row_index,
+                        start_ms,
+                        duration_ms,
+                        "".join(row),
+                        word_starts,
+                    )
+                )
+                if len(line_rows) >= batch_rows:
+                    yield "lines", _transpose(line_rows, LINE_COLUMNS)
+                    line_rows = []
+
+    if line_rows:
+        yield "lines", _transpose(line_rows, LINE_COLUMNS)
+    if word_rows:
+        yield "words", _transpose(word_rows, WORD_COLUMNS)
+
+
+# Apache Arrow
+
+
+def arrow_schemas() -> Dict[str, Any]:
+    """
+    行表与字词表的 Arrow 结构，需要 pyarrow
+
+    Returns
+    -------
+    Dict[str, pyarrow.Schema]
+        以表格名称对应其结构
+    """
+    pa = _import_optional("pyarrow", "arrow")
+    return {
+        "lines": pa.schema(
+            [
+                pa.field("song_id", pa.string(), nullable=False),
+                pa.field("line_index", pa.int32(), nullable=False),
+                pa.field("row", pa.int16(), nullable=False),
+                pa.field("start_ms", pa.int64(), nullable=False),
+                pa.field("duration_ms", pa.int64()),
+                pa.field("text", pa.string(), nullable=False),
+                pa.field("word_start_ms", pa.list_(pa.int64()), nullable=False),
+            ]
+        ),
+        "words": pa.schema(
+            [
+                pa.field("song_id", pa.string(), nullable=False),
+                pa.field("line_index", pa.int32(), nullable=False),
+                pa.field("row", pa.int16(), nullable=False),
+                pa.field("word_index", pa.int32(), nullable=False),
+                pa.field("start_ms", pa.int64(), nullable=False),
+                pa.field("text", pa.string(), nullable=False),
+            ]
+        ),
+    }
+
+
+def iter_record_batches(
+    songs: SongsLike,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    words: bool = True,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    逐批给出 Arrow 记录批，需要 pyarrow
+
+    参数同 iter_columns
+
+    Returns
+    -------
+    Iterator[Tuple[str, pyarrow.RecordBatch]]
+        (表格名称, 记录批)
+    """
+    pa = _import_optional("pyarrow", "arrow")
+    schemas = arrow_schemas()
+    for table, columns in iter_columns(songs, batch_rows, words):
+        schema = schemas[table]
+        yield table, pa.RecordBatch.from_arrays(
+            [pa.array(columns[field.name], type=field.type) for field in schema],
+            schema=schema,
+        )
+
+
+def _write_batches(
+    songs: SongsLike,
+    writers: Dict[str, Any],
+    batch_rows: int,
+    write,
+) -> Dict[str, int]:
+    """将各批记录交给对应表格的写入器，返回各表的记录数"""
+    counts = dict.fromkeys(writers, 0)
+    for table, batch in iter_record_batches(songs, batch_rows, "words" in writers):
+        write(writers[table], batch)
+        counts[table] += batch.num_rows
+    return counts
+
+
+def write_parquet(
+    songs: SongsLike,
+    lines_path: str,
+    words_path: Optional[str] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    compression: str = "zstd",
+) -> Dict[str, int]:
+    """
+    将歌词展开为表格，逐批写入 Parquet 文件，需要 pyarrow
+
+    每批写为一个行组，内存占用仅与 batch_rows 有关，与歌曲总数无关
+
+    Parameters
+    ----------
+    songs: Mapping[Any, Lyric] | Iterable[Tuple[Any, Lyric]]
+        歌曲，参见 iter_columns
+    lines_path: str
+        行表的文件地址
+    words_path: str, optional
+        字词表的文件地址，缺省时不展开字词表
+    batch_rows: int
+        每批的记录数上限
+    compression: str
+        压缩算法
+
+    Returns
+    -------
+    Dict[str, int]
+        以表格名称对应写入的记录数
+    """
+    pa = _import_optional("pyarrow", "arrow")
+    pq = _import_optional("pyarrow.parquet", "arrow")
+    schemas = arrow_schemas()
+    paths = {"lines": lines_path}
+    if words_path is not None:
+        paths["words"] = words_path
+
+    writers = {}
+    try:
+        for table, path in paths.items():
+            writers[table] = pq.ParquetWriter(
+                path, schemas[table], compression=compression
+            )
+        return _write_batches(
+            songs,
+            writers,
+            batch_rows,
+            lambda writer, batch: writer.write_table(pa.Table.from_batches([batch])),
+        )
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+
+def write_arrow(
+    songs: SongsLike,
+    lines_path: str,
+    words_path: Optional[str] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> Dict[str, int]:
+    """
+    将歌词展开为表格，逐批写入 Arrow IPC 文件（Feather V2），需要 pyarrow
+
+    参数与返回值同 write_parquet
+    """
+    pa = _import_optional("pyarrow", "arrow")
+    schemas = arrow_schemas()
+    paths = {"lines": lines_path}
+    if words_path is not None:
+        paths["words"] = words_path
+
+    writers = {}
+    try:
+        for table, path in paths.items():
+            writers[table] = pa.ipc.new_file(path, schemas[table])
+        return _write_batches(
+            songs,
+            writers,
+            batch_rows,
+            lambda writer, batch: writer.write_batch(batch),
+        )
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+
+# NumPy
+
+
+def numpy_dtypes() -> Dict[str, Any]:
+    """
+    行表与字词表的 NumPy 结构化类型，需要 numpy
+
+    文本与 word_start_ms 以 object 保存，未设置的 duration_ms 为 -1
+
+    Returns
+    -------
+    Dict[str, numpy.dtype]
+        以表格名称对应其类型
+    """
+    np = _import_optional("numpy", "numpy")
+    return {
+        "lines": np.dtype(
+            [
+                ("song_id", object),
+                ("line_index", np.int32),
+                ("row", np.int16),
+                ("start_ms", np.int64),
+                ("duration_ms", np.int64),
+                ("text", object),
+                ("word_start_ms", object),
+            ]
+        ),
+        "words": np.dtype(
+            [
+                ("song_id", object),
+                ("line_index", np.int32),
+                ("row", np.int16),
+                ("word_index", np.int32),
+                ("start_ms", np.int64),
+                ("text", object),
+            ]
+        ),
+    }
+
+
+def iter_numpy_batches(
+    songs: SongsLike,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    words: bool = True,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    逐批给出 NumPy 结构化数组，需要 numpy
+
+    参数同 iter_columns
+
+    Returns
+    -------
+    Iterator[Tuple[str, numpy.ndarray]]
+        (表格名称, 结构化数组)
+    """
+    np = _import_optional("numpy", "numpy")
+    dtypes = numpy_dtypes()
+    for table, columns in iter_columns(songs, batch_rows, words):
+        size = len(columns["song_id"])
+        array = np.empty(size, dtype=dtypes[table])
+        for name, values in columns.items():
+            if name == "duration_ms":
+                array[name] = [-1 if value is None else value for value in values]
+            elif name == "word_start_ms":
+                # 逐个赋值，以免 NumPy 将嵌套列表视为多维数组
+                field = array[name]
+                for index, value in enumerate(values):
+                    field[index] = value
+            else:
+                array[name] = values
+        yield table, array
+
+
+def to_numpy(
+    songs: SongsLike,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    words: bool = True,
+) -> Dict[str, Any]:
+    """
+    将歌词展开为 NumPy 结构化数组，需要 numpy
+
+    各批拼接为完整的数组，语料较大时宜改用 iter_numpy_batches 或 write_parquet
+
+    参数同 iter_columns
+
+    Returns
+    -------
+    Dict[str, numpy.ndarray]
+        以表格名称对应其结构化数组
+    """
+    np = _import_optional("numpy", "numpy")
+    dtypes = numpy_dtypes()
+    parts: Dict[str, List[Any]] = {"lines": []}
+    if words:
+        parts["words"] = []
+    for table, array in iter_numpy_batches(songs, batch_rows, words):
+        parts[table].append(array)
+    return {
+        table: (np.concatenate(arrays) if arrays else np.empty(0, dtype=dtypes[table]))
+        for table, arrays in parts.items()
+    }
@@ -32,3 +32,11 @@ CENTISECOND = "centiseconds"
 MILLISECOND = "milliseconds"
 """毫秒"""
 
+
+CJK_CHARACTER_RANGE = (
+    "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+)
+"""中日韩文字的字符范围，可置于正则表达式的字符类中，此类文字逐字切分"""
+
+CJK_PUNCTUATION_RANGE = "\u3000-\u303f\uff00-\uffef"
+"""中日韩标点的字符范围，可置于正则表达式的字符类中，此类标点依附于前后的文字"""
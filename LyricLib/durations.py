@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""
+由时间轴推断词句持续时间
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import copy
+from typing import Optional, TYPE_CHECKING
+
+from .subclass import TimeStamp
+from .lrc.utils import parse_lrc_length
+
+if TYPE_CHECKING:
+    from .main import Lyric
+
+
+def infer_durations(
+    lyric: "Lyric",
+    max_hold_ms: Optional[int] = None,
+    min_gap_ms: int = 0,
+    chars_per_second: Optional[float] = None,
+    min_duration_ms: int = 0,
+    use_length_tag: bool = True,
+    tail_ms: int = 3000,
+    overwrite: bool = False,
+) -> "Lyric":
+    """
+    按时间先后遍历一次，为各词句推断持续时间，结果写入各词句的 duration
+
+    每句默认持续至下一句开始前 min_gap_ms 毫秒；最后一句持续至 [length:] 标签，
+    若无则持续 tail_ms 毫秒。之后依次以 max_hold_ms、阅读速度与 min_duration_ms 调整。
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象，将被原地修改
+    max_hold_ms: int, optional
+        单句最长持续毫秒数
+    min_gap_ms: int
+        与下一句之间至少留出的毫秒数
+    chars_per_second: float, optional
+        阅读速度（字每秒）；给出时，每句至多持续至以此速度读完为止，
+        以免在长间奏中一直停留
+    min_duration_ms: int
+        单句最短持续毫秒数，但不会越过下一句的开始
+    use_length_tag: bool
+        最后一句是否以 [length:] 标签作为结束
+    tail_ms: int
+        最后一句没有其他结束依据时的持续毫秒数
+    overwrite: bool
+        是否覆盖已有的持续时间
+
+    Returns
+    -------
+    Lyric
+        传入的歌词对象
+    """
+    lines = sorted(
+        ((time.in_milliseconds, time, block) for time, block in lyric.lyrics.items()),
+        key=lambda line: line[0],
+    )
+    lines_num = len(lines)
+    length_ms = (
+        parse_lrc_length(lyric.meta_info.Length)
+        if use_length_tag and lyric.meta_info.Length
+        else None
+    )
+    # 待推断的词句；多个时间标签共用的词句推断结果不同时需各自拥有一份
+    todo = {id(block) for _, _, block in lines if overwrite or block.duration is None}
+    done = {}
+
+    for line_index in range(lines_num):
+        start_ms, time, block = lines[line_index]
+        if id(block) not in todo:
+            continue
+
+        if line_index + 1 < lines_num:
+            next_ms = lines[line_index + 1][0]
+            duration_ms = next_ms - start_ms - min_gap_ms
+            ceiling_ms = next_ms - start_ms
+        else:
+            if length_ms is not None and length_ms > start_ms:
+                duration_ms = length_ms - start_ms
+            else:
+                duration_ms = tail_ms
+            ceiling_ms = None
+
+        if max_hold_ms is not None:
+            duration_ms = min(duration_ms, max_hold_ms)
+
+        if chars_per_second:
+            chars = len(str(block).replace(" ", ""))
+            duration_ms = min(
+                duration_ms,
+                max(int(chars * 1000 / chars_per_second), min_duration_ms),
+            )
+
+        if duration_ms < min_duration_ms:
+            duration_ms = (
+                min_duration_ms
+                if ceiling_ms is None
+                else min(min_duration_ms, ceiling_ms)
+            )
+
+        duration_ms = max(duration_ms, 0)
+
+        if id(block) in done:
+            if done[id(block)] == duration_ms:
+                continue
+            block = copy.copy(block)
+            lyric.lyrics[time] = block
+        done[id(block)] = duration_ms
+        block.duration = TimeStamp(ms=duration_ms)
+
+    return lyric
@@ -57,6 +57,48 @@ class InvalidFileError(OuterlyError):
         """文件损坏"""
         super().__init__("文件损坏", *args)
 
+
+class LimitExceededError(OuterlyError):
+    """超出解析限制"""
+
+    def __init__(self, limit_name: str = "", limit: int = 0, actual: int = 0, *args):
+        """输入内容超出了 limit_name 所限定的 limit"""
+        super().__init__(
+            "超出解析限制：{} 限定为 {}，实际至少为 {}".format(limit_name, limit, actual),
+            *args,
+        )
+        self.limit_name = limit_name
+        self.limit = limit
+        self.actual = actual
+
+
+class UnsupportedFormatError(OuterlyError, ValueError):
+    """不支持的格式"""
+
+    def __init__(self, fmt: str = "", *args):
+        """不支持 fmt 格式"""
+        super().__init__("不支持的格式：{}".format(fmt), *args)
+        self.fmt = fmt
+
+
+class MetaInfoConflictError(OuterlyError, ValueError):
+    """元信息冲突"""
+
+    def __init__(self, field: str = "", values=(), *args):
+        """合并歌词时 field 一项有多个不同的值"""
+        super().__init__("元信息冲突：{} 有多个不同的值 {}".format(field, values), *args)
+        self.field = field
+        self.values = tuple(values)
+
+
+class FrozenObjectError(InnerlyError, AttributeError):
+    """对象已冻结"""
+
+    def __init__(self, *args):
+        """对象已冻结，不可修改"""
+        super().__init__("对象已冻结", *args)
+
+
 class TimeTooPreciseError(InnerlyError):
     """时间过于精确"""
 
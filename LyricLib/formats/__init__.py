@@ -0,0 +1,668 @@
+# -*- coding: utf-8 -*-
+
+"""
+歌词格式的注册表：按扩展名与文件开头的内容识别格式，编解码模块于首次使用时才导入
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import io
+import os
+import re
+import codecs
+import importlib
+import threading
+from types import ModuleType
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+from ..exceptions import InvalidFileError, UnsupportedFormatError
+from ..instrument import logger
+
+if TYPE_CHECKING:
+    from ..main import Lyric
+
+ENTRY_POINT_GROUP = "lyriclib.formats"
+"""第三方格式注册所用的入口点组名"""
+
+SNIFF_SIZE = 4096
+"""识别格式时查看的文件开头长度（字符）"""
+
+DEFAULT_FALLBACK_ENCODINGS = ("utf-8", "gb18030")
+"""未指定编码且无字节顺序标记时依次尝试的编码"""
+
+_BOMS = (
+    # UTF-32 的标记以 UTF-16 的标记开头，须先于后者判断
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+Source = Union[str, "os.PathLike[str]", IO[str], IO[bytes]]
+"""可读入的来源：文件地址、文本流或字节流"""
+
+Sniffer = Callable[[str], bool]
+"""内容识别函数：判断文件开头的文本是否属于某格式"""
+
+
+def _decode(data: bytes, encoding: str, errors: str, partial: bool) -> str:
+    if not partial:
+        return data.decode(encoding, errors)
+    # 截断处可能恰好落在多字节字符中间，不完整的部分直接舍去
+    return codecs.getincrementaldecoder(encoding)(errors).decode(data)
+
+
+def decode_bytes(
+    data: bytes,
+    encoding: Optional[str] = None,
+    fallbacks: Sequence[str] = DEFAULT_FALLBACK_ENCODINGS,
+    partial: bool = False,
+) -> Tuple[str, str]:
+    """
+    将字节解码为文本
+
+    未指定编码时，先以字节顺序标记判断，其次依序尝试 fallbacks 中的编码，
+    均失败时以最后一个编码替换无法解码的字节；无论何种编码，开头的字节顺序标记均被去除
+
+    Parameters
+    ----------
+    data: bytes
+        待解码的字节
+    encoding: str, optional
+        指定的编码
+    fallbacks: Sequence[str]
+        依次尝试的编码
+    partial: bool
+        data 是否仅为开头的一部分，为 True 时末尾不完整的字符将被舍去而不视为错误
+
+    Returns
+    -------
+    Tuple[str, str]
+        文本与实际使用的编码
+
+    Raises
+    ------
+    InvalidFileError
+        指定的编码或字节顺序标记所示的编码无法解码时
+    """
+    if encoding is None:
+        for bom, bom_encoding in _BOMS:
+            if data.startswith(bom):
+                text = _decode_strict(data[len(bom) :], bom_encoding, partial)
+                return text, bom_encoding
+        for fallback in fallbacks:
+            try:
+                return _decode(data, fallback, "strict", partial), fallback
+            except UnicodeDecodeError:
+                pass
+        encoding = fallbacks[-1]
+        return _decode(data, encoding, "replace", partial), encoding
+    text = _decode_strict(data, encoding, partial)
+    return (text[1:] if text.startswith("\ufeff") else text), encoding
+
+
+def _decode_strict(data: bytes, encoding: str, partial: bool) -> str:
+    """以确定的编码解码，无法解码时抛出 InvalidFileError"""
+    try:
+        return _decode(data, encoding, "strict", partial)
+    except UnicodeDecodeError as error:
+        raise InvalidFileError(
+            "无法以 {} 解码".format(encoding),
+            "第 {} 字节：{}".format(error.start, error.reason),
+        ) from error
+
+
+# 内容识别
+
+
+def _sniff_webvtt(head: str) -> bool:
+    return head.startswith("WEBVTT") and head[6:7] in ("", " ", "\t", "\r", "\n")
+
+
+_ASS_PATTERN = re.compile(r"\s*\[Script Info\]", re.IGNORECASE)
+
+
+def _sniff_ass(head: str) -> bool:
+    return _ASS_PATTERN.match(head) is not None
+
+
+_SRT_PATTERN = re.compile(
+    r"\s*\d+[ \t]*\r?\n\d+:\d{2}:\d{2}[,.]\d{1,3}[ \t]*-->[ \t]*\d+:\d{2}:\d{2}"
+)
+
+
+def _sniff_srt(head: str) -> bool:
+    return _SRT_PATTERN.match(head) is not None
+
+
+_LRC_PATTERN = re.compile(
+    r"^[ \t]*\[(?:\d+:\d+(?:[.:]\d+)?|[A-Za-z#]+:[^\]\r\n]*)\]", re.MULTILINE
+)
+
+
+def _sniff_lrc(head: str) -> bool:
+    return _LRC_PATTERN.search(head) is not None
+
+
+_JSON_SCHEMA_PATTERN = re.compile(r'\s*\{\s*"schema"\s*:\s*"lyriclib\.lyric/')
+
+
+def _sniff_json(head: str) -> bool:
+    return _JSON_SCHEMA_PATTERN.match(head) is not None
+
+
+class LyricFormat:
+    """
+    一种歌词格式
+
+    编解码模块应提供 loads(text, **options) -> Lyric 与 dumps(lyric, **options) -> str，
+    仅能读入或仅能写出的格式可缺省其一
+    """
+
+    name: str
+    """格式名称，小写"""
+    module: Optional[str]
+    """编解码模块的完整名称，于首次读写时导入；为 None 时此格式仅能识别，不能读写"""
+    extensions: Tuple[str, ...]
+    """扩展名，小写且带点"""
+    sniff: Optional[Sniffer]
+    """内容识别函数"""
+
+    def __init__(
+        self,
+        name: str,
+        module: Optional[str] = None,
+        extensions: Sequence[str] = (),
+        sniff: Optional[Sniffer] = None,
+    ):
+        """
+        Parameters
+        ----------
+        name: str
+            格式名称
+        module: str, optional
+            编解码模块的完整名称
+        extensions: Sequence[str]
+            扩展名，可不带点
+        sniff: Callable[[str], bool], optional
+            内容识别函数，接收文件开头至多 SNIFF_SIZE 个字符
+        """
+        self.name = name.lower()
+        self.module = module
+        self.extensions = tuple(
+            extension.lower() if extension.startswith(".") else "." + extension.lower()
+            for extension in extensions
+        )
+        self.sniff = sniff
+        self._codec: Optional[ModuleType] = None
+
+    def __repr__(self) -> str:
+        return "LyricFormat({!r}, {!r}, extensions={!r})".format(
+            self.name, self.module, self.extensions
+        )
+
+    @property
+    def loaded(self) -> bool:
+        """编解码模块是否已导入"""
+        return self._codec is not None
+
+    def codec(self) -> ModuleType:
+        """
+        取得编解码模块，首次调用时导入
+
+        Returns
+        -------
+        ModuleType
+            编解码模块
+
+        Raises
+        ------
+        UnsupportedFormatError
+            此格式没有编解码模块
+        """
+        if self._codec is None:
+            if self.module is None:
+                raise UnsupportedFormatError(
+                    self.name, "可以识别，但没有可用的编解码模块"
+                )
+            self._codec = importlib.import_module(self.module)
+        return self._codec
+
+    def _function(self, name: str) -> Callable:
+        function = getattr(self.codec(), name, None)
+        if function is None:
+            raise UnsupportedFormatError(
+                self.name, "编解码模块 {} 未提供 {}".format(self.module, name)
+            )
+        return function
+
+    def loads(self, text: str, **options) -> "Lyric":
+        """以此格式解析文本"""
+        return self._function("loads")(text, **options)
+
+    def dumps(self, lyric: "Lyric", **options) -> str:
+        """以此格式写出歌词"""
+        return self._function("dumps")(lyric, **options)
+
+
+_formats: Dict[str, LyricFormat] = {}
+_extensions: Dict[str, List[LyricFormat]] = {}
+_lock = threading.RLock()
+_entry_points_loaded = False
+
+
+def register_format(
+    name: Union[str, LyricFormat],
+    module: Optional[str] = None,
+    extensions: Sequence[str] = (),
+    sniff: Optional[Sniffer] = None,
+) -> LyricFormat:
+    """
+    注册一种格式，同名的格式将被替换
+
+    Parameters
+    ----------
+    name: str | LyricFormat
+        格式名称，或已构造好的格式，此时忽略其余参数
+    module: str, optional
+        编解码模块的完整名称，注册时不会导入
+    extensions: Sequence[str]
+        扩展名
+    sniff: Callable[[str], bool], optional
+        内容识别函数，应只做廉价的检查
+
+    Returns
+    -------
+    LyricFormat
+        注册的格式
+    """
+    lyric_format = (
+        name
+        if isinstance(name, LyricFormat)
+        else LyricFormat(name, module, extensions, sniff)
+    )
+    with _lock:
+        if lyric_format.name in _formats:
+            _unregister(lyric_format.name)
+        _formats[lyric_format.name] = lyric_format
+        for extension in lyric_format.extensions:
+            _extensions.setdefault(extension, []).append(lyric_format)
+    return lyric_format
+
+
+def _unregister(name: str) -> LyricFormat:
+    lyric_format = _formats.pop(name)
+    for extension in lyric_format.extensions:
+        _extensions[extension].remove(lyric_format)
+        if not _extensions[extension]:
+            del _extensions[extension]
+    return lyric_format
+
+
+def unregister_format(name: str) -> LyricFormat:
+    """
+    注销一种格式
+
+    Parameters
+    ----------
+    name: str
+        格式名称
+
+    Returns
+    -------
+    LyricFormat
+        被注销的格式
+
+    Raises
+    ------
+    UnsupportedFormatError
+        此格式未注册
+    """
+    with _lock:
+        try:
+            return _unregister(name.lower())
+        except KeyError:
+            raise UnsupportedFormatError(name) from None
+
+
+def _entry_point_list() -> list:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        try:
+            from importlib_metadata import entry_points  # type: ignore
+        except ImportError:
+            return []
+    found = entry_points()
+    if hasattr(found, "select"):
+        return list(found.select(group=ENTRY_POINT_GROUP))
+    return list(found.get(ENTRY_POINT_GROUP, ()))
+
+
+def load_entry_points() -> List[LyricFormat]:
+    """
+    载入以入口点注册的第三方格式，仅在首次调用时进行
+
+    入口点组名为 lyriclib.formats，名称即格式名称，其值可以是：
+    - LyricFormat 对象，如 "some_package.formats:YAML_FORMAT"
+    - 编解码模块，如 "some_package.yaml_codec"，模块可另以 EXTENSIONS 与 sniff 给出扩展名与内容识别函数
+
+    内置格式不会被同名的入口点覆盖；载入出错的入口点将被跳过并记入日志。
+    查找格式时，仅当内置格式均不匹配才会调用此函数，因此第三方模块不会拖慢常见格式的读写
+
+    Returns
+    -------
+    List[LyricFormat]
+        本次载入的格式
+    """
+    global _entry_points_loaded
+    with _lock:
+        if _entry_points_loaded:
+            return []
+        _entry_points_loaded = True
+        loaded = []
+        for entry_point in _entry_point_list():
+            if entry_point.name.lower() in _formats:
+                continue
+            try:
+                target = entry_point.load()
+            except Exception:
+                logger.warning("无法载入格式入口点 %s", entry_point, exc_info=True)
+                continue
+            if isinstance(target, LyricFormat):
+                lyric_format = target
+            elif isinstance(target, ModuleType):
+                lyric_format = LyricFormat(
+                    entry_point.name,
+                    target.__name__,
+                    getattr(target, "EXTENSIONS", ()),
+                    getattr(target, "sniff", None),
+                )
+                lyric_format._codec = target
+            else:
+                logger.warning("格式入口点 %s 既非 LyricFormat 亦非模块", entry_point)
+                continue
+            loaded.append(register_format(lyric_format))
+        return loaded
+
+
+def get_format(name: str) -> LyricFormat:
+    """
+    按名称取得格式
+
+    Parameters
+    ----------
+    name: str
+        格式名称
+
+    Returns
+    -------
+    LyricFormat
+        格式
+
+    Raises
+    ------
+    UnsupportedFormatError
+        未注册此格式
+    """
+    key = name.lower()
+    lyric_format = _formats.get(key)
+    if lyric_format is None and load_entry_points():
+        lyric_format = _formats.get(key)
+    if lyric_format is None:
+        raise UnsupportedFormatError(name)
+    return lyric_format
+
+
+def formats() -> Dict[str, LyricFormat]:
+    """所有已注册的格式，含以入口点注册的第三方格式"""
+    load_entry_points()
+    return dict(_formats)
+
+
+def _extension_of(filename: Optional[str]) -> str:
+    return os.path.splitext(filename)[1].lower() if filename else ""
+
+
+def _match(head: str, extension: str) -> Optional[LyricFormat]:
+    """以扩展名与内容查找格式，均无定论时返回 None"""
+    candidates = _extensions.get(extension, ())
+    # 扩展名与内容一致者优先，其次仅凭内容，最后仅凭扩展名
+    for lyric_format in candidates:
+        if lyric_format.sniff is None or lyric_format.sniff(head):
+            return lyric_format
+    for lyric_format in list(_formats.values()):
+        if lyric_format.sniff is not None and lyric_format.sniff(head):
+            return lyric_format
+    return candidates[0] if candidates else None
+
+
+def sniff_format(
+    head: Union[str, bytes], filename: Optional[str] = None
+) -> LyricFormat:
+    """
+    识别格式
+
+    扩展名与内容一致者优先；扩展名缺失或与内容不符时以内容为准；
+    内容无法识别时再以扩展名为准
+
+    Parameters
+    ----------
+    head: str | bytes
+        文件开头的内容，字节将以 decode_bytes 解码
+    filename: str, optional
+        文件名，用于取得扩展名
+
+    Returns
+    -------
+    LyricFormat
+        识别出的格式
+
+    Raises
+    ------
+    UnsupportedFormatError
+        无法识别
+    """
+    if isinstance(head, bytes):
+        head = decode_bytes(head[: SNIFF_SIZE * 4], partial=True)[0]
+    head = head[:SNIFF_SIZE].lstrip("\ufeff")
+    extension = _extension_of(filename)
+    lyric_format = _match(head, extension)
+    if lyric_format is None and load_entry_points():
+        lyric_format = _match(head, extension)
+    if lyric_format is None:
+        raise UnsupportedFormatError(extension or (filename or "<未知>"))
+    return lyric_format
+
+
+def _read_source(source: Source) -> Tuple[Union[str, bytes], Optional[str]]:
+    """读入来源的全部内容，并取得其文件名"""
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        with open(path, "rb") as f:
+            return f.read(), path
+    name = getattr(source, "name", None)
+    return source.read(), name if isinstance(name, str) else None
+
+
+def loads(
+    data: Union[str, bytes],
+    fmt: Optional[str] = None,
+    encoding: Optional[str] = None,
+    filename: Optional[str] = None,
+    **options,
+) -> "Lyric":
+    """
+    解析歌词文本
+
+    Parameters
+    ----------
+    data: str | bytes
+        歌词文本，字节将以 decode_bytes 解码
+    fmt: str, optional
+        格式名称，缺省时自动识别
+    encoding: str, optional
+        字节的编码，缺省时自动判断
+    filename: str, optional
+        文件名，辅助识别格式
+    options:
+        传给编解码模块 loads 的其余参数
+
+    Returns
+    -------
+    Lyric
+        歌词对象
+    """
+    text = data if isinstance(data, str) else decode_bytes(data, encoding)[0]
+    lyric_format = get_format(fmt) if fmt else sniff_format(text, filename)
+    return lyric_format.loads(text, **options)
+
+
+def load(
+    source: Source,
+    fmt: Optional[str] = None,
+    encoding: Optional[str] = None,
+    **options,
+) -> "Lyric":
+    """
+    读入歌词文件，自动识别其格式与编码
+
+    Parameters
+    ----------
+    source: str | PathLike | IO
+        文件地址，或文本流、字节流
+    fmt: str, optional
+        格式名称，缺省时以扩展名与文件开头的内容识别
+    encoding: str, optional
+        文件的编码，缺省时以 decode_bytes 自动判断
+    options:
+        传给编解码模块 loads 的其余参数，如 LRC 的 strict、limits
+
+    Returns
+    -------
+    Lyric
+        歌词对象
+    """
+    limits = options.get("limits")
+    if limits is not None and isinstance(source, (str, os.PathLike)):
+        # 读入之前先以文件大小判断
+        limits.check("max_bytes", os.path.getsize(source))
+    data, filename = _read_source(source)
+    return loads(data, fmt, encoding, filename, **options)
+
+
+def dumps(lyric: "Lyric", fmt: str = "lrc", **options) -> str:
+    """
+    将歌词写为文本
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象
+    fmt: str
+        格式名称
+    options:
+        传给编解码模块 dumps 的其余参数
+
+    Returns
+    -------
+    str
+        文本
+    """
+    return get_format(fmt).dumps(lyric, **options)
+
+
+def dump(
+    lyric: "Lyric",
+    target: Union[str, "os.PathLike[str]", IO[str], IO[bytes], None] = None,
+    fmt: Optional[str] = None,
+    encoding: str = "utf-8",
+    **options,
+) -> Optional[str]:
+    """
+    写出歌词
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象
+    target: str | PathLike | IO, optional
+        文件地址，或文本流、字节流；缺省时返回文本
+    fmt: str, optional
+        格式名称，缺省时按 target 的扩展名判断，无从判断时为 lrc
+    encoding: str
+        写入文件或字节流时所用的编码
+    options:
+        传给编解码模块 dumps 的其余参数
+
+    Returns
+    -------
+    str | None
+        target 缺省时返回文本
+    """
+    if isinstance(target, (str, os.PathLike)):
+        filename: Optional[str] = os.fspath(target)
+    else:
+        filename = getattr(target, "name", None)
+    if fmt is None:
+        candidates = _extensions.get(_extension_of(filename))
+        fmt = candidates[0].name if candidates else "lrc"
+
+    text = dumps(lyric, fmt, **options)
+    if target is None:
+        return text
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "w", encoding=encoding, newline="") as f:
+            f.write(text)
+    elif isinstance(target, io.TextIOBase):
+        target.write(text)
+    else:
+        target.write(text.encode(encoding))  # type: ignore
+    return None
+
+
+# 内置格式，各编解码模块均在首次读写时才导入
+# 仅凭内容识别时按注册顺序判断，特征明确的格式在前，LRC 的标签较为宽泛故置于最后
+register_format("json", __name__ + ".json", (".json",), _sniff_json)
+register_format("webvtt", None, (".vtt",), _sniff_webvtt)
+register_format("ass", None, (".ass", ".ssa"), _sniff_ass)
+register_format("srt", None, (".srt",), _sniff_srt)
+register_format("lrc", __name__ + ".lrc", (".lrc",), _sniff_lrc)
+
+__all__ = [
+    "LyricFormat",
+    "register_format",
+    "unregister_format",
+    "load_entry_points",
+    "get_format",
+    "formats",
+    "sniff_format",
+    "decode_bytes",
+    "load",
+    "loads",
+    "dump",
+    "dumps",
+    "ENTRY_POINT_GROUP",
+    "SNIFF_SIZE",
+]
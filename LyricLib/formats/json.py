@@ -0,0 +1,563 @@
+# -*- coding: utf-8 -*-
+
+"""
+歌词与 JSON 之间的转换，供网页及移动端接口使用
+
+文档结构（schema 为 "lyriclib.lyric/1"）::
+
+    {
+        "schema": "lyriclib.lyric/1",
+        "meta": {"Title": "…", "Singer": "…", "Other": {"自定义": "…"}},
+        "extra": {"未知标签": "…"},
+        "contexts": "Aquickfox一只狐狸",
+        "lines": [
+            {
+                "start_ms": 1000,
+                "duration_ms": 2300,
+                "rows": [["A quick ", {"text": "fox", "bold": true}], ["一只狐狸"]],
+                "words": [
+                    {"start_ms": [1000, 1500, 2000], "text": ["A ", "quick ", "fox"]}
+                ],
+                "location": {"anchor": [0, 1], "offset": [0, -5]}
+            }
+        ]
+    }
+
+- 时间均为整数毫秒；start_ms 与字词时间为绝对时间，duration_ms 为相对于 start_ms 的持续时间
+- meta 仅含非空的元信息，Other 为空时省略；extra 为空时省略
+- contexts 为依原文顺序的全文（Lyric.whole_contexts），无法由按时间排列的各句还原；
+  缺少时由各句拼合，内容相同的句子只计一次
+- lines 总按 start_ms 升序排列；duration_ms、words、location 未设置时省略
+- rows 为词句的各行，每行由若干段组成；默认样式的段为字符串，
+  否则为对象，除 text 外仅含与默认不同的样式：
+  bold、italic、underline、strikethrough（布尔），
+  colour、background（[R, G, B, A]），outline（[宽度, [R, G, B, A]]），font（字符串），size（整数）
+- words 与词句中带字词标签的各行一一对应，以平行数组给出各字词的开始时间 start_ms 与文本 text；
+  某一字词由多段组成或带有样式时，另以 runs 给出各字词的段，其格式同 rows
+
+所有转换结果仅含 dict、list、str、int、bool，可直接交给任意 JSON 编码器
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import io
+import json
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Union,
+    TYPE_CHECKING,
+)
+
+from ..exceptions import InvalidFileError, UnsupportedFormatError
+from ..main import Lyric
+from ..subclass import (
+    META_FIELDS,
+    LineLocation,
+    MetaInfo,
+    StyledString,
+    SubtitleBlock,
+    TimeStamp,
+)
+
+if TYPE_CHECKING:
+    from ..textpool import TextPool
+
+EXTENSIONS = (".json",)
+
+JSON_SCHEMA = "lyriclib.lyric/1"
+"""文档结构的标识，结构有不兼容的变更时递增"""
+
+Run = Union[str, Dict[str, Any]]
+"""一段文字：默认样式时为字符串，否则为带样式的对象"""
+
+_DEFAULT_STYLE = (
+    False,
+    False,
+    False,
+    False,
+    (255, 255, 255, 255),
+    (0, (0, 0, 0, 0)),
+    (0, 0, 0, 0),
+    None,
+    None,
+)
+"""StyledString 的默认样式，顺序同 _style_of"""
+
+
+def _style_of(run: StyledString) -> tuple:
+    return (
+        run._bold,
+        run._italic,
+        run._underline,
+        run._strikethrough,
+        run._colour,
+        run._outline,
+        run._background_cover,
+        run.font,
+        run.size,
+    )
+
+
+def encode_run(run: str) -> Run:
+    """
+    将一段文字转为 JSON 值
+
+    Parameters
+    ----------
+    run: str | StyledString
+        一段文字
+
+    Returns
+    -------
+    str | Dict[str, Any]
+        默认样式时为字符串，否则为仅含非默认样式的对象
+    """
+    if type(run) is str:
+        return run
+    style = _style_of(run)  # type: ignore
+    if style == _DEFAULT_STYLE:
+        return str(run)
+    bold, italic, underline, strikethrough, colour, outline, cover, font, size = style
+    result: Dict[str, Any] = {"text": str(run)}
+    if bold:
+        result["bold"] = True
+    if italic:
+        result["italic"] = True
+    if underline:
+        result["underline"] = True
+    if strikethrough:
+        result["strikethrough"] = True
+    if colour != _DEFAULT_STYLE[4]:
+        result["colour"] = list(colour)
+    if outline != _DEFAULT_STYLE[5]:
+        result["outline"] = [outline[0], list(outline[1])]
+    if cover != _DEFAULT_STYLE[6]:
+        result["background"] = list(cover)
+    if font is not None:
+        result["font"] = font
+    if size is not None:
+        result["size"] = size
+    return result
+
+
+def decode_run(
+    value: Run, make_plain: Callable[[str], StyledString] = StyledString
+) -> StyledString:
+    """
+    由 JSON 值还原一段文字
+
+    Parameters
+    ----------
+    value: str | Dict[str, Any]
+        encode_run 的结果
+    make_plain: Callable[[str], StyledString]
+        建立默认样式文字的函数，如 TextPool.intern
+
+    Returns
+    -------
+    StyledString
+        一段文字
+    """
+    if isinstance(value, str):
+        return make_plain(value)
+    outline = value.get("outline", (0, (0, 0, 0, 0)))
+    return StyledString(
+        value["text"],
+        is_bold=value.get("bold", False),
+        is_italic=value.get("italic", False),
+        is_underline=value.get("underline", False),
+        is_strikethrough=value.get("strikethrough", False),
+        text_colour=tuple(value.get("colour", (255, 255, 255, 255))),
+        outline_px=outline[0],
+        outline_colour=tuple(outline[1]),
+        background_cover_colour=tuple(value.get("background", (0, 0, 0, 0))),
+        font_name=value.get("font"),
+        font_size=value.get("size"),
+    )
+
+
+def _encode_words(line: Mapping[TimeStamp, List[StyledString]]) -> Dict[str, Any]:
+    """将一行字词标签转为平行数组"""
+    starts = []
+    texts = []
+    runs = []
+    styled = False
+    for time, words in line.items():
+        starts.append(time.in_milliseconds)
+        if len(words) == 1:
+            encoded = encode_run(words[0])
+            if isinstance(encoded, str):
+                texts.append(encoded)
+                runs.append([encoded])
+                continue
+        else:
+            encoded = None
+        styled = True
+        texts.append("".join(words))
+        runs.append(
+            [encoded] if encoded is not None else [encode_run(word) for word in words]
+        )
+    result = {"start_ms": starts, "text": texts}
+    if styled:
+        result["runs"] = runs
+    return result
+
+
+def encode_block(block: SubtitleBlock) -> Dict[str, Any]:
+    """
+    将词句转为 JSON 对象，不含开始时间
+
+    Parameters
+    ----------
+    block: SubtitleBlock
+        词句
+
+    Returns
+    -------
+    Dict[str, Any]
+        含 rows 及可能有的 duration_ms、words、location
+    """
+    result: Dict[str, Any] = {
+        "rows": [[encode_run(run) for run in row] for row in block.context]
+    }
+    if block.duration is not None:
+        result["duration_ms"] = block.duration.in_milliseconds
+    if block.word_extension:
+        result["words"] = [_encode_words(line) for line in block.word_extension]
+    if block.location is not None:
+        result["location"] = {
+            "anchor": list(block.location.archer.value),
+            "offset": list(block.location.offset),
+        }
+    return result
+
+
+def _encode_meta(meta_info: MetaInfo) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    for name in META_FIELDS:
+        value = getattr(meta_info, name)
+        if value:
+            result[name] = value
+    if meta_info.Other:
+        result["Other"] = dict(meta_info.Other)
+    return result
+
+
+def _encode_header(lyric: Lyric) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "schema": JSON_SCHEMA,
+        "meta": _encode_meta(lyric.meta_info),
+    }
+    if lyric.extra_info:
+        result["extra"] = dict(lyric.extra_info)
+    result["contexts"] = lyric.whole_contexts
+    return result
+
+
+def _iter_lines(lyric: Lyric) -> Iterator[Dict[str, Any]]:
+    """依时间顺序逐句转为 JSON 对象"""
+    # 多个时间标签共用的词句只转换一次，各时间标签的对象仅开始时间不同
+    encoded: Dict[int, Dict[str, Any]] = {}
+    for start, block in lyric.lyrics.items():
+        body = encoded.get(id(block))
+        if body is None:
+            body = encoded[id(block)] = encode_block(block)
+        line = {"start_ms": start.in_milliseconds}
+        line.update(body)
+        yield line
+
+
+def to_json(lyric: Lyric) -> Dict[str, Any]:
+    """
+    将歌词转为仅含基本类型的字典，结构见模块说明
+
+    多个时间标签共用的词句，其各句对象中的 rows、words 等亦为共用，请勿原地修改
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象
+
+    Returns
+    -------
+    Dict[str, Any]
+        可直接交给 JSON 编码器的字典
+    """
+    result = _encode_header(lyric)
+    result["lines"] = list(_iter_lines(lyric))
+    return result
+
+
+def _plain_maker(
+    text_pool: Optional["TextPool"],
+) -> Callable[[str], StyledString]:
+    """建立默认样式文字的函数；未给出驻留池时，同一次还原中相同的文字共用同一对象"""
+    if text_pool is not None:
+        return text_pool.intern
+    memo: Dict[str, StyledString] = {}
+
+    def make_plain(text: str) -> StyledString:
+        result = memo.get(text)
+        if result is None:
+            result = memo[text] = StyledString(text)
+        return result
+
+    return make_plain
+
+
+def _decode_words(
+    value: Mapping[str, Any], make_plain: Callable[[str], StyledString]
+) -> Dict[TimeStamp, List[StyledString]]:
+    starts = value["start_ms"]
+    runs = value.get("runs")
+    if runs is None:
+        texts = value["text"]
+        if len(starts) != len(texts):
+            raise InvalidFileError("字词的 start_ms 与 text 长度不同")
+        return {
+            TimeStamp(ms=start): [make_plain(text)]
+            for start, text in zip(starts, texts)
+        }
+    if len(starts) != len(runs):
+        raise InvalidFileError("字词的 start_ms 与 runs 长度不同")
+    return {
+        TimeStamp(ms=start): [decode_run(run, make_plain) for run in word]
+        for start, word in zip(starts, runs)
+    }
+
+
+def decode_block(
+    value: Mapping[str, Any], text_pool: Optional["TextPool"] = None
+) -> SubtitleBlock:
+    """
+    由 JSON 对象还原词句
+
+    Parameters
+    ----------
+    value: Mapping[str, Any]
+        encode_block 的结果，可含 start_ms
+    text_pool: TextPool, optional
+        文本驻留池；给出时，默认样式的文字均从池中取得
+
+    Returns
+    -------
+    SubtitleBlock
+        词句
+    """
+    return _decode_block(value, _plain_maker(text_pool))
+
+
+def _decode_block(
+    value: Mapping[str, Any], make_plain: Callable[[str], StyledString]
+) -> SubtitleBlock:
+    duration = value.get("duration_ms")
+    words = value.get("words")
+    location = value.get("location")
+    block = SubtitleBlock(
+        [[decode_run(run, make_plain) for run in row] for row in value["rows"]],
+        None if duration is None else TimeStamp(ms=duration),
+        location=(
+            None
+            if location is None
+            else LineLocation(tuple(location["anchor"]), tuple(location["offset"]))
+        ),
+    )
+    if words:
+        block.word_extension = [_decode_words(line, make_plain) for line in words]
+    return block
+
+
+def from_json(data: Mapping[str, Any], text_pool: Optional["TextPool"] = None) -> Lyric:
+    """
+    由 to_json 的结果还原歌词
+
+    Parameters
+    ----------
+    data: Mapping[str, Any]
+        JSON 文档解码所得的字典
+    text_pool: TextPool, optional
+        文本驻留池，参见 decode_block
+
+    Returns
+    -------
+    Lyric
+        歌词对象
+
+    Raises
+    ------
+    UnsupportedFormatError
+        schema 不是 JSON_SCHEMA
+    InvalidFileError
+        文档结构有误
+    """
+    schema = data.get("schema") if isinstance(data, Mapping) else None
+    if schema != JSON_SCHEMA:
+        raise UnsupportedFormatError(
+            str(schema), "仅支持 {} 结构的 JSON 歌词".format(JSON_SCHEMA)
+        )
+    try:
+        meta = dict(data.get("meta", {}))
+        lyric = Lyric(meta_info=MetaInfo(Other=dict(meta.pop("Other", {}))))
+        for name, value in meta.items():
+            lyric.meta_info.set_meta(name, value)
+        lyric.extra_info.update(data.get("extra", {}))
+
+        make_plain = _plain_maker(text_pool)
+        items = []
+        whole_contexts = data.get("contexts")
+        contexts = []
+        # 未给出全文时由各句拼合；多个时间标签共用的词句各占一句，只计一次
+        bodies = set()
+        for line in data["lines"]:
+            block = _decode_block(line, make_plain)
+            items.append((TimeStamp(ms=line["start_ms"]), block))
+            if whole_contexts is None:
+                body = json.dumps(
+                    {key: value for key, value in line.items() if key != "start_ms"},
+                    sort_keys=True,
+                )
+                if body not in bodies:
+                    bodies.add(body)
+                    contexts.append(str(block).replace(" ", ""))
+    except (KeyError, TypeError, ValueError, IndexError) as error:
+        raise InvalidFileError("JSON 歌词结构有误：{!r}".format(error)) from error
+    lyric.lyrics.update(items)
+    lyric.whole_contexts = (
+        "".join(contexts) if whole_contexts is None else whole_contexts
+    )
+    return lyric
+
+
+def iterencode(
+    lyric: Lyric, batch: int = 64, ensure_ascii: bool = False
+) -> Iterator[str]:
+    """
+    逐段生成 JSON 文档，不在内存中建立完整的文档
+
+    各段依次拼接即为与 json.dumps(to_json(lyric)) 相同结构的紧凑 JSON
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象，生成期间请勿修改
+    batch: int
+        每段所含的歌词句数
+    ensure_ascii: bool
+        是否将非 ASCII 字符转义
+
+    Returns
+    -------
+    Iterator[str]
+        文档的各段
+    """
+    encode = json.JSONEncoder(
+        ensure_ascii=ensure_ascii, check_circular=False, separators=(",", ":")
+    ).encode
+    header = encode(_encode_header(lyric))
+    yield header[:-1] + ',"lines":['
+
+    pending = []
+    first = True
+    for line in _iter_lines(lyric):
+        pending.append(encode(line))
+        if len(pending) >= batch:
+            yield ("" if first else ",") + ",".join(pending)
+            pending.clear()
+            first = False
+    if pending:
+        yield ("" if first else ",") + ",".join(pending)
+    yield "]}"
+
+
+def write_json(
+    lyric: Lyric,
+    fdist: Union[IO[str], IO[bytes]],
+    batch: int = 64,
+    ensure_ascii: bool = False,
+    encoding: str = "utf-8",
+):
+    """
+    将歌词以 JSON 逐段写入流，如文件或 socket.makefile() 所得的流
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象，写出期间请勿修改
+    fdist: IO
+        文本流或字节流
+    batch: int
+        每次写入所含的歌词句数
+    ensure_ascii: bool
+        是否将非 ASCII 字符转义
+    encoding: str
+        写入字节流时所用的编码
+    """
+    binary = not isinstance(fdist, io.TextIOBase)
+    for chunk in iterencode(lyric, batch, ensure_ascii):
+        fdist.write(chunk.encode(encoding) if binary else chunk)  # type: ignore
+
+
+def loads(text: str, text_pool: Optional["TextPool"] = None, **options) -> Lyric:
+    """
+    解析 JSON 文本，供格式注册表使用
+
+    Parameters
+    ----------
+    text: str
+        JSON 文本
+    text_pool: TextPool, optional
+        文本驻留池，参见 decode_block
+    options:
+        传给 json.loads 的其余参数
+
+    Returns
+    -------
+    Lyric
+        歌词对象
+    """
+    try:
+        data = json.loads(text, **options)
+    except ValueError as error:
+        raise InvalidFileError("JSON 解析失败：{}".format(error)) from error
+    return from_json(data, text_pool)
+
+
+def dumps(lyric: Lyric, indent: Optional[int] = None, **options) -> str:
+    """
+    将歌词写为 JSON 文本，供格式注册表使用
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象
+    indent: int, optional
+        缩进，缺省时输出紧凑的 JSON
+    options:
+        传给 iterencode 或 json.dumps 的其余参数
+
+    Returns
+    -------
+    str
+        JSON 文本
+    """
+    if indent is None:
+        return "".join(iterencode(lyric, **options))
+    options.setdefault("ensure_ascii", False)
+    return json.dumps(to_json(lyric), indent=indent, **options)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRC 格式的编解码模块，供格式注册表使用
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import io
+
+from ..main import Lyric
+
+EXTENSIONS = (".lrc",)
+
+
+def loads(text: str, **options) -> Lyric:
+    """解析 LRC 文本，参数同 Lyric.from_lrc_str"""
+    return Lyric.from_lrc_str(text, **options)
+
+
+def dumps(lyric: Lyric, **options) -> str:
+    """将歌词写为 LRC 文本，参数同 Lyric.to_lrc"""
+    buffer = io.StringIO()
+    lyric.to_lrc(buffer, **options)
+    return buffer.getvalue()
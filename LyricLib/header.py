@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRC 文件头（ID 标签）的快速读取与改写
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import os
+import re
+import codecs
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .subclass import MetaInfo
+from .exceptions import OuterlyError, UnsupportedFormatError
+from .lrc.constants import LRC_TAG_PATTERN
+from .lrc.tags import ID_TAGS
+from .lrc.utils import TagType, get_lrc_tag_type
+
+DEFAULT_HEADER_BUDGET = 64 * 1024
+"""读取文件头时默认至多读入的字节数"""
+
+_READ_SIZE = 8192
+"""每次读入的字节数上限"""
+
+_COPY_SIZE = 1024 * 1024
+"""改写文件头时，每次复制正文的字节数"""
+
+_LEADING_TAGS = re.compile(r"(?:\s*{})+".format(LRC_TAG_PATTERN))
+"""行首连续的标签"""
+
+
+def _iter_lines(
+    lrc_path: str, lrc_encoding: str, max_bytes: Optional[int], errors: str
+) -> Iterator[str]:
+    """
+    逐行读入文件，读入的字节数达到 max_bytes 时停止
+
+    以增量解码器解码，故多字节编码（含 UTF-16）的字符不会在行间断开
+    """
+    decoder = codecs.getincrementaldecoder(lrc_encoding)(errors)
+    pending = ""
+    remaining = max_bytes
+    with open(lrc_path, "rb") as f:
+        while remaining is None or remaining > 0:
+            chunk = f.readline(
+                _READ_SIZE if remaining is None else min(_READ_SIZE, remaining)
+            )
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            pending += decoder.decode(chunk)
+            if "\n" in pending:
+                *lines, pending = pending.split("\n")
+                yield from lines
+        else:
+            # 达到字节上限时，最后一行可能并不完整，舍去
+            return
+        pending += decoder.decode(b"", True)
+    if pending:
+        yield pending
+
+
+def _apply_id_tag(meta_info: MetaInfo, tag: str):
+    """将一个 ID 标签写入元信息，与 Lyric.from_lrc 的处理相同"""
+    colon_pos = tag.find(":")
+    id_name = tag[:colon_pos]
+    meta_info.set_meta(ID_TAGS.meta_name(id_name), tag[colon_pos + 1 :])
+
+
+def read_lrc_meta(
+    lrc_path: str,
+    lrc_encoding: str = "utf-8",
+    max_bytes: Optional[int] = DEFAULT_HEADER_BUDGET,
+    stop_at_lyrics: bool = True,
+    errors: str = "strict",
+) -> MetaInfo:
+    """
+    仅读取 LRC 歌词文件的 ID 标签，不解析任何歌词
+
+    逐行读入文件，遇到第一个带时间标签的行即停止；
+    ID 标签与歌词混排的文件可令 stop_at_lyrics 为 False，此时读至 max_bytes 为止
+
+    Parameters
+    ----------
+    lrc_path: str
+        LRC歌词文件地址
+    lrc_encoding: str
+        LRC歌词文件所使用的字符编码
+    max_bytes: int, optional
+        至多读入的字节数，为 None 时不设上限
+    stop_at_lyrics: bool
+        是否在第一个带时间标签的行处停止
+    errors: str
+        解码出错时的处理方式，同 bytes.decode；
+        批量建立目录时可用 "replace" 以免个别文件中断整批任务
+
+    Returns
+    -------
+    MetaInfo
+        元信息，与 Lyric.from_lrc(lrc_path).meta_info 相同（在读入的范围之内）
+    """
+    meta_info = MetaInfo()
+    first = True
+    for line in _iter_lines(lrc_path, lrc_encoding, max_bytes, errors):
+        if first:
+            line = line.lstrip("\ufeff")
+            first = False
+        line = line.strip()
+        # 绝大多数行不是 ID 标签，先以首字符排除
+        if not line.startswith("["):
+            continue
+        if line[1:2].isdigit():
+            if stop_at_lyrics:
+                break
+            continue
+        leading = _LEADING_TAGS.match(line)
+        if leading is None:
+            continue
+        is_timed = False
+        for tag in re.findall(LRC_TAG_PATTERN, leading.group()):
+            tag = tag[1:-1]
+            tag_type = get_lrc_tag_type(tag)
+            if tag_type == TagType.ID:
+                _apply_id_tag(meta_info, tag)
+            elif tag_type == TagType.TIME:
+                is_timed = True
+        if is_timed and stop_at_lyrics:
+            break
+    return meta_info
+
+
+def _read_lrc_meta(lrc_path: str, options: dict) -> MetaInfo:
+    return read_lrc_meta(lrc_path, **options)
+
+
+def _read_lrc_meta_or_error(lrc_path: str, options: dict):
+    try:
+        return read_lrc_meta(lrc_path, **options)
+    except (OSError, UnicodeError) as error:
+        return error
+
+
+def read_lrc_meta_files(
+    lrc_paths: Iterable[str],
+    lrc_encoding: str = "utf-8",
+    max_workers: Optional[int] = None,
+    return_exceptions: bool = False,
+    **options,
+) -> Dict[str, Union[MetaInfo, Exception]]:
+    """
+    以线程池批量读取 LRC 歌词文件的 ID 标签
+
+    读取文件头以等待读盘为主，故使用线程池而非进程池
+
+    Parameters
+    ----------
+    lrc_paths: Iterable[str]
+        LRC歌词文件地址
+    lrc_encoding: str
+        LRC歌词文件所使用的字符编码
+    max_workers: int, optional
+        线程数，为 1 时不启用线程池
+    return_exceptions: bool
+        为 True 时，无法读取或解码的文件以其异常对应；否则遇到首个错误即抛出
+    options:
+        传给 read_lrc_meta 的其余参数
+
+    Returns
+    -------
+    Dict[str, MetaInfo | Exception]
+        以文件地址对应其元信息
+    """
+    lrc_paths = list(lrc_paths)
+    options = dict(options, lrc_encoding=lrc_encoding)
+    read = _read_lrc_meta_or_error if return_exceptions else _read_lrc_meta
+
+    if max_workers == 1:
+        return {path: read(path, options) for path in lrc_paths}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(
+            zip(
+                lrc_paths,
+                executor.map(read, lrc_paths, [options] * len(lrc_paths)),
+            )
+        )
+
+
+# 改写
+
+HeaderPatch = Union[MetaInfo, Mapping[str, Optional[str]]]
+"""
+文件头的改动
+- MetaInfo 以其非空的各项替换或新增对应的 ID 标签
+- Mapping 以 ID 标签（如 "ar"）或元信息名称（如 "Singer"）为键，
+  值为新的内容，为 None 时删去该标签
+"""
+
+
+def _tag_identity(name: str) -> str:
+    """ID 标签或元信息名称所指的项，同一项的不同写法（如 ve 与 ver）结果相同"""
+    if ID_TAGS.id_tag(name) is not None:
+        return name
+    return ID_TAGS.meta_name(name.lower())
+
+
+def _patch_items(patch: HeaderPatch) -> Dict[str, Tuple[str, Optional[str]]]:
+    """将改动整理为 {项: (新增时所用的标签, 值)}"""
+    if isinstance(patch, MetaInfo):
+        items = [(tag, value) for tag, value in patch.lrc_id_dict().items() if value]
+    else:
+        items = list(patch.items())
+    result = {}
+    for name, value in items:
+        identity = _tag_identity(name)
+        if identity not in result:
+            result[identity] = (ID_TAGS.id_tag(name) or name, value)
+    return result
+
+
+def _copy_rest(src: BinaryIO, dst: BinaryIO):
+    """
+    将 src 自当前位置起的其余内容复制到 dst
+
+    支持时以 os.sendfile 在内核中直接复制，否则以大块读写
+    """
+    dst.flush()
+    offset = src.tell()
+    sendfile = getattr(os, "sendfile", None)
+    if sendfile is not None:
+        try:
+            while True:
+                sent = sendfile(dst.fileno(), src.fileno(), offset, _COPY_SIZE)
+                if not sent:
+                    return
+                offset += sent
+        except OSError:
+            # 部分系统不支持文件到文件的 sendfile，自已复制之处继续
+            src.seek(offset)
+    shutil.copyfileobj(src, dst, _COPY_SIZE)
+
+
+def patch_lrc_header(
+    lrc_path: str,
+    patch: HeaderPatch,
+    output_path: Optional[str] = None,
+    lrc_encoding: str = "utf-8",
+    replace_all: bool = False,
+    max_bytes: Optional[int] = DEFAULT_HEADER_BUDGET,
+    fsync: bool = False,
+) -> bool:
+    """
+    改写 LRC 歌词文件的 ID 标签，正文按字节原样复制
+
+    仅解码文件头中的各行；文件头止于第一个带时间标签的行，或读入 max_bytes 字节处。
+    未改动的行（含空行、未知标签与换行符）均按原样保留，
+    已有的标签在原处替换，新增的标签置于文件头中最后一个标签之后。
+    结果先写入同一目录下的临时文件，再以原子的重命名替换目标文件，
+    中途出错不会留下写了一半的文件
+
+    Parameters
+    ----------
+    lrc_path: str
+        LRC歌词文件地址
+    patch: MetaInfo | Mapping[str, str | None]
+        文件头的改动，见 HeaderPatch
+    output_path: str, optional
+        输出文件地址，为 None 时原地改写，此时没有改动则不写入
+    lrc_encoding: str
+        LRC歌词文件所使用的字符编码，须与 ASCII 兼容
+    replace_all: bool
+        是否删去 patch 中未提及的所有 ID 标签
+    max_bytes: int, optional
+        文件头至多的字节数，为 None 时不设上限
+    fsync: bool
+        替换前是否将临时文件写入磁盘
+
+    Returns
+    -------
+    bool
+        文件头是否有改动
+
+    Raises
+    ------
+    UnsupportedFormatError
+        lrc_encoding 与 ASCII 不兼容（如 UTF-16）时
+    """
+    if "\n[:]".encode(lrc_encoding) != b"\n[:]":
+        raise UnsupportedFormatError(
+            lrc_encoding, "改写文件头仅支持与 ASCII 兼容的编码"
+        )
+
+    patches = _patch_items(patch)
+    pending = dict(patches)
+    lines: List[bytes] = []
+    insert_at = 0
+    newline = b"\n"
+    changed = False
+
+    with open(lrc_path, "rb") as src:
+        bom = src.read(len(codecs.BOM_UTF8))
+        if bom != codecs.BOM_UTF8:
+            bom = b""
+            src.seek(0)
+
+        consumed = 0
+        while max_bytes is None or consumed < max_bytes:
+            position = src.tell()
+            raw = src.readline()
+            if not raw:
+                break
+            if not lines and raw.endswith(b"\r\n"):
+                newline = b"\r\n"
+            text = raw.decode(lrc_encoding).strip()
+            leading = _LEADING_TAGS.match(text) if text.startswith("[") else None
+            if leading is None or leading.end() != len(text):
+                # 空行或带有文字的行
+                if text.startswith("[") and text[1:2].isdigit():
+                    src.seek(position)
+                    break
+                lines.append(raw)
+                consumed += len(raw)
+                continue
+
+            tags = [tag[1:-1] for tag in re.findall(LRC_TAG_PATTERN, text)]
+            if any(get_lrc_tag_type(tag) == TagType.TIME for tag in tags):
+                src.seek(position)
+                break
+
+            kept = []
+            for tag in tags:
+                if get_lrc_tag_type(tag) != TagType.ID:
+                    kept.append(tag)
+                    continue
+                colon_pos = tag.find(":")
+                identity = _tag_identity(tag[:colon_pos])
+                if identity not in patches:
+                    if not replace_all:
+                        kept.append(tag)
+                    continue
+                if identity in pending:
+                    value = pending.pop(identity)[1]
+                    if value is not None:
+                        kept.append("{}:{}".format(tag[:colon_pos], value))
+                # 同一项重复出现时，仅保留替换后的第一个
+
+            if kept != tags:
+                changed = True
+                lines.extend(
+                    "[{}]".format(tag).encode(lrc_encoding) + newline for tag in kept
+                )
+            else:
+                lines.append(raw)
+            insert_at = len(lines)
+            consumed += len(raw)
+
+        added = [
+            "[{}:{}]".format(tag, value).encode(lrc_encoding) + newline
+            for tag, value in pending.values()
+            if value is not None
+        ]
+        if added:
+            changed = True
+            lines[insert_at:insert_at] = added
+        if not changed and output_path is None:
+            return False
+
+        target = lrc_path if output_path is None else output_path
+        handle, temp_path = tempfile.mkstemp(
+            prefix="." + os.path.basename(target) + ".",
+            suffix=".tmp",
+            dir=os.path.dirname(os.path.abspath(target)),
+        )
+        try:
+            with os.fdopen(handle, "wb") as dst:
+                dst.write(bom)
+                dst.writelines(lines)
+                _copy_rest(src, dst)
+                if fsync:
+                    dst.flush()
+                    os.fsync(dst.fileno())
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    # 须在关闭源文件之后替换，Windows 上无法替换仍处于打开状态的文件
+    try:
+        shutil.copymode(lrc_path, temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return changed
+
+
+def _patch_lrc_header(item: Tuple[str, HeaderPatch, Optional[str]], options: dict):
+    lrc_path, patch, output_path = item
+    return patch_lrc_header(lrc_path, patch, output_path, **options)
+
+
+def _patch_lrc_header_or_error(
+    item: Tuple[str, HeaderPatch, Optional[str]], options: dict
+):
+    try:
+        return _patch_lrc_header(item, options)
+    except (OSError, UnicodeError, OuterlyError) as error:
+        return error
+
+
+def patch_lrc_headers(
+    patches: Union[Mapping[str, HeaderPatch], Iterable[Tuple[str, HeaderPatch]]],
+    output_dir: Optional[str] = None,
+    lrc_encoding: str = "utf-8",
+    max_workers: Optional[int] = None,
+    return_exceptions: bool = False,
+    **options,
+) -> Dict[str, Union[bool, Exception]]:
+    """
+    以线程池批量改写 LRC 歌词文件的 ID 标签
+
+    改写文件头以读写磁盘为主，故使用线程池而非进程池；
+    同一改动用于多个文件时可传入 dict.fromkeys(lrc_paths, patch)
+
+    Parameters
+    ----------
+    patches: Mapping[str, HeaderPatch] | Iterable[Tuple[str, HeaderPatch]]
+        以文件地址对应其改动
+    output_dir: str, optional
+        输出目录，输出文件与原文件同名；为 None 时原地改写
+    lrc_encoding: str
+        LRC歌词文件所使用的字符编码
+    max_workers: int, optional
+        线程数，为 1 时不启用线程池
+    return_exceptions: bool
+        为 True 时，出错的文件以其异常对应；否则遇到首个错误即抛出
+    options:
+        传给 patch_lrc_header 的其余参数
+
+    Returns
+    -------
+    Dict[str, bool | Exception]
+        以文件地址对应其文件头是否有改动
+    """
+    if isinstance(patches, Mapping):
+        patches = patches.items()
+    items = [
+        (
+            path,
+            patch,
+            (
+                None
+                if output_dir is None
+                else os.path.join(output_dir, os.path.basename(path))
+            ),
+        )
+        for path, patch in patches
+    ]
+    options = dict(options, lrc_encoding=lrc_encoding)
+    patch = _patch_lrc_header_or_error if return_exceptions else _patch_lrc_header
+
+    if max_workers == 1:
+        return {item[0]: patch(item, options) for item in items}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(
+            zip(
+                (item[0] for item in items),
+                executor.map(patch, items, [options] * len(items)),
+            )
+        )
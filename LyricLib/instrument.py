@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+
+"""
+解析与写出流程的计量：分阶段计时、计数、观察者与日志
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import logging
+import threading
+from time import perf_counter
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .lrc.utils import LrcDiagnostic
+
+logger = logging.getLogger("LyricLib")
+"""词幕库的日志通道，调试信息与诊断信息均由此输出"""
+logger.addHandler(logging.NullHandler())
+
+PARSE_STAGES = ("read", "scan", "load", "timestamp", "enhanced")
+"""
+解析流程的各阶段
+- read 读入文件
+- scan 逐行检查括号、限制并提取标签
+- load 逐个载入标签及其内容，包含以下两项
+- timestamp 构造行首的时间标签
+- enhanced 解析增强格式的字词标签并建立词句
+"""
+
+WRITE_STAGES = ("meta", "lines", "extra")
+"""写出流程的各阶段：ID 标签、歌词行、未知标签"""
+
+COUNTERS = (
+    "bytes",
+    "lines",
+    "tags",
+    "time_tags",
+    "id_tags",
+    "unknown_tags",
+    "enhanced_segments",
+    "word_tags",
+    "errors",
+)
+"""各项计数：字符数、行数、标签数、时间标签数、ID 标签数、未知标签数、
+增强格式的词句数、字词标签数、错误数（宽松解析的诊断与流程抛出的异常）"""
+
+
+class PipelineMetrics:
+    """一次解析或写出的计量结果"""
+
+    pipeline: str
+    """流程名称，"parse" 或 "write\""""
+    source: Optional[str]
+    """来源，如文件地址"""
+    timings: Dict[str, float]
+    """各阶段的累计用时（秒）"""
+    counters: "Counter[str]"
+    """各项计数"""
+    total_seconds: float
+    """总用时（秒），流程结束后有效"""
+
+    def __init__(
+        self,
+        pipeline: str,
+        observers: Sequence["PipelineObserver"] = (),
+        source: Optional[str] = None,
+    ):
+        """
+        开始一次计量
+
+        Parameters
+        ----------
+        pipeline: str
+            流程名称
+        observers: Sequence[PipelineObserver]
+            接收计量结果的观察者
+        source: str, optional
+            来源，如文件地址
+        """
+        self.pipeline = pipeline
+        self.source = source
+        self.observers = list(observers)
+        self.timings = {}
+        self.counters = Counter()
+        self.total_seconds = 0.0
+        self._started = perf_counter()
+        self._notify("on_start")
+
+    def _notify(self, event: str, *args):
+        """通知各观察者；观察者的异常仅记入日志，不会打断流程或掩盖流程本身的异常"""
+        for observer in self.observers:
+            try:
+                getattr(observer, event)(self, *args)
+            except Exception:
+                logger.exception("观察者 %r 处理 %s 时出错", observer, event)
+
+    @staticmethod
+    def mark() -> float:
+        """当前时刻，供 lap 计时"""
+        return perf_counter()
+
+    def lap(self, stage: str, since: float) -> float:
+        """
+        将自 since 以来的用时计入某一阶段
+
+        Parameters
+        ----------
+        stage: str
+            阶段名称
+        since: float
+            由 mark 或上一次 lap 取得的时刻
+
+        Returns
+        -------
+        float
+            当前时刻，可作为下一阶段的开始
+        """
+        now = perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0.0) + now - since
+        return now
+
+    def count(self, name: str, number: int = 1):
+        """增加一项计数"""
+        self.counters[name] += number
+
+    def diagnostic(self, diagnostic: "LrcDiagnostic"):
+        """记录一条诊断信息"""
+        self.counters["errors"] += 1
+        self._notify("on_diagnostic", diagnostic)
+
+    def finish(self) -> "PipelineMetrics":
+        """结束计量并通知观察者"""
+        self.total_seconds = perf_counter() - self._started
+        self._notify("on_finish")
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转为字典，便于送入遥测系统
+
+        Returns
+        -------
+        Dict[str, Any]
+            pipeline、source、total_ms、各阶段用时 timings_ms 与各项计数 counters
+        """
+        return {
+            "pipeline": self.pipeline,
+            "source": self.source,
+            "total_ms": self.total_seconds * 1000,
+            "timings_ms": {
+                stage: seconds * 1000 for stage, seconds in self.timings.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+
+class PipelineObserver:
+    """
+    计量结果的观察者，按需覆盖各方法
+
+    同一观察者可能同时接收多个线程的通知，需要时请自行加锁；
+    各方法抛出的异常仅记入日志，不会影响解析或写出
+    """
+
+    def on_start(self, metrics: PipelineMetrics):
+        """流程开始时调用"""
+
+    def on_diagnostic(self, metrics: PipelineMetrics, diagnostic: "LrcDiagnostic"):
+        """宽松解析时每遇到一处错误调用一次"""
+
+    def on_finish(self, metrics: PipelineMetrics):
+        """流程结束时调用，此时计量结果已完整"""
+
+
+class CallbackObserver(PipelineObserver):
+    """以函数接收流程结束时的计量结果"""
+
+    def __init__(self, callback: Callable[[PipelineMetrics], Any]):
+        self.callback = callback
+
+    def on_finish(self, metrics: PipelineMetrics):
+        self.callback(metrics)
+
+
+class LoggingObserver(PipelineObserver):
+    """将计量结果写入日志，用时超出阈值时另记一条警告以便找出缓慢的文件"""
+
+    def __init__(
+        self,
+        level: int = logging.DEBUG,
+        slow_ms: Optional[float] = None,
+        target: logging.Logger = logger,
+    ):
+        """
+        Parameters
+        ----------
+        level: int
+            计量结果的日志级别
+        slow_ms: float, optional
+            用时超出此毫秒数时记一条警告
+        target: logging.Logger
+            日志通道
+        """
+        self.level = level
+        self.slow_ms = slow_ms
+        self.target = target
+
+    def on_diagnostic(self, metrics: PipelineMetrics, diagnostic: "LrcDiagnostic"):
+        self.target.warning("%s：%s", metrics.source or "<str>", diagnostic)
+
+    def on_finish(self, metrics: PipelineMetrics):
+        total_ms = metrics.total_seconds * 1000
+        if self.target.isEnabledFor(self.level):
+            self.target.log(
+                self.level,
+                "%s %s 用时 %.2fms 阶段 %s 计数 %s",
+                metrics.pipeline,
+                metrics.source or "<str>",
+                total_ms,
+                ", ".join(
+                    "{}={:.2f}ms".format(stage, seconds * 1000)
+                    for stage, seconds in metrics.timings.items()
+                ),
+                dict(metrics.counters),
+            )
+        if self.slow_ms is not None and total_ms > self.slow_ms:
+            self.target.warning(
+                "%s %s 用时 %.2fms，超出 %.2fms",
+                metrics.pipeline,
+                metrics.source or "<str>",
+                total_ms,
+                self.slow_ms,
+            )
+
+
+ObserverLike = Union[PipelineObserver, Callable[[PipelineMetrics], Any]]
+"""观察者，或接收计量结果的函数"""
+
+_global_observers: List[PipelineObserver] = []
+_global_lock = threading.Lock()
+
+
+def _as_observer(observer: ObserverLike) -> PipelineObserver:
+    if isinstance(observer, PipelineObserver):
+        return observer
+    return CallbackObserver(observer)
+
+
+def add_observer(observer: ObserverLike) -> PipelineObserver:
+    """
+    注册全局观察者，此后所有解析与写出流程均向其通知
+
+    Parameters
+    ----------
+    observer: PipelineObserver | Callable[[PipelineMetrics], Any]
+        观察者，或接收计量结果的函数
+
+    Returns
+    -------
+    PipelineObserver
+        实际注册的观察者，供 remove_observer 使用
+    """
+    observer = _as_observer(observer)
+    with _global_lock:
+        _global_observers.append(observer)
+    return observer
+
+
+def remove_observer(observer: PipelineObserver):
+    """注销全局观察者"""
+    with _global_lock:
+        _global_observers.remove(observer)
+
+
+def start_metrics(
+    pipeline: str,
+    observer: Optional[ObserverLike] = None,
+    source: Optional[str] = None,
+) -> Optional[PipelineMetrics]:
+    """
+    开始一次计量；既无全局观察者又未给出 observer 时返回 None，流程不做任何计量
+
+    Parameters
+    ----------
+    pipeline: str
+        流程名称
+    observer: PipelineObserver | Callable[[PipelineMetrics], Any], optional
+        仅接收本次结果的观察者
+    source: str, optional
+        来源，如文件地址
+
+    Returns
+    -------
+    PipelineMetrics | None
+        计量对象
+    """
+    observers = list(_global_observers)
+    if observer is not None:
+        observers.append(_as_observer(observer))
+    if not observers:
+        return None
+    return PipelineMetrics(pipeline, observers, source)
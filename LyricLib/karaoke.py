@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+"""
+卡拉OK字词时间轨
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+from array import array
+from bisect import bisect_right
+from typing import NamedTuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .main import Lyric
+
+
+class KaraokeWord(NamedTuple):
+    """某一时刻正在演唱的字词"""
+
+    index: int
+    """字词于时间轨中的序号"""
+    line_index: int
+    """所在词句于时间轴中的序号"""
+    text: str
+    """字词内容"""
+    start_ms: int
+    """开始时间（毫秒）"""
+    end_ms: int
+    """结束时间（毫秒）"""
+    progress: float
+    """演唱进度，0 至 1"""
+
+
+class KaraokeTrack:
+    """
+    编译后的卡拉OK字词时间轨
+
+    将歌词中各词句的字词标签展平为若干 int64 数组，以二分查找定位某一时刻的字词。
+    字词按开始时间排列，第 i 个字词的内容为 text[text_offsets[i]:text_offsets[i + 1]]
+    """
+
+    starts: "array[int]"
+    """各字词的开始时间（毫秒）"""
+    ends: "array[int]"
+    """各字词的结束时间（毫秒）"""
+    line_indices: "array[int]"
+    """各字词所在词句于时间轴中的序号"""
+    text_offsets: "array[int]"
+    """各字词于 text 中的起始位置，末尾多一项为 text 的长度"""
+    text: str
+    """所有字词首尾相接的文本"""
+    line_starts: "array[int]"
+    """各词句的开始时间（毫秒）"""
+
+    def __init__(self):
+        """建立一个空的时间轨，一般应使用 from_lyric 创建"""
+        self.starts = array("q")
+        self.ends = array("q")
+        self.line_indices = array("q")
+        self.text_offsets = array("q", [0])
+        self.text = ""
+        self.line_starts = array("q")
+
+    @classmethod
+    def from_lyric(
+        cls,
+        lyric: "Lyric",
+        row: int = 0,
+        whole_lines: bool = True,
+        tail_ms: int = 3000,
+    ):
+        """
+        从歌词对象编译时间轨
+
+        Parameters
+        ----------
+        lyric: Lyric
+            歌词对象
+        row: int
+            取用 word_extension 中的第几行，对照歌词中一般 0 为原文
+        whole_lines: bool
+            不含字词标签的词句是否整句作为一个字词收入
+        tail_ms: int
+            最后一句既无持续时间又无下一句时，其结束时间距开始时间的毫秒数
+
+        Returns
+        -------
+        KaraokeTrack
+            编译后的时间轨
+        """
+        track = cls()
+
+        lines = sorted(
+            ((time.in_milliseconds, block) for time, block in lyric.lyrics.items()),
+            key=lambda line: line[0],
+        )
+        lines_num = len(lines)
+
+        texts = []
+        offset = 0
+        for line_index in range(lines_num):
+            line_ms, block = lines[line_index]
+            track.line_starts.append(line_ms)
+
+            if block.duration is not None:
+                line_end_ms = line_ms + block.duration.in_milliseconds
+            elif line_index + 1 < lines_num:
+                line_end_ms = lines[line_index + 1][0]
+            else:
+                line_end_ms = line_ms + tail_ms
+
+            if block.word_extension and row < len(block.word_extension):
+                words = sorted(
+                    (time.in_milliseconds, "".join(parts))
+                    for time, parts in block.word_extension[row].items()
+                )
+            elif whole_lines and str(block).strip():
+                words = [(line_ms, str(block))]
+            else:
+                continue
+
+            for i in range(len(words)):
+                word_ms, word_text = words[i]
+                track.starts.append(word_ms)
+                track.ends.append(
+                    words[i + 1][0] if i + 1 < len(words) else max(line_end_ms, word_ms)
+                )
+                track.line_indices.append(line_index)
+                texts.append(word_text)
+                offset += len(word_text)
+                track.text_offsets.append(offset)
+
+        track.text = "".join(texts)
+
+        # 字词标签越出所在词句时，各字词未必按时间排列，此时重新排序以便二分查找
+        if any(
+            track.starts[i] < track.starts[i - 1] for i in range(1, len(track.starts))
+        ):
+            order = sorted(range(len(texts)), key=track.starts.__getitem__)
+            track.starts = array("q", (track.starts[i] for i in order))
+            track.ends = array("q", (track.ends[i] for i in order))
+            track.line_indices = array("q", (track.line_indices[i] for i in order))
+            texts = [texts[i] for i in order]
+            track.text = "".join(texts)
+            track.text_offsets = array("q", [0])
+            offset = 0
+            for word_text in texts:
+                offset += len(word_text)
+                track.text_offsets.append(offset)
+
+        return track
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def word_text(self, index: int) -> str:
+        """第 index 个字词的内容"""
+        return self.text[self.text_offsets[index] : self.text_offsets[index + 1]]
+
+    def index_at(self, position_ms: int) -> int:
+        """
+        查找某一时刻正在演唱的字词序号
+
+        Parameters
+        ----------
+        position_ms: int
+            播放位置（毫秒）
+
+        Returns
+        -------
+        int
+            字词序号，若此刻不在任何字词之内则为 -1
+        """
+        index = bisect_right(self.starts, position_ms) - 1
+        if index >= 0 and position_ms < self.ends[index]:
+            return index
+        return -1
+
+    def word_at(self, position_ms: int) -> Optional[KaraokeWord]:
+        """
+        查找某一时刻正在演唱的字词及其进度
+
+        Parameters
+        ----------
+        position_ms: int
+            播放位置（毫秒）
+
+        Returns
+        -------
+        KaraokeWord | None
+            正在演唱的字词，若此刻不在任何字词之内则为 None
+        """
+        index = self.index_at(position_ms)
+        if index < 0:
+            return None
+        start_ms = self.starts[index]
+        end_ms = self.ends[index]
+        return KaraokeWord(
+            index,
+            self.line_indices[index],
+            self.word_text(index),
+            start_ms,
+            end_ms,
+            (position_ms - start_ms) / (end_ms - start_ms),
+        )
+
+    def line_at(self, position_ms: int) -> int:
+        """
+        查找某一时刻所在的词句序号
+
+        Parameters
+        ----------
+        position_ms: int
+            播放位置（毫秒）
+
+        Returns
+        -------
+        int
+            词句于时间轴中的序号，若尚未开始则为 -1
+        """
+        return bisect_right(self.line_starts, position_ms) - 1
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""
+解析资源限制
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+from dataclasses import dataclass
+from typing import Optional
+
+from .exceptions import LimitExceededError
+
+
+@dataclass(frozen=True)
+class ParseLimits:
+    """解析时的资源上限，为 None 者不作限制"""
+
+    max_bytes: Optional[int] = None
+    """输入大小上限，对文件为字节数，对文本为字符数"""
+    max_line_length: Optional[int] = None
+    """单行字符数上限"""
+    max_tags_per_line: Optional[int] = None
+    """单行标签数上限"""
+    max_lines: Optional[int] = None
+    """总行数上限"""
+    max_word_tags: Optional[int] = None
+    """全文字词标签总数上限"""
+
+    def check(self, limit_name: str, actual: int):
+        """
+        检查某一项是否超出上限，超出则抛出 LimitExceededError
+
+        Parameters
+        ----------
+        limit_name: str
+            限制项名称，即本类的字段名
+        actual: int
+            实际数值
+        """
+        limit = getattr(self, limit_name)
+        if limit is not None and actual > limit:
+            raise LimitExceededError(limit_name, limit, actual)
+
+
+SERVICE_PARSE_LIMITS = ParseLimits(
+    max_bytes=1 << 20,
+    max_line_length=4096,
+    max_tags_per_line=64,
+    max_lines=20000,
+    max_word_tags=200000,
+)
+"""适用于解析用户上传内容的默认上限"""
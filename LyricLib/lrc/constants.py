@@ -16,20 +16,23 @@ Terms & Conditions: License.md in the root directory
 # Email TriM-Organization@hotmail.com
 # 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
 
-
-LRC_ID_TAG2META_NAME = {
-    "ar": "Singer",
-    "al": "Album",
-    "ti": "Title",
-    "au": "LyricAuthor",
-    "length": "Length",
-    "by": "Recorder",
-    "re": "Editor",
-    "ve": "Version",
-    "offset": "Offset",
-    "ver": "Version",
-}
-"""LRC歌词ID标签转元信息名称"""
+from types import MappingProxyType
+
+LRC_ID_TAG2META_NAME = MappingProxyType(
+    {
+        "ar": "Singer",
+        "al": "Album",
+        "ti": "Title",
+        "au": "LyricAuthor",
+        "length": "Length",
+        "by": "Recorder",
+        "re": "Editor",
+        "ve": "Version",
+        "offset": "Offset",
+        "ver": "Version",
+    }
+)
+"""LRC歌词ID标签转元信息名称，只读；自定义标签请以 register_id_tag 登记"""
 
 STABLE_LRC_TIME_FORMAT_STYLE = "{minutes:0>2.0f}:{seconds:0>2.0f}.{centiseconds:0>2.0f}"
 """标准LRC时间格式"""
@@ -28,6 +28,16 @@ class LrcDestroyedError(InvalidFileError):
         super().__init__("LRC 文件", *args)
 
 
+class LrcSyntaxError(LrcDestroyedError):
+    """Lrc文件中某一位置的语法错误"""
+
+    def __init__(self, line: int = 0, column: int = 0, *args):
+        """Lrc文件第 line 行第 column 列出现错误"""
+        super().__init__("第 {} 行第 {} 列".format(line, column), *args)
+        self.line = line
+        self.column = column
+
+
 class WordTagError(ParseError):
     """字词标签错误"""
 
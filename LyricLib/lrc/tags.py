@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+LRC 歌词 ID 标签与元信息名称的双向对照表
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+from types import MappingProxyType
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+from .constants import LRC_ID_TAG2META_NAME
+
+
+class IdTagTable:
+    """
+    ID 标签与元信息名称的双向对照表
+
+    一个名称可对应多个标签（如 ve 与 ver），读入时均可识别，写出时仅用其规范标签。
+    修改时整体替换内部的字典而不原地改动，故查询无需加锁
+    """
+
+    def __init__(self, tag2name: Mapping[str, str] = LRC_ID_TAG2META_NAME):
+        """
+        Parameters
+        ----------
+        tag2name: Mapping[str, str]
+            初始的 ID 标签对应元信息名称，不会被修改；
+            同一名称对应多个标签时，先出现者为规范标签
+        """
+        self._tag2name: Dict[str, str] = {}
+        self._name2tag: Dict[str, str] = {}
+        for tag, name in tag2name.items():
+            self.register(tag, name, canonical=False)
+
+    def meta_name(self, tag: str) -> str:
+        """
+        ID 标签对应的元信息名称
+
+        Parameters
+        ----------
+        tag: str
+            ID 标签，如 "ar"
+
+        Returns
+        -------
+        str
+            元信息名称，如 "Singer"；未登记的标签原样返回
+        """
+        return self._tag2name.get(tag, tag)
+
+    def id_tag(self, meta_name: str) -> Optional[str]:
+        """
+        元信息名称对应的规范 ID 标签
+
+        Parameters
+        ----------
+        meta_name: str
+            元信息名称，如 "Version"
+
+        Returns
+        -------
+        str | None
+            规范 ID 标签，如 "ve"；未登记的名称返回 None
+        """
+        return self._name2tag.get(meta_name)
+
+    def register(self, tag: str, meta_name: str, canonical: bool = True):
+        """
+        登记一个 ID 标签
+
+        Parameters
+        ----------
+        tag: str
+            ID 标签
+        meta_name: str
+            对应的元信息名称：为 MetaInfo 的属性名时写入该属性，否则写入 MetaInfo.Other
+        canonical: bool
+            是否作为该名称的规范标签；为 False 时仅在该名称尚无规范标签时成为规范标签
+        """
+        tag2name = dict(self._tag2name)
+        name2tag = dict(self._name2tag)
+        old_name = tag2name.get(tag)
+        if old_name is not None and name2tag.get(old_name) == tag:
+            del name2tag[old_name]
+        tag2name[tag] = meta_name
+        if canonical or meta_name not in name2tag:
+            name2tag[meta_name] = tag
+        self._tag2name, self._name2tag = tag2name, name2tag
+
+    def unregister(self, tag: str):
+        """注销一个 ID 标签，其名称的规范标签改为同名的其余标签中最先登记者"""
+        tag2name = dict(self._tag2name)
+        name2tag = dict(self._name2tag)
+        name = tag2name.pop(tag)
+        if name2tag.get(name) == tag:
+            del name2tag[name]
+            for other_tag, other_name in tag2name.items():
+                if other_name == name:
+                    name2tag[name] = other_tag
+                    break
+        self._tag2name, self._name2tag = tag2name, name2tag
+
+    def canonical_items(self) -> Iterator[Tuple[str, str]]:
+        """按登记顺序遍历 (规范标签, 元信息名称)"""
+        return ((tag, name) for name, tag in self._name2tag.items())
+
+    @property
+    def tag2name(self) -> Mapping[str, str]:
+        """所有 ID 标签对应的元信息名称，只读"""
+        return MappingProxyType(self._tag2name)
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self._tag2name
+
+
+ID_TAGS = IdTagTable()
+"""全局的 ID 标签对照表，读写 LRC 文件时使用"""
+
+
+def register_id_tag(tag: str, meta_name: str, canonical: bool = True):
+    """
+    在全局对照表中登记自定义的 ID 标签，参数同 IdTagTable.register
+
+    进程池的子进程以 spawn 方式启动时不会继承登记的结果，需在子进程中另行登记
+    """
+    ID_TAGS.register(tag, meta_name, canonical)
+
+
+def unregister_id_tag(tag: str):
+    """在全局对照表中注销 ID 标签，参数同 IdTagTable.unregister"""
+    ID_TAGS.unregister(tag)
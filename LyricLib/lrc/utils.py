@@ -19,7 +19,8 @@ Terms & Conditions: License.md in the root directory
 import re
 
 from enum import Enum
-from typing import Tuple
+from dataclasses import dataclass
+from typing import Optional, Tuple
 
 from .constants import LRC_TIME_PATTERN, LRC_ENHANCE_TIME_PATTERN_N
 from .exceptions import TimeTagError
@@ -33,6 +34,23 @@ class TagType(Enum):
     UNKNOWN = 2  # 未知标签
 
 
+@dataclass
+class LrcDiagnostic:
+    """宽松解析时记录的单条诊断信息"""
+
+    line: int
+    """行号，自 1 起"""
+    column: int
+    """列号，自 1 起"""
+    message: str
+    """诊断信息"""
+    text: str = ""
+    """出错的整行内容"""
+
+    def __str__(self) -> str:
+        return "第 {} 行第 {} 列：{}".format(self.line, self.column, self.message)
+
+
 def parse_lrc_time_tag(time_tag_str) -> Tuple[int, ...]:
     """
     将LRC文件的字符串格式的时间戳解析为 时、分、秒、毫秒
@@ -84,26 +102,48 @@ def parse_lrc_time_tag(time_tag_str) -> Tuple[int, ...]:
     return h, minute, s, ms
 
 
-def is_lrc_tag_valid(text):
+def parse_lrc_length(length: str) -> Optional[int]:
     """
-    检查标签括号是否匹配
-    :param text: lrc歌词文件完整内容
-    :return: 如果[]与<>匹配则返回True，否则返回False
+    将 [length:] 标签的值解析为毫秒
+    :param length: 标签的值，如 "03:25" 或 "03:25.50"
+    :return: 毫秒数，无法解析时返回None
+    """
+    length = length.strip()
+    if not re.match(LRC_TIME_PATTERN, length):
+        return None
+    h, minute, s, ms = parse_lrc_time_tag(length)
+    return ((h * 60 + minute) * 60 + s) * 1000 + ms
+
+
+def find_lrc_tag_error(text) -> Optional[int]:
+    """
+    查找第一处不匹配的标签括号
+    :param text: lrc歌词文件内容
+    :return: 出错括号的下标（未闭合时为最后一个未闭合的左括号）；括号均匹配则返回None
     """
     if text is None:
-        return True
+        return None
 
     res = list()
     pair = {"]": "[", ">": "<"}
-    for c in text:
+    for i, c in enumerate(text):
         if c == "]" or c == ">":
-            if not res or res[-1] != pair[c]:
-                return False
+            if not res or res[-1][0] != pair[c]:
+                return i
             res.pop()
         elif c == "[" or c == "<":
-            res.append(c)
+            res.append((c, i))
+
+    return res[-1][1] if res else None
 
-    return len(res) == 0
+
+def is_lrc_tag_valid(text):
+    """
+    检查标签括号是否匹配
+    :param text: lrc歌词文件完整内容
+    :return: 如果[]与<>匹配则返回True，否则返回False
+    """
+    return find_lrc_tag_error(text) is None
 
 
 def get_lrc_tag_type(tag):
@@ -35,34 +35,68 @@
     Terms & Conditions: License.md in the root directory
 """
 
+import os
 import re
 import codecs
-from typing import Any, TextIO, Dict
+from operator import attrgetter, methodcaller
+from types import MappingProxyType
+from typing import Any, TextIO, Dict, List, Mapping, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
-from .subclass import TimeStamp, SubtitleBlock, MetaInfo, StyledString
+from .subclass import (
+    TimeStamp,
+    SubtitleBlock,
+    FrozenSubtitleBlock,
+    MetaInfo,
+    FrozenMetaInfo,
+    StyledString,
+)
+from .types import SortedDict, SortedWindow, CopyOnWriteDict
+from .limits import ParseLimits
+from .textpool import TextPool
+from .exceptions import LyricBaseException, FrozenObjectError
+from .karaoke import KaraokeTrack
+from .durations import infer_durations
+from .merge import concat, merge_many, _rebase_block
+from .wordtiming import fill_word_timing
+from .validate import ValidationReport, validate_lyric
+from .aio import afrom_lrc, ato_lrc
+from .instrument import ObserverLike, PipelineMetrics, logger, start_metrics
 
 from .lrc.constants import (
     LRC_TAG_PATTERN,
-    LRC_ID_TAG2META_NAME,
+    LRC_TIME_PATTERN,
     STABLE_LRC_TIME_FORMAT_STYLE,
 )
-from .lrc.exceptions import LrcDestroyedError
+from .lrc.tags import ID_TAGS
+from .lrc.exceptions import LrcSyntaxError
 from .lrc.utils import (
     TagType,
+    LrcDiagnostic,
+    find_lrc_tag_error,
     is_lrc_segment_enhanced,
-    is_lrc_tag_valid,
     parse_lrc_enhanced_segment,
     get_lrc_tag_type,
 )
 
 
+TIME_ORDER = attrgetter("in_milliseconds")
+"""歌词字典的排序依据，以毫秒数比较时间戳远快于比较时间戳本身"""
+
+
+def _as_timestamp(value) -> Optional[TimeStamp]:
+    """将毫秒数转为时间戳，None 与时间戳原样返回"""
+    if value is None or isinstance(value, TimeStamp):
+        return value
+    return TimeStamp(ms=value)
+
+
 @dataclass(init=False)
 class Lyric:
     """歌词的操作以及数据类"""
 
-    lyrics: Dict[TimeStamp, SubtitleBlock]
-    """歌词字典，以一个时间戳对应一个单行歌词类"""
+    lyrics: SortedDict
+    """歌词字典，以一个时间戳对应一个单行歌词类，总按时间顺序排列"""
 
     meta_info: MetaInfo
     """篇目基础信息"""
@@ -73,94 +107,319 @@ class Lyric:
     whole_contexts: str
     """仅字词"""
 
+    diagnostics: List[LrcDiagnostic]
+    """宽松解析时记录的诊断信息"""
+
     def __init__(
         self,
-        lyrics: Dict[TimeStamp, SubtitleBlock] = {},
-        meta_info: MetaInfo = MetaInfo(),
+        lyrics: Optional[Mapping[TimeStamp, SubtitleBlock]] = None,
+        meta_info: Optional[MetaInfo] = None,
     ):
         """
         建立一个歌词对象
+        lyrics: Mapping[TimeStamp, SubtitleBlock] 歌词字典，未给出时新建空字典；
+            不是 SortedDict 时复制为 SortedDict
+        meta_info: MetaInfo 篇目基础信息，未给出时新建
         """
 
-        self.lyrics = lyrics
+        self.lyrics = (
+            lyrics
+            if isinstance(lyrics, SortedDict)
+            else SortedDict(lyrics, TIME_ORDER)
+        )
 
-        self.meta_info = meta_info
+        self.meta_info = MetaInfo() if meta_info is None else meta_info
 
         self.extra_info = {}
 
         self.whole_contexts = ""
 
+        self.diagnostics = []
+
     @classmethod
-    def from_lrc(cls, lrc_path: str, lrc_encoding: str = "utf-8"):
+    def from_lrc(
+        cls,
+        lrc_path: str,
+        lrc_encoding: str = "utf-8",
+        strict: bool = True,
+        limits: Optional[ParseLimits] = None,
+        text_pool: Optional[TextPool] = None,
+        observer: Optional[ObserverLike] = None,
+    ):
         """
         从Lrc歌词文件获取歌词对象
         lrc_path: str LRC歌词文件地址
         lrc_encoding: str LRC歌词文件所使用的字符编码
+        strict: bool 是否以严格模式解析，参见 from_lrc_str
+        limits: ParseLimits 解析时的资源上限，参见 from_lrc_str
+        text_pool: TextPool 文本驻留池，参见 from_lrc_str
+        observer: PipelineObserver 计量结果的观察者，参见 from_lrc_str
         """
-        with codecs.open(lrc_path, "r", encoding=lrc_encoding) as f:
-            # 整个歌词文件的内容
-            lrc_raw_text = f.read()
+        metrics = start_metrics("parse", observer, lrc_path)
+        try:
+            if metrics is not None:
+                started = metrics.mark()
+
+            if limits is not None:
+                # 读入之前先以文件大小判断
+                limits.check("max_bytes", os.path.getsize(lrc_path))
+
+            with codecs.open(lrc_path, "r", encoding=lrc_encoding) as f:
+                # 整个歌词文件的内容
+                lrc_raw_text = f.read()
+
+            if metrics is not None:
+                metrics.lap("read", started)
+            return cls._parse_lrc_str(lrc_raw_text, strict, limits, text_pool, metrics)
+        except Exception:
+            if metrics is not None:
+                metrics.count("errors")
+            raise
+        finally:
+            if metrics is not None:
+                metrics.finish()
 
+    @classmethod
+    def from_lrc_str(
+        cls,
+        lrc_raw_text: str,
+        strict: bool = True,
+        limits: Optional[ParseLimits] = None,
+        text_pool: Optional[TextPool] = None,
+        observer: Optional[ObserverLike] = None,
+    ):
+        """
+        从Lrc歌词文本获取歌词对象
+        lrc_raw_text: str LRC歌词文件的完整内容
+        strict: bool 是否以严格模式解析
+            严格模式下，任何一处错误都将抛出，括号未闭合时抛出带行列号的 LrcSyntaxError；
+            宽松模式下，出错的行将被跳过，并将带行列号的诊断信息记入 diagnostics
+        limits: ParseLimits 解析时的资源上限
+            各项上限均在进行正则匹配等开销较大的处理之前检查，
+            无论是否为严格模式，超出时立即抛出 LimitExceededError
+        text_pool: TextPool 文本驻留池
+            给出时，词句与分词的文本均从池中取得，相同的文本在各歌词对象间共用同一对象；
+            可传入 DEFAULT_TEXT_POOL 以在整个进程内共用
+        observer: PipelineObserver 计量结果的观察者
+            给出或以 add_observer 注册了全局观察者时，记录各阶段用时与各项计数，
+            解析结束后（无论成功与否）通知观察者；否则不做任何计量
+        """
+        metrics = start_metrics("parse", observer)
+        if metrics is None:
+            return cls._parse_lrc_str(lrc_raw_text, strict, limits, text_pool)
+        try:
+            return cls._parse_lrc_str(lrc_raw_text, strict, limits, text_pool, metrics)
+        except Exception:
+            # 严格模式的语法错误、超出解析限制等，凡是抛出的异常均计入
+            metrics.count("errors")
+            raise
+        finally:
+            metrics.finish()
+
+    @classmethod
+    def _parse_lrc_str(
+        cls,
+        lrc_raw_text: str,
+        strict: bool,
+        limits: Optional[ParseLimits],
+        text_pool: Optional[TextPool],
+        metrics: Optional[PipelineMetrics] = None,
+    ):
+        """解析LRC歌词文本，参数同 from_lrc_str，metrics 为本次计量"""
         lrc = cls()
+        if metrics is not None:
+            started = metrics.mark()
+
+        if limits is not None:
+            limits.check("max_bytes", len(lrc_raw_text))
+        raw_lines = lrc_raw_text.splitlines()
+        if limits is not None:
+            limits.check("max_lines", len(raw_lines))
+        word_tags_num = 0
+
+        # 逐行提取标签及其标注内容
+        # 每项为 [行号, 列号, 标签, 标注内容, 整行, 共用此内容的前置时间标签]
+        records = []
+        for line_no, line in enumerate(raw_lines, 1):
+            if limits is not None:
+                limits.check("max_line_length", len(line))
+                limits.check("max_tags_per_line", line.count("["))
+                word_tags_num += line.count("<")
+                limits.check("max_word_tags", word_tags_num)
+
+            # 检查[]<>等标签括号是否匹配
+            error_pos = find_lrc_tag_error(line)
+            if error_pos is not None:
+                if strict:
+                    raise LrcSyntaxError(
+                        line_no, error_pos + 1, "标签括号未闭合", line
+                    )
+                lrc._diagnose(
+                    LrcDiagnostic(line_no, error_pos + 1, "标签括号未闭合", line),
+                    metrics,
+                )
+                continue
+
+            tags = list(re.finditer(LRC_TAG_PATTERN, line))
+            """单行上的标签"""
+
+            segments = re.split(LRC_TAG_PATTERN, line)
+            """标签后的文字"""
+
+            # 首个标签前的文字（包括不含标签的整行）属于上一个标签的标注内容
+            if records and segments[0].strip():
+                records[-1][3] += "\n" + segments[0]
+
+            for tag, segment in zip(tags, segments[1:]):
+                tag_text = tag.group()[1:-1]
+                if (
+                    records
+                    and records[-1][0] == line_no
+                    and not records[-1][3].strip()
+                    and re.match(LRC_TIME_PATTERN, records[-1][2])
+                    and re.match(LRC_TIME_PATTERN, tag_text)
+                ):
+                    # 形如 [t1][t2]歌词 的多时间标签行，前置的时间标签共用此内容
+                    leading = records.pop()
+                    records.append(
+                        [
+                            line_no,
+                            leading[1],
+                            tag_text,
+                            segment,
+                            line,
+                            leading[5] + [leading[2]],
+                        ]
+                    )
+                else:
+                    records.append(
+                        [line_no, tag.start() + 1, tag_text, segment, line, []]
+                    )
 
-        # 检查[]<>等标签括号是否匹配
-        if not is_lrc_tag_valid(lrc_raw_text):
-            raise LrcDestroyedError("标签括号未闭合")
+        if metrics is not None:
+            started = metrics.lap("scan", started)
+            metrics.count("bytes", len(lrc_raw_text))
+            metrics.count("lines", len(raw_lines))
+            metrics.count("tags", len(records))
 
-        # 提取所有标签
-        tags = [tag[1:-1] for tag in re.findall(LRC_TAG_PATTERN, lrc_raw_text)]
-        """单行上的标签"""
+        # 逐段解析标签及其内容
+        for line_no, column, tag, segment, line, leading_tags in records:
+            try:
+                lrc._load_lrc_tag(
+                    tag, segment.strip(), leading_tags, text_pool, metrics
+                )
+            except LyricBaseException as e:
+                if strict:
+                    raise
+                lrc._diagnose(
+                    LrcDiagnostic(
+                        line_no, column, " ".join(str(arg) for arg in e.args), line
+                    ),
+                    metrics,
+                )
 
-        # 提取所有标签标注的内容
-        segments = [
-            segment.strip() for segment in re.split(LRC_TAG_PATTERN, lrc_raw_text)
-        ]
-        """标签后的文字"""
+        if metrics is not None:
+            metrics.lap("load", started)
+        return lrc
 
-        segments = segments[1:]  # split结果包含第一个标签前的字符(包括空字符), 将其丢弃
+    def _diagnose(
+        self, diagnostic: LrcDiagnostic, metrics: Optional[PipelineMetrics] = None
+    ):
+        """记录一条宽松解析时的诊断信息"""
+        self.diagnostics.append(diagnostic)
+        logger.debug("%s", diagnostic)
+        if metrics is not None:
+            metrics.diagnostic(diagnostic)
 
-        tags_num = len(tags)
-        if tags_num != len(segments):
-            raise LrcDestroyedError("不匹配的标签数与标注内容个数")
+    def _load_lrc_tag(
+        self,
+        tag: str,
+        segment: str,
+        leading_tags: Sequence[str] = (),
+        text_pool: Optional[TextPool] = None,
+        metrics: Optional[PipelineMetrics] = None,
+    ):
+        """
+        载入单个LRC标签及其标注内容
+        tag: str 去除括号的标签
+        segment: str 标签后的文字
+        leading_tags: Sequence[str] 同一行中位于此标签之前、共用此标注内容的时间标签
+        text_pool: TextPool 文本驻留池
+        metrics: PipelineMetrics 本次解析的计量
+        """
+        tag_type = get_lrc_tag_type(tag)
+
+        # 判断标签是时间标签还是ID标签, 分别处理
+        if tag_type == TagType.TIME:
+            # 若为时间标签，载入歌词
+            if metrics is not None:
+                started = metrics.mark()
+                metrics.count("time_tags", len(leading_tags) + 1)
+            times = [TimeStamp.from_lrc_timetag(time_tag) for time_tag in leading_tags]
+            times.append(TimeStamp.from_lrc_timetag(tag))
+            if metrics is not None:
+                started = metrics.lap("timestamp", started)
+            if is_lrc_segment_enhanced(segment):
+                # 增强格式（字词标签处理）
+                timestamps, parts = parse_lrc_enhanced_segment(segment)
+
+                block = SubtitleBlock.from_lrc_str_list(
+                    "".join(parts),
+                    timestamps,
+                    parts[1:],
+                    start=times[0],
+                    text_pool=text_pool,
+                )
+                if metrics is not None:
+                    metrics.lap("enhanced", started)
+                    metrics.count("enhanced_segments")
+                    metrics.count("word_tags", len(timestamps))
+            else:
+                # 普通格式（单句标签）
+                block = SubtitleBlock(
+                    StyledString(segment)
+                    if text_pool is None
+                    else text_pool.intern(segment)
+                )
+            # 多个时间标签共用同一个词句对象；
+            # 但字词标签为绝对时间，增强格式的词句须按各时间标签平移，各自成句
+            first_ms = times[0].in_milliseconds
+            for time_now in times:
+                self.lyrics[time_now] = _rebase_block(
+                    block, time_now.in_milliseconds - first_ms
+                )
+            self.whole_contexts += str(block).replace(" ", "")
+
+        elif tag_type == TagType.ID:
+            # 若为ID标签，载入信息字典中
+            if metrics is not None:
+                metrics.count("id_tags")
+            colon_pos = tag.find(":")
+            self.meta_info.set_meta(
+                ID_TAGS.meta_name(tag[:colon_pos]), tag[colon_pos + 1 :]
+            )
 
-        # 逐段解析标签及其内容
-        for i in range(0, tags_num):
-            tag_type = get_lrc_tag_type(tags[i])
-
-            # 判断标签是时间标签还是ID标签, 分别处理
-            if tag_type == TagType.TIME:
-                # 若为时间标签，载入歌词
-                time_now = TimeStamp.from_lrc_timetag(tags[i])
-                if is_lrc_segment_enhanced(segments[i]):
-                    # 增强格式（字词标签处理）
-                    timestamps, parts = parse_lrc_enhanced_segment(segments[i])
-
-                    lrc.lyrics[time_now] = SubtitleBlock.from_lrc_str_list(
-                        "".join(parts), timestamps, parts[1:]
-                    )
-                else:
-                    # 普通格式（单句标签）
-                    lrc.lyrics[time_now] = SubtitleBlock(StyledString(segments[i]))
-                lrc.whole_contexts += str(lrc.lyrics[time_now]).replace(" ", "")
-
-            elif tag_type == TagType.ID:
-                # 若为ID标签，载入信息字典中
-                colon_pos = tags[i].find(":")
-                if tags[i][:colon_pos] in LRC_ID_TAG2META_NAME.keys():
-                    lrc.meta_info.set_meta(
-                        LRC_ID_TAG2META_NAME[tags[i][:colon_pos]],
-                        tags[i][colon_pos + 1 :],
-                    )
-                else:
-                    lrc.meta_info.set_meta(
-                        tags[i][:colon_pos], tags[i][colon_pos + 1 :]
-                    )
+        elif tag_type == TagType.UNKNOWN:
+            # 未知标签，独立载入
+            if metrics is not None:
+                metrics.count("unknown_tags")
+            self.extra_info[tag] = segment
 
-            elif tag_type == TagType.UNKNOWN:
-                # 未知标签，独立载入
-                lrc.extra_info[tags[i]] = segments[i]
+    def __getitem__(self, key):
+        """
+        取出某一时刻的词句，或以切片取出某一时间范围内的词句
 
-        return lrc
+        lyric[t] 同 lyric.lyrics[t]；
+        lyric[t0:t1] 为开始时刻位于 [t0, t1) 的词句组成的只读视图，
+        不复制任何词句，t0、t1 可为 TimeStamp 或毫秒数，省略时不设界限
+        """
+        if isinstance(key, slice):
+            if key.step is not None:
+                raise ValueError("歌词切片不支持步长")
+            return self.lyrics.window(
+                _as_timestamp(key.start), _as_timestamp(key.stop)
+            )
+        return self.lyrics[_as_timestamp(key)]
 
     @property
     def get_ids(self):
@@ -177,19 +436,304 @@ class Lyric:
         """获取未知标签字段列表"""
         return self.extra_info
 
-    def to_lrc(self, fdist: TextIO, time_format_style=STABLE_LRC_TIME_FORMAT_STYLE):
+    def freeze(self) -> "FrozenLyric":
+        """
+        建立不可修改的快照，快照可哈希，且可在多个线程间共用而无需加锁
+        """
+        return FrozenLyric(self)
+
+    def copy(self) -> "Lyric":
+        """
+        复制歌词对象，原对象保持不变，修改副本亦不影响原对象
+
+        先为各词句建立快照，耗时与词句数成正比；副本中的词句在首次被取出时才复制
+        """
+        return self.freeze().thaw()
+
+    def validate(self, **kwargs) -> ValidationReport:
+        """
+        一次遍历检查整条时间轴，返回可序列化为 JSON 的检查报告
+        参数同 validate_lyric
+        """
+        return validate_lyric(self, **kwargs)
+
+    def karaoke_track(self, **kwargs) -> KaraokeTrack:
+        """
+        编译卡拉OK字词时间轨
+        参数同 KaraokeTrack.from_lyric
+        """
+        return KaraokeTrack.from_lyric(self, **kwargs)
+
+    def infer_durations(self, **kwargs) -> "Lyric":
+        """
+        由时间轴推断各词句的持续时间
+        参数同 infer_durations
+        """
+        return infer_durations(self, **kwargs)
+
+    def fill_word_timing(self, **kwargs) -> "Lyric":
+        """
+        为每一句插值生成字词标签
+        参数同 fill_word_timing
+        """
+        return fill_word_timing(self, **kwargs)
+
+    @classmethod
+    def concat(cls, lyrics: Sequence["Lyric"], **kwargs) -> "Lyric":
+        """
+        将多份歌词首尾相接为一份
+        参数同 concat
+        """
+        return concat(lyrics, **kwargs)
+
+    @classmethod
+    def merge_many(cls, lyrics: Sequence["Lyric"], **kwargs) -> "Lyric":
+        """
+        将多份歌词的时间轴交织为一份
+        参数同 merge_many
+        """
+        return merge_many(lyrics, **kwargs)
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        转为仅含基本类型的字典，结构见 LyricLib.formats.json
+        """
+        from .formats.json import to_json
+
+        return to_json(self)
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any], **kwargs) -> "Lyric":
+        """
+        由 to_json 的结果还原歌词对象
+        参数同 from_json
+        """
+        from .formats.json import from_json
+
+        return from_json(data, **kwargs)
+
+    @classmethod
+    async def afrom_lrc(cls, lrc_path: str, **kwargs) -> "Lyric":
+        """
+        异步地从Lrc歌词文件获取歌词对象
+        参数同 afrom_lrc
+        """
+        return await afrom_lrc(lrc_path, **kwargs)
+
+    async def ato_lrc(self, lrc_path: str, **kwargs):
+        """
+        异步地保存为LRC文件
+        参数同 ato_lrc
+        """
+        await ato_lrc(self, lrc_path, **kwargs)
+
+    def to_lrc(
+        self,
+        fdist: TextIO,
+        time_format_style=STABLE_LRC_TIME_FORMAT_STYLE,
+        compact: bool = False,
+        observer: Optional[ObserverLike] = None,
+    ):
         """
         保存为LRC文件
+        compact: bool 是否将内容相同的词句合并为 [t1][t2]歌词 形式的多时间标签行
+        observer: PipelineObserver 计量结果的观察者，参见 from_lrc_str
         """
-        for id, value in self.meta_info.lrc_id_dict().items():
+        metrics = start_metrics("write", observer, getattr(fdist, "name", None))
+        if metrics is None:
+            self._write_lrc(fdist, time_format_style, compact)
+            return
+        try:
+            self._write_lrc(fdist, time_format_style, compact, metrics)
+        except Exception:
+            metrics.count("errors")
+            raise
+        finally:
+            metrics.finish()
+
+    def _write_lrc(
+        self,
+        fdist: TextIO,
+        time_format_style: str,
+        compact: bool,
+        metrics: Optional[PipelineMetrics] = None,
+    ):
+        """写出LRC文件，参数同 to_lrc，metrics 为本次计量"""
+        if metrics is not None:
+            started = metrics.mark()
+        for id_tag, value in self.meta_info.lrc_id_dict().items():
             if value:
-                fdist.write("[{}:{}]\n".format(id, value))
-        for time, sentense in self.lyrics.items():
-            fdist.write(
-                "[{}]{}\n".format(
-                    time.to_lrc_timetag(format_style=time_format_style),
-                    sentense.to_lrc_str(format_style=time_format_style),
+                fdist.write("[{}:{}]\n".format(id_tag, value))
+                if metrics is not None:
+                    metrics.count("id_tags")
+        if metrics is not None:
+            started = metrics.lap("meta", started)
+        if compact:
+            # 以首次出现的位置为准，将内容相同的词句归为一组
+            groups: Dict[Any, List] = {}
+            for time, sentense in self.lyrics.items():
+                if sentense.word_extension:
+                    # 字词标签为绝对时间，换算为相对于本句开始的时间后比较
+                    key = _relative_timing(sentense, time)
+                else:
+                    key = sentense.to_lrc_str(format_style=time_format_style)
+                if key in groups:
+                    groups[key][0].append(time)
+                else:
+                    groups[key] = [
+                        [time],
+                        sentense.to_lrc_str(format_style=time_format_style, start=time),
+                    ]
+            if metrics is not None:
+                metrics.count("lines", len(groups))
+                metrics.count("time_tags", len(self.lyrics))
+            for times, text in groups.values():
+                fdist.write(
+                    "{}{}\n".format(
+                        "".join(
+                            "[{}]".format(
+                                time.to_lrc_timetag(format_style=time_format_style)
+                            )
+                            for time in times
+                        ),
+                        text,
+                    )
                 )
-            )
+        else:
+            if metrics is not None:
+                metrics.count("lines", len(self.lyrics))
+                metrics.count("time_tags", len(self.lyrics))
+            for time, sentense in self.lyrics.items():
+                fdist.write(
+                    "[{}]{}\n".format(
+                        time.to_lrc_timetag(format_style=time_format_style),
+                        sentense.to_lrc_str(format_style=time_format_style, start=time),
+                    )
+                )
+        if metrics is not None:
+            started = metrics.lap("lines", started)
         for info_tag, value in self.extra_info.items():
             fdist.write("[{}]{}\n".format(info_tag, value))
+        if metrics is not None:
+            metrics.count("unknown_tags", len(self.extra_info))
+            metrics.lap("extra", started)
+
+
+def _relative_timing(block: SubtitleBlock, start: TimeStamp) -> Tuple:
+    """增强格式词句相对于其开始时间的内容与时间，平移后内容相同的词句得到相同的值"""
+    start_ms = start.in_milliseconds
+    return (
+        tuple(
+            tuple(
+                (time.in_milliseconds - start_ms, "".join(words))
+                for time, words in line.items()
+            )
+            for line in block.word_extension
+        ),
+        block.duration.in_milliseconds if block.duration else None,
+    )
+
+
+class FrozenLyric(Lyric):
+    """
+    不可修改的歌词快照
+
+    lyrics、extra_info 为只读映射，各词句与元信息亦为快照；
+    需要修改时以 thaw 取得可修改的歌词对象
+    """
+
+    lyrics: SortedWindow
+    meta_info: FrozenMetaInfo
+    extra_info: Mapping[str, Any]
+    diagnostics: Tuple[LrcDiagnostic, ...]
+
+    def __init__(self, lyric: Lyric):
+        """
+        由歌词对象建立快照
+        lyric: Lyric 歌词对象，快照建立后对其的修改不影响快照
+        """
+        if isinstance(lyric.lyrics, CopyOnWriteDict):
+            # 未取出过的词句本就是快照，无需再复制
+            items = lyric.lyrics.raw_items()
+        else:
+            items = lyric.lyrics.items()
+        frozen: Dict[int, FrozenSubtitleBlock] = {}
+        lyrics = SortedDict(key=TIME_ORDER)
+        for time, block in items:
+            # 多个时间标签共用的词句仍共用同一快照
+            if id(block) not in frozen:
+                frozen[id(block)] = block.freeze()
+            lyrics[time] = frozen[id(block)]
+
+        object.__setattr__(self, "lyrics", lyrics.window())
+        object.__setattr__(self, "meta_info", lyric.meta_info.freeze())
+        object.__setattr__(self, "extra_info", MappingProxyType(dict(lyric.extra_info)))
+        object.__setattr__(self, "whole_contexts", lyric.whole_contexts)
+        object.__setattr__(self, "diagnostics", tuple(lyric.diagnostics))
+        object.__setattr__(self, "_hash", None)
+
+    @classmethod
+    def _parse_lrc_str(cls, *args, **kwargs) -> "FrozenLyric":
+        return cls(Lyric._parse_lrc_str(*args, **kwargs))
+
+    def __setattr__(self, name: str, value: Any):
+        raise FrozenObjectError("歌词快照不可修改：", name)
+
+    def __delattr__(self, name: str):
+        raise FrozenObjectError("歌词快照不可修改：", name)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            object.__setattr__(
+                self,
+                "_hash",
+                hash(
+                    (
+                        tuple(self.lyrics.items()),
+                        self.meta_info,
+                        tuple(self.extra_info.items()),
+                        self.whole_contexts,
+                    )
+                ),
+            )
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, FrozenLyric):
+            return self is other or (
+                hash(self) == hash(other)
+                and self.lyrics == other.lyrics
+                and self.meta_info == other.meta_info
+                and self.extra_info == other.extra_info
+                and self.whole_contexts == other.whole_contexts
+                and self.diagnostics == other.diagnostics
+            )
+        return NotImplemented
+
+    def freeze(self) -> "FrozenLyric":
+        """本身即为快照，故返回自身"""
+        return self
+
+    def thaw(self) -> Lyric:
+        """
+        取得内容相同、可修改的歌词对象
+
+        不复制任何词句：歌词字典为写时复制的字典，各词句在首次被取出时才复制，
+        共用同一词句的时间标签复制后仍共用同一对象
+        """
+        lyric = Lyric(
+            CopyOnWriteDict(self.lyrics, methodcaller("thaw")), self.meta_info.thaw()
+        )
+        lyric.extra_info = dict(self.extra_info)
+        lyric.whole_contexts = self.whole_contexts
+        lyric.diagnostics = list(self.diagnostics)
+        return lyric
+
+    def copy(self) -> "FrozenLyric":
+        """快照无需复制，故返回自身"""
+        return self
+
+    # 打包支持 Pickle
+
+    def __reduce__(self):
+        return (self.__class__, (self.thaw(),))
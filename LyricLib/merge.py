@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+
+"""
+多份歌词的拼接与合并
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import heapq
+from operator import itemgetter
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+from .subclass import TimeStamp, SubtitleBlock, MetaInfo, META_FIELDS
+from .types import SortedDict, SortedWindow
+from .exceptions import MetaInfoConflictError
+from .lrc.utils import parse_lrc_length
+
+if TYPE_CHECKING:
+    from .main import Lyric
+
+Offset = Union[int, TimeStamp]
+"""偏移量，毫秒数或时间戳"""
+
+META_STRATEGIES = ("first", "fill", "join", "strict")
+"""
+元信息的合并方式
+- first 仅取第一份歌词的元信息
+- fill 以第一份为准，空缺的项由之后各份中首个非空的值补上
+- join 各项取各份中互不相同的非空值，以 " / " 相连
+- strict 同 fill，但同一项有多个不同的非空值时抛出 MetaInfoConflictError
+"""
+
+COLLISION_STRATEGIES = ("stack", "first", "last")
+"""
+不同歌词中时间相同的词句的处理方式
+- stack 合为一句，各行依次排列，如中西对照
+- first 保留先给出的一句
+- last 保留后给出的一句
+"""
+
+_META_FIELDS = tuple(name for name in META_FIELDS if name != "Length")
+"""参与合并的元信息，Length 由合并结果重新计算"""
+
+
+def _offset_ms(offset: Offset) -> int:
+    return offset.in_milliseconds if isinstance(offset, TimeStamp) else int(offset)
+
+
+def _shift(time: TimeStamp, offset_ms: int) -> TimeStamp:
+    """将时间戳平移 offset_ms 毫秒"""
+    ms = time.in_milliseconds + offset_ms
+    if ms < 0:
+        raise ValueError("平移后的时间早于零：{} {:+d}ms".format(time, offset_ms))
+    return TimeStamp(ms=ms)
+
+
+def _rebase_block(block: SubtitleBlock, offset_ms: int) -> SubtitleBlock:
+    """
+    平移词句的字词标签，无需平移时返回原对象
+
+    字词标签为绝对时间，须随词句一并平移；持续时间为相对时间，无需改动
+    """
+    if not offset_ms or not block.word_extension:
+        return block
+    result = SubtitleBlock(block.context, block.duration, None, block.location)
+    result.word_extension = [
+        {_shift(time, offset_ms): list(words) for time, words in line.items()}
+        for line in block.word_extension
+    ]
+    return result
+
+
+def lyric_end_ms(lyric: "Lyric") -> int:
+    """
+    歌词的结束时刻
+
+    取 [length:] 标签与最后一句的结束时刻（开始时刻加持续时间）中较晚者
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象
+
+    Returns
+    -------
+    int
+        结束时刻（毫秒），空歌词且无 [length:] 标签时为 0
+    """
+    end_ms = 0
+    if lyric.meta_info.Length:
+        end_ms = parse_lrc_length(lyric.meta_info.Length) or 0
+    if lyric.lyrics:
+        if isinstance(lyric.lyrics, (SortedDict, SortedWindow)):
+            time, block = lyric.lyrics.last()
+        else:
+            time = max(lyric.lyrics, key=lambda item: item.in_milliseconds)
+            block = lyric.lyrics[time]
+        end_ms = max(
+            end_ms,
+            time.in_milliseconds
+            + (block.duration.in_milliseconds if block.duration else 0),
+        )
+    return end_ms
+
+
+def _sorted_items(lyric: "Lyric") -> Iterable[Tuple[TimeStamp, SubtitleBlock]]:
+    """按时间顺序遍历词句"""
+    if isinstance(lyric.lyrics, (SortedDict, SortedWindow)):
+        return lyric.lyrics.items()
+    return sorted(lyric.lyrics.items(), key=lambda item: item[0].in_milliseconds)
+
+
+def _stream(
+    lyric: "Lyric", offset_ms: int
+) -> Iterator[Tuple[int, TimeStamp, SubtitleBlock]]:
+    """
+    按时间顺序给出平移后的 (毫秒数, 时间戳, 词句)
+
+    多个时间标签共用的词句平移后仍共用同一对象
+    """
+    rebased: Dict[int, SubtitleBlock] = {}
+    for time, block in _sorted_items(lyric):
+        if id(block) not in rebased:
+            rebased[id(block)] = _rebase_block(block, offset_ms)
+        if offset_ms:
+            time = _shift(time, offset_ms)
+        yield time.in_milliseconds, time, rebased[id(block)]
+
+
+def _row_extension(
+    block: SubtitleBlock, time: TimeStamp
+) -> List[Dict[TimeStamp, List]]:
+    """词句的字词标签，没有时以整行作为始于 time 的一个字词"""
+    if block.word_extension:
+        return [dict(line) for line in block.word_extension]
+    return [{time: list(row)} for row in block.context]
+
+
+def _stack(time: TimeStamp, first: SubtitleBlock, second: SubtitleBlock):
+    """将时间相同的两句合为一句，各行依次排列"""
+    result = SubtitleBlock(
+        [*first.context, *second.context],
+        (
+            first.duration
+            if second.duration is None
+            or (
+                first.duration is not None
+                and second.duration.in_milliseconds < first.duration.in_milliseconds
+            )
+            else second.duration
+        ),
+        None,
+        first.location,
+    )
+    if first.word_extension or second.word_extension:
+        result.word_extension = _row_extension(first, time) + _row_extension(
+            second, time
+        )
+    return result
+
+
+def merge_meta(metas: Sequence[MetaInfo], strategy: str = "fill") -> MetaInfo:
+    """
+    按给定方式合并多份元信息，Length 不参与合并
+
+    Parameters
+    ----------
+    metas: Sequence[MetaInfo]
+        各份元信息，不会被修改
+    strategy: str
+        合并方式，见 META_STRATEGIES
+
+    Returns
+    -------
+    MetaInfo
+        新的元信息
+
+    Raises
+    ------
+    MetaInfoConflictError
+        strategy 为 "strict" 且某项有多个不同的非空值时
+    """
+    if strategy not in META_STRATEGIES:
+        raise ValueError("未知的元信息合并方式：{}".format(strategy))
+    result = MetaInfo()
+    if not metas:
+        return result
+    if strategy == "first":
+        metas = metas[:1]
+
+    # 每项的各个不同的非空值，保持出现顺序
+    values: Dict[str, Dict[str, None]] = {}
+    for meta in metas:
+        for field in _META_FIELDS:
+            value = getattr(meta, field)
+            if value:
+                values.setdefault(field, {})[value] = None
+        for key, value in meta.Other.items():
+            if value:
+                values.setdefault("Other:" + key, {})[value] = None
+
+    for field, distinct in values.items():
+        if strategy == "strict" and len(distinct) > 1:
+            raise MetaInfoConflictError(field, list(distinct))
+        value = " / ".join(distinct) if strategy == "join" else next(iter(distinct))
+        if field.startswith("Other:"):
+            result.Other[field[6:]] = value
+        else:
+            setattr(result, field, value)
+    return result
+
+
+def _format_length(ms: int) -> str:
+    """毫秒数转为 [length:] 标签的值，分钟数可超过 59"""
+    return "{:02d}:{:02d}.{:02d}".format(ms // 60000, ms // 1000 % 60, ms // 10 % 100)
+
+
+def merge_many(
+    lyrics: Sequence["Lyric"],
+    offsets: Optional[Sequence[Offset]] = None,
+    meta: str = "fill",
+    on_collision: str = "stack",
+) -> "Lyric":
+    """
+    将多份歌词的时间轴交织为一份，如合唱的各声部或分开存放的译文
+
+    各份歌词的时间轴本已有序，以堆进行 k 路归并，总用时为 O(n log k)，
+    且不产生中间结果；字词标签随词句一并平移，多个时间标签共用的词句只平移一次
+
+    Parameters
+    ----------
+    lyrics: Sequence[Lyric]
+        各份歌词，不会被修改；无需平移的词句与原歌词共用同一对象
+    offsets: Sequence[int | TimeStamp], optional
+        各份歌词的平移量（毫秒数或时间戳），省略时均不平移
+    meta: str
+        元信息的合并方式，见 META_STRATEGIES
+    on_collision: str
+        不同歌词中时间相同的词句的处理方式，见 COLLISION_STRATEGIES；
+        同一份歌词内部不会出现时间相同的词句
+
+    Returns
+    -------
+    Lyric
+        新的歌词对象，[length:] 标签取各份歌词平移后结束时刻的最大值
+    """
+    from .main import Lyric, TIME_ORDER
+
+    if on_collision not in COLLISION_STRATEGIES:
+        raise ValueError("未知的时间冲突处理方式：{}".format(on_collision))
+    offsets_ms = (
+        [0] * len(lyrics) if offsets is None else list(map(_offset_ms, offsets))
+    )
+    if len(offsets_ms) != len(lyrics):
+        raise ValueError("平移量的个数与歌词的份数不同")
+
+    result = Lyric(
+        SortedDict(key=TIME_ORDER),
+        merge_meta([lyric.meta_info for lyric in lyrics], meta),
+    )
+    merged = result.lyrics
+    # heapq.merge 在毫秒数相同时按各份歌词给出的顺序排列，结果稳定
+    last_ms = None
+    last_time = None
+    for ms, time, block in heapq.merge(
+        *(_stream(lyric, offset) for lyric, offset in zip(lyrics, offsets_ms)),
+        key=itemgetter(0),
+    ):
+        if ms == last_ms:
+            if on_collision == "stack":
+                block = _stack(last_time, merged[last_time], block)
+            elif on_collision == "first":
+                continue
+            merged[last_time] = block
+            continue
+        # 归并结果依时间先后给出，逐个追加即可
+        merged[time] = block
+        last_ms, last_time = ms, time
+
+    end_ms = max(
+        (lyric_end_ms(lyric) + offset for lyric, offset in zip(lyrics, offsets_ms)),
+        default=0,
+    )
+    if end_ms:
+        result.meta_info.Length = _format_length(end_ms)
+    for lyric in lyrics:
+        for tag, value in lyric.extra_info.items():
+            result.extra_info.setdefault(tag, value)
+        result.whole_contexts += lyric.whole_contexts
+    return result
+
+
+def concat(
+    lyrics: Sequence["Lyric"],
+    offsets: Optional[Sequence[Offset]] = None,
+    gap_ms: int = 0,
+    meta: str = "fill",
+    on_collision: str = "last",
+) -> "Lyric":
+    """
+    将多份歌词首尾相接为一份，如串烧或整张专辑的连续歌词
+
+    Parameters
+    ----------
+    lyrics: Sequence[Lyric]
+        各份歌词，依次相接，不会被修改
+    offsets: Sequence[int | TimeStamp], optional
+        各份歌词的开始时刻（毫秒数或时间戳）；
+        省略时第一份始于 0，之后每份始于前一份结束（见 lyric_end_ms）后 gap_ms 毫秒
+    gap_ms: int
+        自动计算开始时刻时，相邻两份歌词之间的间隔毫秒数
+    meta: str
+        元信息的合并方式，见 META_STRATEGIES
+    on_collision: str
+        前后两份歌词的时间相同时的处理方式，见 COLLISION_STRATEGIES
+
+    Returns
+    -------
+    Lyric
+        新的歌词对象
+    """
+    if offsets is None:
+        offsets = []
+        start_ms = 0
+        for lyric in lyrics:
+            offsets.append(start_ms)
+            start_ms += lyric_end_ms(lyric) + gap_ms
+    return merge_many(lyrics, offsets, meta, on_collision)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+词句的图像渲染
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+from .fonts import load_font, measure_text, font_cache_info, clear_font_caches
+from .renderer import SubtitleRenderer
+from .frames import FrameSequence, FRAME_FORMATS
+from .layout import (
+    measure_run,
+    measure_row,
+    break_row,
+    wrap_rows,
+    fit_rows,
+    fit_block,
+    fit_lyric,
+)
+
+__all__ = [
+    "SubtitleRenderer",
+    "FrameSequence",
+    "FRAME_FORMATS",
+    "measure_run",
+    "measure_row",
+    "break_row",
+    "wrap_rows",
+    "fit_rows",
+    "fit_block",
+    "fit_lyric",
+    "load_font",
+    "measure_text",
+    "font_cache_info",
+    "clear_font_caches",
+]
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""
+字体载入与文字度量缓存
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
+
+from PIL import ImageFont
+
+FontType = Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]
+
+
+@lru_cache(maxsize=64)
+def load_font(font: Optional[str], size: int) -> FontType:
+    """
+    载入字体，以 (字体, 字号) 为键缓存
+
+    Parameters
+    ----------
+    font: str, optional
+        字体文件路径或系统字体名称，为 None 时使用 Pillow 自带的默认字体
+    size: int
+        字号（像素）
+
+    Returns
+    -------
+    FreeTypeFont | ImageFont
+        字体对象
+    """
+    if font is None:
+        try:
+            return ImageFont.load_default(size=size)
+        except TypeError:
+            # Pillow 10.1 之前的默认字体不可缩放
+            return ImageFont.load_default()
+    return ImageFont.truetype(font, size)
+
+
+@lru_cache(maxsize=8192)
+def measure_text(
+    font: Optional[str], size: int, text: str, stroke_width: int = 0
+) -> Tuple[float, Tuple[int, int, int, int]]:
+    """
+    度量文字，以 (字体, 字号, 文字, 描边宽度) 为键缓存
+
+    Parameters
+    ----------
+    font: str, optional
+        字体文件路径或系统字体名称
+    size: int
+        字号（像素）
+    text: str
+        文字
+    stroke_width: int
+        描边宽度
+
+    Returns
+    -------
+    Tuple[float, Tuple[int, int, int, int]]
+        前进宽度（不含描边）与以书写起点为原点的包围盒 (左, 上, 右, 下)
+    """
+    font_object = load_font(font, size)
+    return (
+        font_object.getlength(text),
+        font_object.getbbox(text, stroke_width=stroke_width),
+    )
+
+
+@lru_cache(maxsize=64)
+def font_metrics(font: Optional[str], size: int) -> Tuple[int, int]:
+    """
+    字体的上伸与下伸高度，以 (字体, 字号) 为键缓存
+
+    Returns
+    -------
+    Tuple[int, int]
+        (上伸, 下伸)
+    """
+    font_object = load_font(font, size)
+    if hasattr(font_object, "getmetrics"):
+        return font_object.getmetrics()
+    bbox = font_object.getbbox("Ag")
+    return bbox[3], 0
+
+
+def font_cache_info() -> Dict[str, Any]:
+    """字体与度量缓存的命中情况"""
+    return {
+        "fonts": load_font.cache_info()._asdict(),
+        "measure": measure_text.cache_info()._asdict(),
+        "metrics": font_metrics.cache_info()._asdict(),
+    }
+
+
+def clear_font_caches():
+    """清空字体与度量缓存"""
+    load_font.cache_clear()
+    measure_text.cache_clear()
+    font_metrics.cache_clear()
@@ -0,0 +1,518 @@
+# -*- coding: utf-8 -*-
+
+"""
+歌词视频的逐帧渲染
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import io
+import os
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+from PIL import Image
+
+from ..subclass import StyledString
+from ..exceptions import UnsupportedFormatError
+from ..karaoke import KaraokeTrack
+from .renderer import SubtitleRenderer
+
+if TYPE_CHECKING:
+    from ..main import Lyric
+
+FrameState = Tuple[Tuple[int, ...], Optional[Tuple[int, int]]]
+"""一帧的画面状态：可见词句的序号，以及正在演唱的字词序号与进度档位"""
+
+FRAME_FORMATS = {"png": ".png", "rgba": ".rgba"}
+"""逐帧输出支持的格式及其扩展名"""
+
+
+class FrameSequence:
+    """
+    歌词视频的帧序列
+
+    画面仅在词句出现、消失或卡拉OK进度推进一档时才会改变。
+    先由时间轴求出这些关键帧，只绘制关键帧，其余各帧直接沿用上一关键帧的画面。
+    """
+
+    def __init__(
+        self,
+        lyric: "Lyric",
+        renderer: Optional[SubtitleRenderer] = None,
+        fps: Union[int, Fraction] = 30,
+        start_ms: int = 0,
+        end_ms: Optional[int] = None,
+        karaoke: bool = True,
+        highlight_colour: Tuple[int, int, int, int] = (255, 215, 0, 255),
+        progress_steps: int = 16,
+        row: int = 0,
+        tail_ms: int = 3000,
+        background: Tuple[int, int, int, int] = (0, 0, 0, 0),
+    ):
+        """
+        由歌词建立帧序列
+
+        Parameters
+        ----------
+        lyric: Lyric
+            歌词对象
+        renderer: SubtitleRenderer, optional
+            词句渲染器，为 None 时使用默认设置新建一个
+        fps: int | Fraction
+            帧率，非整数帧率请以 Fraction 给出，如 Fraction(30000, 1001)
+        start_ms: int
+            第 0 帧所对应的时间（毫秒）
+        end_ms: int, optional
+            结束时间（毫秒），为 None 时至最后一句结束为止
+        karaoke: bool
+            是否按字词标签绘制卡拉OK的演唱进度
+        highlight_colour: Tuple[int, int, int, int]
+            已演唱部分的文字颜色
+        progress_steps: int
+            每个字词的演唱进度分为几档，档位越多越平滑，关键帧也越多
+        row: int
+            卡拉OK进度绘制于词句的第几行，对照歌词中一般 0 为原文
+        tail_ms: int
+            最后一句既无持续时间又无下一句时的持续毫秒数
+        background: Tuple[int, int, int, int]
+            画面背景颜色
+        """
+        self.lyric = lyric
+        self.renderer = renderer if renderer is not None else SubtitleRenderer()
+        self.fps = Fraction(fps)
+        self.start_ms = start_ms
+        self.karaoke = karaoke
+        self.highlight_colour = highlight_colour
+        self.progress_steps = max(progress_steps, 1)
+        self.row = row
+        self.tail_ms = tail_ms
+        self.background = background
+
+        lines = sorted(
+            ((time.in_milliseconds, block) for time, block in lyric.lyrics.items()),
+            key=lambda line: line[0],
+        )
+        lines_num = len(lines)
+        self._blocks = [block for _, block in lines]
+        self.line_starts = array("q", (line_ms for line_ms, _ in lines))
+        """各词句的开始时间（毫秒），与 KaraokeTrack 中的词句序号一致"""
+        self.line_ends = array("q")
+        """各词句的结束时间（毫秒）"""
+        for line_index in range(lines_num):
+            line_ms, block = lines[line_index]
+            if block.duration is not None:
+                self.line_ends.append(line_ms + block.duration.in_milliseconds)
+            elif line_index + 1 < lines_num:
+                self.line_ends.append(lines[line_index + 1][0])
+            else:
+                self.line_ends.append(line_ms + tail_ms)
+
+        # 空白的词句不绘制，仅作为上一句的结束
+        self._visible_lines = [
+            line_index
+            for line_index in range(lines_num)
+            if str(self._blocks[line_index]).strip()
+            and self.line_ends[line_index] > self.line_starts[line_index]
+        ]
+        self._max_span = max(
+            (self.line_ends[i] - self.line_starts[i] for i in self._visible_lines),
+            default=0,
+        )
+
+        self.track: Optional[KaraokeTrack] = (
+            KaraokeTrack.from_lyric(lyric, row=row, whole_lines=False, tail_ms=tail_ms)
+            if karaoke
+            else None
+        )
+        """卡拉OK字词时间轨"""
+        self._first_words: Dict[int, int] = {}
+        if self.track is not None:
+            for word_index in range(len(self.track) - 1, -1, -1):
+                self._first_words[self.track.line_indices[word_index]] = word_index
+
+        self.end_ms = (
+            end_ms
+            if end_ms is not None
+            else max((self.line_ends[i] for i in self._visible_lines), default=start_ms)
+        )
+        self.frame_count = max(
+            math.ceil((self.end_ms - self.start_ms) * self.fps / 1000), 0
+        )
+        """总帧数"""
+
+        self._events = self._collect_events()
+
+    def _collect_events(self) -> "array[int]":
+        """求出画面可能改变的各帧，升序排列"""
+        times: List[Fraction] = []
+        for line_index in self._visible_lines:
+            times.append(Fraction(self.line_starts[line_index]))
+            times.append(Fraction(self.line_ends[line_index]))
+        if self.track is not None:
+            steps = self.progress_steps
+            for word_index in range(len(self.track)):
+                word_start = self.track.starts[word_index]
+                word_span = self.track.ends[word_index] - word_start
+                times.append(Fraction(word_start))
+                if word_span > 0:
+                    times.extend(
+                        word_start + Fraction(word_span * step, steps)
+                        for step in range(1, steps + 1)
+                    )
+        return array(
+            "q",
+            sorted(
+                frame
+                for frame in {self.frame_at(time) for time in times}
+                if 0 < frame < self.frame_count
+            ),
+        )
+
+    def frame_time(self, frame: int) -> Fraction:
+        """第 frame 帧所对应的时间（毫秒）"""
+        return self.start_ms + frame * 1000 / self.fps
+
+    def frame_at(self, position_ms: Union[int, Fraction]) -> int:
+        """于 position_ms 时或其后的第一帧"""
+        return math.ceil((position_ms - self.start_ms) * self.fps / 1000)
+
+    def state_at(self, position_ms: Union[int, Fraction]) -> FrameState:
+        """
+        求出某一时刻的画面状态，状态相同的两帧画面亦相同
+
+        Parameters
+        ----------
+        position_ms: int | Fraction
+            播放位置（毫秒）
+
+        Returns
+        -------
+        FrameState
+            可见词句的序号，以及正在演唱的字词序号与进度档位
+        """
+        # 开始时间不晚于此刻的词句中，仅最近 _max_span 毫秒内开始的可能仍可见
+        last = bisect_right(self.line_starts, position_ms)
+        first = bisect_left(self.line_starts, position_ms - self._max_span)
+        visible = tuple(
+            line_index
+            for line_index in range(first, last)
+            if position_ms < self.line_ends[line_index]
+            and str(self._blocks[line_index]).strip()
+        )
+
+        singing = None
+        if self.track is not None and visible:
+            word_index = bisect_right(self.track.starts, position_ms) - 1
+            if word_index >= 0 and self.track.line_indices[word_index] in visible:
+                word_start = self.track.starts[word_index]
+                word_span = self.track.ends[word_index] - word_start
+                steps = self.progress_steps
+                step = (
+                    min(
+                        math.floor((position_ms - word_start) * steps / word_span),
+                        steps,
+                    )
+                    if word_span > 0
+                    else steps
+                )
+                singing = (word_index, step)
+        return visible, singing
+
+    def keyframes(
+        self, first: int = 0, last: Optional[int] = None
+    ) -> List[Tuple[int, FrameState]]:
+        """
+        求出一段帧范围内的关键帧
+
+        Parameters
+        ----------
+        first: int
+            起始帧（含），总是作为关键帧
+        last: int, optional
+            结束帧（不含），默认为总帧数
+
+        Returns
+        -------
+        List[Tuple[int, FrameState]]
+            各关键帧的序号与画面状态，两个关键帧之间的各帧与前一关键帧相同
+        """
+        last = self.frame_count if last is None else min(last, self.frame_count)
+        if first >= last:
+            return []
+        candidates = [first]
+        candidates.extend(
+            self._events[
+                bisect_right(self._events, first) : bisect_left(self._events, last)
+            ]
+        )
+
+        result = []
+        previous = None
+        for frame in candidates:
+            state = self.state_at(self.frame_time(frame))
+            if state != previous:
+                result.append((frame, state))
+                previous = state
+        return result
+
+    def render_state(self, state: FrameState) -> Image.Image:
+        """
+        绘制某一画面状态
+
+        Parameters
+        ----------
+        state: FrameState
+            画面状态
+
+        Returns
+        -------
+        Image.Image
+            RGBA 画面
+        """
+        renderer = self.renderer
+        canvas = Image.new("RGBA", renderer.size, self.background)
+        visible, singing = state
+
+        for line_index in visible:
+            block = self._blocks[line_index]
+            image = renderer.render_rows(block.context)
+
+            if (
+                singing is not None
+                and self.track.line_indices[singing[0]] == line_index
+                and self.row < len(block.context)
+            ):
+                word_index, step = singing
+                chars = (
+                    self.track.text_offsets[word_index]
+                    - self.track.text_offsets[self._first_words[line_index]]
+                    + len(self.track.word_text(word_index)) * step / self.progress_steps
+                )
+                highlighted = [
+                    [
+                        (
+                            run if isinstance(run, StyledString) else StyledString(run)
+                        ).coloured(self.highlight_colour)
+                        for run in row
+                    ]
+                    for row in block.context
+                ]
+                cut, top, bottom = renderer.pen_position(block.context, self.row, chars)
+                cut = round(cut)
+                if cut > 0:
+                    image.paste(
+                        renderer.render_rows(highlighted).crop((0, top, cut, bottom)),
+                        (0, top),
+                    )
+
+            canvas.alpha_composite(
+                image,
+                renderer.place(
+                    image.size,
+                    block.location or renderer.default_location,
+                    canvas.size,
+                ),
+            )
+        return canvas
+
+    def iter_frames(
+        self, first: int = 0, last: Optional[int] = None
+    ) -> Iterator[Tuple[int, Image.Image, bool]]:
+        """
+        逐帧生成画面，仅在关键帧处绘制
+
+        相邻的非关键帧所得为同一个图像对象，请勿就地修改
+
+        Parameters
+        ----------
+        first: int
+            起始帧（含）
+        last: int, optional
+            结束帧（不含），默认为总帧数
+
+        Yields
+        ------
+        Tuple[int, Image.Image, bool]
+            帧序号、画面、是否为关键帧
+        """
+        last = self.frame_count if last is None else min(last, self.frame_count)
+        keyframes = self.keyframes(first, last)
+        for i in range(len(keyframes)):
+            frame, state = keyframes[i]
+            next_frame = keyframes[i + 1][0] if i + 1 < len(keyframes) else last
+            image = self.render_state(state)
+            yield frame, image, True
+            for reused in range(frame + 1, next_frame):
+                yield reused, image, False
+
+    def __iter__(self) -> Iterator[Image.Image]:
+        for _, image, _ in self.iter_frames():
+            yield image
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    def write_raw(
+        self, stream: BinaryIO, first: int = 0, last: Optional[int] = None
+    ) -> int:
+        """
+        将各帧的原始 RGBA 数据依次写入流中，可直接送入 ffmpeg 等编码器
+
+        Parameters
+        ----------
+        stream: BinaryIO
+            二进制输出流
+        first: int
+            起始帧（含）
+        last: int, optional
+            结束帧（不含），默认为总帧数
+
+        Returns
+        -------
+        int
+            写入的帧数
+        """
+        written = 0
+        data = b""
+        for _, image, is_keyframe in self.iter_frames(first, last):
+            if is_keyframe:
+                data = image.tobytes()
+            stream.write(data)
+            written += 1
+        return written
+
+    def export(
+        self,
+        output_dir: str,
+        fmt: str = "png",
+        first: int = 0,
+        last: Optional[int] = None,
+        name_format: str = "{:06d}",
+        max_workers: Optional[int] = None,
+        shards: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        将各帧逐一输出为编号的文件，可分段交由进程池并行处理
+
+        Parameters
+        ----------
+        output_dir: str
+            输出目录
+        fmt: str
+            输出格式，"png" 或 "rgba"（原始像素数据）
+        first: int
+            起始帧（含）
+        last: int, optional
+            结束帧（不含），默认为总帧数
+        name_format: str
+            文件名（不含扩展名）的格式，以帧序号填入
+        max_workers: int, optional
+            进程数，为 1 时不启用进程池
+        shards: int, optional
+            分段数，默认为进程数的四倍
+
+        Returns
+        -------
+        Dict[str, int]
+            frames 输出的帧数、keyframes 实际绘制的帧数
+        """
+        if fmt not in FRAME_FORMATS:
+            raise UnsupportedFormatError(fmt)
+        last = self.frame_count if last is None else min(last, self.frame_count)
+        os.makedirs(output_dir, exist_ok=True)
+
+        if max_workers == 1:
+            return _export_frames(self, first, last, output_dir, fmt, name_format)
+
+        workers = max_workers or os.cpu_count() or 1
+        shards = max(min(shards or workers * 4, last - first), 1)
+        bounds = [first + (last - first) * i // shards for i in range(shards + 1)]
+
+        result = {"frames": 0, "keyframes": 0}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for counts in executor.map(
+                _export_frames,
+                [self] * shards,
+                bounds[:-1],
+                bounds[1:],
+                [output_dir] * shards,
+                [fmt] * shards,
+                [name_format] * shards,
+            ):
+                result["frames"] += counts["frames"]
+                result["keyframes"] += counts["keyframes"]
+        return result
+
+    # 打包支持 Pickle，以便分段交由子进程绘制
+
+    def _getstate(self):
+        return (
+            self.lyric,
+            self.renderer,
+            self.fps,
+            self.start_ms,
+            self.end_ms,
+            self.karaoke,
+            self.highlight_colour,
+            self.progress_steps,
+            self.row,
+            self.tail_ms,
+            self.background,
+        )
+
+    def __reduce__(self):
+        return (self.__class__, self._getstate())
+
+
+def _export_frames(
+    sequence: FrameSequence,
+    first: int,
+    last: int,
+    output_dir: str,
+    fmt: str,
+    name_format: str,
+) -> Dict[str, int]:
+    """输出一段帧，关键帧编码一次，其后沿用的各帧直接写入相同的数据"""
+    extension = FRAME_FORMATS[fmt]
+    frames = 0
+    keyframes = 0
+    data = b""
+    for frame, image, is_keyframe in sequence.iter_frames(first, last):
+        if is_keyframe:
+            keyframes += 1
+            if fmt == "png":
+                buffer = io.BytesIO()
+                image.save(buffer, format="PNG")
+                data = buffer.getvalue()
+            else:
+                data = image.tobytes()
+        with open(
+            os.path.join(output_dir, name_format.format(frame) + extension), "wb"
+        ) as f:
+            f.write(data)
+        frames += 1
+    return {"frames": frames, "keyframes": keyframes}
@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+
+"""
+文字排版：度量、自动换行与缩放以适应区域
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import re
+import copy
+from typing import List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+from ..constants import CJK_CHARACTER_RANGE, CJK_PUNCTUATION_RANGE
+from ..subclass import StyledString, SubtitleBlock
+from .fonts import measure_text, font_metrics
+
+if TYPE_CHECKING:
+    from ..main import Lyric
+
+Run = Union[str, StyledString]
+Row = Sequence[Run]
+
+_OPENING = "\"'(\\[{‘“〈《「『【〔〖〘〚（［｛"
+"""不可置于行末的开括号与开引号"""
+
+BREAK_PATTERN = re.compile(
+    r"[{o}]*(?:[{c}]|[^\s{c}{p}]+)(?:(?![{o}])[{p}])*\s*|\s+|.".format(
+        c=CJK_CHARACTER_RANGE, p=CJK_PUNCTUATION_RANGE, o=_OPENING
+    )
+)
+"""
+切分可断行的单元：中日韩文字逐字，其余以空白分词；
+开括号依附于其后的字，其余标点依附于其前的字，以免标点出现在行首或括号留在行末
+"""
+
+
+def _font_of(
+    run: Run, font: Optional[str], font_size: int
+) -> Tuple[Optional[str], int]:
+    """一段文字实际使用的字体与字号"""
+    if isinstance(run, StyledString):
+        return run.font or font, run.size or font_size
+    return font, font_size
+
+
+def measure_run(run: Run, font: Optional[str] = None, font_size: int = 48) -> float:
+    """
+    度量一段文字的前进宽度，结果经缓存
+
+    Parameters
+    ----------
+    run: str | StyledString
+        一段文字
+    font: str, optional
+        文字未指定字体时所用的字体
+    font_size: int
+        文字未指定字号时所用的字号
+
+    Returns
+    -------
+    float
+        前进宽度（像素），与 SubtitleRenderer 排列各段时所用的相同
+    """
+    run_font, run_size = _font_of(run, font, font_size)
+    bold = 1 if isinstance(run, StyledString) and run.is_bold else 0
+    return measure_text(run_font, run_size, str(run))[0] + bold
+
+
+def measure_row(
+    row: Row, font: Optional[str] = None, font_size: int = 48
+) -> Tuple[float, int]:
+    """
+    度量一行文字
+
+    Parameters
+    ----------
+    row: Sequence[str | StyledString]
+        一行文字，由若干段组成
+    font: str, optional
+        文字未指定字体时所用的字体
+    font_size: int
+        文字未指定字号时所用的字号
+
+    Returns
+    -------
+    Tuple[float, int]
+        行宽（含描边）与行高（像素）
+    """
+    width = 0.0
+    height = 0
+    stroke = 0
+    for run in row:
+        outline = run.outline_size if isinstance(run, StyledString) else 0
+        ascent, descent = font_metrics(*_font_of(run, font, font_size))
+        width += measure_run(run, font, font_size)
+        height = max(height, ascent + descent + 2 * outline)
+        stroke = max(stroke, outline)
+    return width + 2 * stroke, height
+
+
+def _slice_row(row: Row, start: int, end: int) -> List[StyledString]:
+    """取出一行中 [start, end) 范围内的文字，保留各段的样式"""
+    result = []
+    offset = 0
+    for run in row:
+        run_end = offset + len(run)
+        if run_end > start and offset < end:
+            run = run if isinstance(run, StyledString) else StyledString(run)
+            result.append(run[max(start - offset, 0) : min(end, run_end) - offset])
+        offset = run_end
+    return result
+
+
+def _span_width(
+    runs: List[Tuple[int, int, Optional[str], int, int]],
+    text: str,
+    start: int,
+    end: int,
+) -> float:
+    """度量一行中 [start, end) 范围内文字的宽度
+
+    runs 为各段的 (开始, 结束, 字体, 字号, 加粗)
+    """
+    width = 0.0
+    for run_start, run_end, run_font, run_size, bold in runs:
+        if run_end > start and run_start < end:
+            width += (
+                measure_text(
+                    run_font, run_size, text[max(start, run_start) : min(end, run_end)]
+                )[0]
+                + bold
+            )
+    return width
+
+
+def break_row(
+    row: Row,
+    max_width: float,
+    font: Optional[str] = None,
+    font_size: int = 48,
+) -> List[List[StyledString]]:
+    """
+    将一行文字按宽度断为多行
+
+    中日韩文字可于任意两字之间断行，其余文字于空白处断行，
+    单个单词比行宽还宽时逐字断开；行首与行末的空白将被去除
+
+    Parameters
+    ----------
+    row: Sequence[str | StyledString]
+        一行文字，由若干段组成
+    max_width: float
+        行宽上限（像素）
+    font: str, optional
+        文字未指定字体时所用的字体
+    font_size: int
+        文字未指定字号时所用的字号
+
+    Returns
+    -------
+    List[List[StyledString]]
+        断开后的各行，每行由若干段组成
+    """
+    text = "".join(row)
+    if measure_row(row, font, font_size)[0] <= max_width:
+        return [_slice_row(row, 0, len(text))]
+
+    runs = []
+    offset = 0
+    for run in row:
+        runs.append(
+            (
+                offset,
+                offset + len(run),
+                *_font_of(run, font, font_size),
+                1 if isinstance(run, StyledString) and run.is_bold else 0,
+            )
+        )
+        offset += len(run)
+
+    # 以 (开始, 结束) 记录各可断行的单元
+    units: List[Tuple[int, int]] = []
+    for match in BREAK_PATTERN.finditer(text):
+        start, end = match.span()
+        visible_end = start + len(text[start:end].rstrip())
+        if _span_width(runs, text, start, visible_end) > max_width:
+            units.extend((i, i + 1) for i in range(start, end))
+        else:
+            units.append((start, end))
+
+    lines: List[Tuple[int, int]] = []
+    line_start = None
+    line_width = 0.0
+    for start, end in units:
+        unit_width = _span_width(runs, text, start, end)
+        if line_start is None:
+            if not text[start:end].strip():
+                continue
+            line_start = start
+            line_width = unit_width
+            continue
+        visible_end = start + len(text[start:end].rstrip())
+        if line_width + _span_width(runs, text, start, visible_end) > max_width:
+            lines.append((line_start, start))
+            if text[start:end].strip():
+                line_start = start
+                line_width = unit_width
+            else:
+                line_start = None
+                line_width = 0.0
+        else:
+            line_width += unit_width
+    if line_start is not None:
+        lines.append((line_start, len(text)))
+
+    result = []
+    for start, end in lines:
+        end = start + len(text[start:end].rstrip())
+        result.append(_slice_row(row, start, end))
+    return result
+
+
+def wrap_rows(
+    rows: Sequence[Row],
+    max_width: float,
+    font: Optional[str] = None,
+    font_size: int = 48,
+) -> List[List[StyledString]]:
+    """
+    将多行文字各自按宽度断行
+
+    Parameters
+    ----------
+    rows: Sequence[Sequence[str | StyledString]]
+        各行文字
+    max_width: float
+        行宽上限（像素）
+    font: str, optional
+        文字未指定字体时所用的字体
+    font_size: int
+        文字未指定字号时所用的字号
+
+    Returns
+    -------
+    List[List[StyledString]]
+        断开后的各行
+    """
+    return [line for row in rows for line in break_row(row, max_width, font, font_size)]
+
+
+def _scaled(rows: Sequence[Row], scale: float, font_size: int) -> List[List[Run]]:
+    """将各段文字的字号按比例缩放，未指定字号的以 font_size 计"""
+    result = []
+    for row in rows:
+        scaled_row = []
+        for run in row:
+            run = run if isinstance(run, StyledString) else StyledString(run)
+            scaled_row.append(
+                run.resize(max(round((run.size or font_size) * scale), 1))
+            )
+        result.append(scaled_row)
+    return result
+
+
+def fit_rows(
+    rows: Sequence[Row],
+    box: Tuple[int, int],
+    font: Optional[str] = None,
+    font_size: int = 48,
+    min_font_size: int = 12,
+    line_spacing: int = 8,
+    wrap: bool = True,
+) -> List[List[StyledString]]:
+    """
+    断行并按需缩小字号，使多行文字容纳于给定区域之内
+
+    先以原字号断行，放不下时以二分查找求出能放下的最大字号；
+    即便缩至 min_font_size 仍放不下，也以 min_font_size 排版
+
+    Parameters
+    ----------
+    rows: Sequence[Sequence[str | StyledString]]
+        各行文字
+    box: Tuple[int, int]
+        区域大小（宽, 高）
+    font: str, optional
+        文字未指定字体时所用的字体
+    font_size: int
+        文字未指定字号时所用的字号
+    min_font_size: int
+        缩放后 font_size 的下限
+    line_spacing: int
+        行间距（像素），应与渲染器的设置相同
+    wrap: bool
+        是否断行，为 False 时仅缩放
+
+    Returns
+    -------
+    List[List[StyledString]]
+        排版后的各行，缩放后各段均显式指定了字号
+    """
+    box_width, box_height = box
+
+    def layout(size: int) -> Tuple[bool, List[List[StyledString]]]:
+        scaled = _scaled(rows, size / font_size, font_size)
+        lines = (
+            wrap_rows(scaled, box_width, font, size)
+            if wrap
+            else [[*row] for row in scaled]
+        )
+        metrics = [measure_row(line, font, size) for line in lines]
+        fits = (
+            all(width <= box_width for width, _ in metrics)
+            and sum(height for _, height in metrics)
+            + line_spacing * max(len(lines) - 1, 0)
+            <= box_height
+        )
+        return fits, lines
+
+    fits, lines = layout(font_size)
+    if fits or font_size <= min_font_size:
+        return lines
+
+    low, high = min_font_size, font_size - 1
+    best = layout(min_font_size)[1]
+    while low <= high:
+        middle = (low + high) // 2
+        fits, middle_lines = layout(middle)
+        if fits:
+            best = middle_lines
+            low = middle + 1
+        else:
+            high = middle - 1
+    return best
+
+
+def fit_block(
+    block: SubtitleBlock,
+    box: Tuple[int, int],
+    font: Optional[str] = None,
+    font_size: int = 48,
+    min_font_size: int = 12,
+    line_spacing: int = 8,
+    wrap: bool = True,
+) -> SubtitleBlock:
+    """
+    排版一条词句，使其容纳于给定区域之内，断开的部分作为 context 中新增的行
+
+    仅改变显示所用的 context，字词标签不受影响
+
+    Parameters
+    ----------
+    block: SubtitleBlock
+        词句，不会被修改
+    其余参数同 fit_rows
+
+    Returns
+    -------
+    SubtitleBlock
+        排版后的词句副本
+    """
+    result = copy.copy(block)
+    result.context = fit_rows(
+        block.context, box, font, font_size, min_font_size, line_spacing, wrap
+    )
+    return result
+
+
+def fit_lyric(
+    lyric: "Lyric",
+    box: Tuple[int, int],
+    font: Optional[str] = None,
+    font_size: int = 48,
+    min_font_size: int = 12,
+    line_spacing: int = 8,
+    wrap: bool = True,
+) -> "Lyric":
+    """
+    排版歌词中的每一句，使其容纳于给定区域之内，结果写入各词句的 context
+
+    断开的行将随 context 一并写出，宜在渲染前对歌词的副本调用
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象，将被原地修改
+    其余参数同 fit_rows
+
+    Returns
+    -------
+    Lyric
+        传入的歌词对象
+    """
+    done = set()
+    for block in lyric.lyrics.values():
+        # 多个时间标签共用的词句只排版一次
+        if id(block) in done:
+            continue
+        done.add(id(block))
+        block.context = fit_rows(
+            block.context, box, font, font_size, min_font_size, line_spacing, wrap
+        )
+    return lyric
@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+
+"""
+词句渲染器
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from PIL import Image, ImageDraw
+
+from ..subclass import StyledString, SubtitleBlock, LineLocation, LocationAnchor
+from .fonts import load_font, measure_text, font_metrics
+
+DEFAULT_LINE_LOCATION = LineLocation(LocationAnchor.BOTTOM_CENTER, (0, -5))
+"""词句未指定位置时的默认位置：底部居中，上移 5% 屏幕高度"""
+
+_ITALIC_SHEAR = 0.2
+"""模拟斜体时的错切系数"""
+
+
+class SubtitleRenderer:
+    """
+    词句渲染器
+
+    将 SubtitleBlock 按其各行各段的样式绘制到 RGBA 画布上。
+    每段文字（以内容、样式、字体与字号为键）仅栅格化一次，
+    之后再遇到相同的段落时直接贴图，字体与文字度量亦分别缓存。
+    """
+
+    def __init__(
+        self,
+        size: Tuple[int, int] = (1920, 1080),
+        font: Optional[str] = None,
+        font_size: int = 48,
+        line_spacing: int = 8,
+        default_location: LineLocation = DEFAULT_LINE_LOCATION,
+        cache_size: int = 1024,
+    ):
+        """
+        创建一个词句渲染器
+
+        Parameters
+        ----------
+        size: Tuple[int, int]
+            画布大小（宽, 高）
+        font: str, optional
+            文字未指定字体时所用的字体，为 None 时使用 Pillow 自带的默认字体
+        font_size: int
+            文字未指定字号时所用的字号（像素）
+        line_spacing: int
+            同一词句中各行之间的间距（像素）
+        default_location: LineLocation
+            词句未指定位置时的显示位置
+        cache_size: int
+            段落位图缓存的最大条目数
+        """
+        self.size = size
+        self.font = font
+        self.font_size = font_size
+        self.line_spacing = line_spacing
+        self.default_location = default_location
+        self.cache_size = cache_size
+
+        self._runs: "OrderedDict[Tuple[Any, ...], Tuple[Image.Image, int, int]]" = (
+            OrderedDict()
+        )
+        """段落位图缓存：键对应 (位图, 书写起点横坐标, 基线纵坐标)"""
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        """段落位图缓存命中次数"""
+        self.misses = 0
+        """段落位图缓存未命中次数"""
+
+    def _resolve(self, run: StyledString) -> Tuple[Optional[str], int]:
+        """取得段落实际使用的字体与字号"""
+        return (
+            run.font if run.font else self.font,
+            run.size if run.size else self.font_size,
+        )
+
+    def render_run(self, run: Union[str, StyledString]) -> Tuple[Image.Image, int, int]:
+        """
+        栅格化一段文字，结果经缓存
+
+        Parameters
+        ----------
+        run: str | StyledString
+            一段文字
+
+        Returns
+        -------
+        Tuple[Image.Image, int, int]
+            RGBA 位图、书写起点于位图中的横坐标、基线于位图中的纵坐标；
+            位图的宽度不含描边与斜体伸出的部分时，以前进宽度排列下一段
+        """
+        if not isinstance(run, StyledString):
+            run = StyledString(run)
+        font, size = self._resolve(run)
+        key = (run, font, size)
+
+        with self._lock:
+            cached = self._runs.get(key)
+            if cached is not None:
+                self._runs.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        result = self._rasterize(run, font, size)
+
+        with self._lock:
+            self._runs[key] = result
+            if len(self._runs) > self.cache_size:
+                self._runs.popitem(last=False)
+        return result
+
+    def _rasterize(
+        self, run: StyledString, font: Optional[str], size: int
+    ) -> Tuple[Image.Image, int, int]:
+        """实际绘制一段文字"""
+        text = str(run)
+        stroke = run.outline_size
+        bold = 1 if run.is_bold else 0
+        ascent, descent = font_metrics(font, size)
+        advance, bbox = measure_text(font, size, text, stroke)
+
+        # 位图以行高为准，使同一行中各段的基线对齐
+        left = min(bbox[0], 0) - stroke
+        right = max(bbox[2], math.ceil(advance)) + stroke + bold
+        width = max(right - left, 1)
+        height = ascent + descent + 2 * stroke
+        origin_x = -left
+        baseline = ascent + stroke
+
+        if run.is_italic:
+            # 斜体时向右倾斜，顶端最多伸出 ascent * _ITALIC_SHEAR
+            width += math.ceil(ascent * _ITALIC_SHEAR)
+
+        image = Image.new("RGBA", (width, height), run.background_cover_colour)
+        draw = ImageDraw.Draw(image)
+        font_object = load_font(font, size)
+
+        for dx in range(bold + 1):
+            draw.text(
+                (origin_x + dx, baseline),
+                text,
+                font=font_object,
+                fill=run.text_colour,
+                anchor="ls",
+                stroke_width=stroke,
+                stroke_fill=run.outline_colour if stroke else None,
+            )
+
+        line_width = max(size // 16, 1)
+        line_end = origin_x + math.ceil(advance) + bold
+        if run.is_underline:
+            y = baseline + max(descent // 2, line_width)
+            draw.line(
+                [(origin_x, y), (line_end, y)], fill=run.text_colour, width=line_width
+            )
+        if run.is_strikethrough:
+            y = baseline - ascent // 3
+            draw.line(
+                [(origin_x, y), (line_end, y)], fill=run.text_colour, width=line_width
+            )
+
+        if run.is_italic:
+            # 以基线为不动轴做错切变换
+            image = image.transform(
+                image.size,
+                Image.Transform.AFFINE,
+                (1, _ITALIC_SHEAR, -_ITALIC_SHEAR * baseline, 0, 1, 0),
+                resample=Image.Resampling.BICUBIC,
+                fillcolor=run.background_cover_colour,
+            )
+
+        return image, origin_x, baseline
+
+    def _run_advance(self, run: Union[str, StyledString]) -> float:
+        """一段文字的前进宽度"""
+        if not isinstance(run, StyledString):
+            run = StyledString(run)
+        font, size = self._resolve(run)
+        return measure_text(font, size, str(run))[0] + (1 if run.is_bold else 0)
+
+    def _arrange_row(
+        self, row: Sequence[Union[str, StyledString]]
+    ) -> Tuple[List[Tuple[Image.Image, int, int]], int, int, int, int]:
+        """
+        排列一行中的各段文字
+
+        Returns
+        -------
+        Tuple[List[Tuple[Image.Image, int, int]], int, int, int, int]
+            各段的 (位图, 横坐标, 纵坐标)、行宽、基线以上高度、基线以下高度、
+            书写起点于行中的横坐标
+        """
+        placed = []
+        pen = 0.0
+        row_left = 0
+        row_right = 0
+        above = 0
+        below = 0
+        for run in row:
+            if not run:
+                continue
+            bitmap, origin_x, baseline = self.render_run(run)
+            x = round(pen) - origin_x
+            placed.append((bitmap, x, baseline))
+            row_left = min(row_left, x)
+            row_right = max(row_right, x + bitmap.width)
+            above = max(above, baseline)
+            below = max(below, bitmap.height - baseline)
+            pen += self._run_advance(run)
+        return (
+            [
+                (bitmap, x - row_left, above - baseline)
+                for bitmap, x, baseline in placed
+            ],
+            row_right - row_left,
+            above,
+            below,
+            -row_left,
+        )
+
+    def render_rows(
+        self, rows: Sequence[Sequence[Union[str, StyledString]]]
+    ) -> Image.Image:
+        """
+        绘制多行文字，各行居中对齐
+
+        Parameters
+        ----------
+        rows: Sequence[Sequence[str | StyledString]]
+            各行文字，每行由若干段组成
+
+        Returns
+        -------
+        Image.Image
+            恰好容纳所有文字的 RGBA 位图
+        """
+        layouts = [self._arrange_row(row) for row in rows]
+
+        width = max((layout[1] for layout in layouts), default=0)
+        height = sum(
+            layout[2] + layout[3] for layout in layouts
+        ) + self.line_spacing * max(len(layouts) - 1, 0)
+        image = Image.new("RGBA", (max(width, 1), max(height, 1)), (0, 0, 0, 0))
+
+        y = 0
+        for placed, row_width, above, below, _ in layouts:
+            row_x = (width - row_width) // 2
+            for bitmap, x, top in placed:
+                image.alpha_composite(bitmap, (row_x + x, y + top))
+            y += above + below + self.line_spacing
+        return image
+
+    def pen_position(
+        self,
+        rows: Sequence[Sequence[Union[str, StyledString]]],
+        row_index: int,
+        chars: float,
+    ) -> Tuple[float, int, int]:
+        """
+        计算 render_rows 所得位图中，某行写完前若干个字时书写位置的横坐标
+
+        Parameters
+        ----------
+        rows: Sequence[Sequence[str | StyledString]]
+            各行文字，须与绘制时相同
+        row_index: int
+            第几行
+        chars: float
+            已写完的字数，可带小数以表示写到某字的一部分
+
+        Returns
+        -------
+        Tuple[float, int, int]
+            书写位置的横坐标、该行于位图中的上沿与下沿纵坐标
+        """
+        layouts = [self._arrange_row(row) for row in rows]
+        width = max((layout[1] for layout in layouts), default=0)
+        top = sum(
+            layout[2] + layout[3] + self.line_spacing for layout in layouts[:row_index]
+        )
+        _, row_width, above, below, pen_origin = layouts[row_index]
+
+        pen = (width - row_width) // 2 + pen_origin
+        whole = int(chars)
+        part = chars - whole
+        for run in rows[row_index]:
+            if not run:
+                continue
+            if whole >= len(run):
+                pen += self._run_advance(run)
+                whole -= len(run)
+                continue
+            run = run if isinstance(run, StyledString) else StyledString(run)
+            before = self._run_advance(run[:whole]) if whole else 0.0
+            pen += before
+            if part:
+                pen += (self._run_advance(run[: whole + 1]) - before) * part
+            break
+        return pen, top, top + above + below
+
+    def render_block(
+        self,
+        block: SubtitleBlock,
+        canvas: Optional[Image.Image] = None,
+        location: Optional[LineLocation] = None,
+    ) -> Image.Image:
+        """
+        将一个词句绘制到画布上
+
+        Parameters
+        ----------
+        block: SubtitleBlock
+            词句
+        canvas: Image.Image, optional
+            RGBA 画布，为 None 时新建一张透明画布
+        location: LineLocation, optional
+            显示位置，为 None 时依次取用词句自身的位置与渲染器的默认位置
+
+        Returns
+        -------
+        Image.Image
+            绘制后的画布，若传入了画布则为同一对象
+        """
+        if canvas is None:
+            canvas = Image.new("RGBA", self.size, (0, 0, 0, 0))
+        location = location or block.location or self.default_location
+
+        image = self.render_rows(block.context)
+        canvas.alpha_composite(image, self.place(image.size, location, canvas.size))
+        return canvas
+
+    def place(
+        self,
+        content_size: Tuple[int, int],
+        location: LineLocation,
+        canvas_size: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[int, int]:
+        """
+        计算内容于画布上的左上角坐标
+
+        Parameters
+        ----------
+        content_size: Tuple[int, int]
+            内容大小（宽, 高）
+        location: LineLocation
+            显示位置，定位点同时作为画布与内容的对齐点
+        canvas_size: Tuple[int, int], optional
+            画布大小，默认为渲染器的画布大小
+
+        Returns
+        -------
+        Tuple[int, int]
+            内容左上角的坐标，已限制于画布之内
+        """
+        canvas_width, canvas_height = canvas_size or self.size
+        width, height = content_size
+        anchor_x, anchor_y = location.archer.value
+        offset_x, offset_y = location.offset
+
+        x = (anchor_x + 1) / 2 * (canvas_width - width) + offset_x / 100 * canvas_width
+        y = (anchor_y + 1) / 2 * (
+            canvas_height - height
+        ) + offset_y / 100 * canvas_height
+        return (
+            max(min(round(x), canvas_width - width), 0),
+            max(min(round(y), canvas_height - height), 0),
+        )
+
+    # 打包支持 Pickle，缓存不随之打包
+
+    def _getstate(self):
+        return (
+            self.size,
+            self.font,
+            self.font_size,
+            self.line_spacing,
+            self.default_location,
+            self.cache_size,
+        )
+
+    def __reduce__(self):
+        return (self.__class__, self._getstate())
+
+    def cache_info(self) -> Dict[str, Any]:
+        """
+        返回段落位图缓存的命中情况
+
+        Returns
+        -------
+        Dict[str, Any]
+            hits 命中次数、misses 未命中次数、size 当前条目数、maxsize 最大条目数
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._runs),
+                "maxsize": self.cache_size,
+            }
+
+    def clear_cache(self):
+        """清空段落位图缓存"""
+        with self._lock:
+            self._runs.clear()
+            self.hits = 0
+            self.misses = 0
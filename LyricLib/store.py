@@ -0,0 +1,659 @@
+# -*- coding: utf-8 -*-
+
+"""
+以 SQLite 保存大量歌词，按需还原歌词对象，并支持按时间、元信息与全文查询
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import json
+import sqlite3
+from dataclasses import dataclass
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+from .exceptions import OuterlyError
+from .instrument import logger
+from .main import Lyric
+from .subclass import META_FIELDS, MetaInfo, SubtitleBlock, TimeStamp
+
+if TYPE_CHECKING:
+    from .textpool import TextPool
+
+SCHEMA_VERSION = 1
+"""数据库结构的版本，记于 PRAGMA user_version"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS songs (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    artist TEXT NOT NULL DEFAULT '',
+    line_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS songs_title ON songs (title);
+CREATE INDEX IF NOT EXISTS songs_artist ON songs (artist);
+
+CREATE TABLE IF NOT EXISTS meta (
+    song_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (song_id, kind, name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    song_id INTEGER NOT NULL,
+    line_index INTEGER NOT NULL,
+    start_ms INTEGER NOT NULL,
+    duration_ms INTEGER,
+    text TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lines_time ON lines (song_id, start_ms);
+
+CREATE TABLE IF NOT EXISTS words (
+    song_id INTEGER NOT NULL,
+    line_index INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    word_index INTEGER NOT NULL,
+    start_ms INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS words_time ON words (song_id, start_ms);
+"""
+"""
+各表的结构
+- songs 歌曲，title 与 artist 取自元信息的 Title 与 Singer，供索引查询
+- meta 元信息，kind 为 meta（MetaInfo 的各项）、other（MetaInfo.Other）、extra（未知标签）
+  或 contexts（Lyric.whole_contexts，依原文顺序，无法由按时间排列的词句还原）
+- lines 词句，text 为各行以换行相接的文本，body 为 LyricLib.formats.json 结构的词句，
+  供无损还原
+- words 字词标签，各列同 LyricLib.columnar.WORD_COLUMNS
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5 (
+    text, content='lines', content_rowid='id', tokenize='{}'
+);
+"""
+"""词句文本的全文索引，内容取自 lines 表"""
+
+FTS_TOKENIZERS = ("trigram", "unicode61")
+"""
+全文索引依次尝试的分词器
+- trigram 以三字为单位索引，可检索中日韩文字的任意片段，需要 SQLite 3.34 及以上
+- unicode61 以空白与标点分词，中日韩文字连续的一段视为一个词
+"""
+
+DEFAULT_BATCH_SONGS = 200
+"""批量写入时每个事务所含的歌曲数"""
+
+TimeLike = Union[TimeStamp, int]
+"""时间：时间戳或毫秒数"""
+
+
+def _as_ms(value: TimeLike) -> int:
+    return value.in_milliseconds if isinstance(value, TimeStamp) else int(value)
+
+
+@dataclass
+class LineHit:
+    """全文检索命中的词句"""
+
+    song: str
+    """歌曲标识"""
+    line_index: int
+    """词句在歌曲中按时间顺序的序号"""
+    start: TimeStamp
+    """词句的开始时间"""
+    text: str
+    """词句的文本"""
+
+
+class LyricStore(Mapping):
+    """
+    以 SQLite 保存的歌词库
+
+    作为映射使用时以歌曲标识对应歌词对象，取值时才由数据库还原，
+    遍历与按时间、元信息查询均不必将整个歌词库读入内存
+
+    同一对象不宜在多个线程间共用，多线程时请各自打开
+    """
+
+    path: str
+    """数据库文件地址"""
+    fts: bool
+    """是否建有全文索引"""
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        fts: Optional[bool] = None,
+        text_pool: Optional["TextPool"] = None,
+    ):
+        """
+        打开或新建歌词库
+
+        Parameters
+        ----------
+        path: str
+            数据库文件地址，缺省时建于内存中
+        fts: bool, optional
+            是否建立全文索引；为 None 时若 SQLite 支持 FTS5 则建立，
+            为 True 时不支持则抛出 OuterlyError
+        text_pool: TextPool, optional
+            还原歌词时所用的文本驻留池
+        """
+        self.path = path
+        self.text_pool = text_pool
+        self._connection = sqlite3.connect(path, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise OuterlyError(
+                "歌词库的结构版本为 {}，仅支持 {}".format(version, SCHEMA_VERSION)
+            )
+        self._connection.executescript(_SCHEMA)
+        self._connection.execute("PRAGMA user_version = {}".format(SCHEMA_VERSION))
+
+        has_fts = (
+            self._connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'lines_fts'"
+            ).fetchone()
+            is not None
+        )
+        if not has_fts and fts is not False:
+            has_fts = self._create_fts()
+            if not has_fts:
+                if fts:
+                    raise OuterlyError("SQLite 不支持 FTS5，无法建立全文索引")
+                logger.warning("SQLite 不支持 FTS5，歌词库将不建立全文索引")
+        self.fts = has_fts
+
+    def _create_fts(self) -> bool:
+        """以首个可用的分词器建立全文索引"""
+        for tokenizer in FTS_TOKENIZERS:
+            try:
+                self._connection.executescript(_FTS_SCHEMA.format(tokenizer))
+            except sqlite3.OperationalError:
+                continue
+            # 已有的词句一并编入索引
+            self._connection.execute(
+                "INSERT INTO lines_fts (lines_fts) VALUES ('rebuild')"
+            )
+            return True
+        return False
+
+    # 连接
+
+    def close(self):
+        """关闭数据库"""
+        self._connection.close()
+
+    def __enter__(self) -> "LyricStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # 写入
+
+    def _song_id(self, key: str) -> int:
+        row = self._connection.execute(
+            "SELECT id FROM songs WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+
+    def _delete(self, song_id: int):
+        execute = self._connection.execute
+        if self.fts:
+            execute(
+                "INSERT INTO lines_fts (lines_fts, rowid, text) "
+                "SELECT 'delete', id, text FROM lines WHERE song_id = ?",
+                (song_id,),
+            )
+        for table in ("meta", "lines", "words"):
+            execute("DELETE FROM {} WHERE song_id = ?".format(table), (song_id,))
+        execute("DELETE FROM songs WHERE id = ?", (song_id,))
+
+    def _insert(self, key: str, lyric: Lyric):
+        """于当前事务中写入一首歌曲"""
+        from .formats.json import encode_block
+
+        connection = self._connection
+        meta_info = lyric.meta_info
+        song_id = connection.execute(
+            "INSERT INTO songs (key, title, artist, line_count) VALUES (?, ?, ?, ?)",
+            (key, meta_info.Title, meta_info.Singer, len(lyric.lyrics)),
+        ).lastrowid
+
+        meta_rows = [
+            (song_id, "meta", name, getattr(meta_info, name))
+            for name in META_FIELDS
+            if getattr(meta_info, name)
+        ]
+        meta_rows.extend(
+            (song_id, "other", name, value) for name, value in meta_info.Other.items()
+        )
+        meta_rows.extend(
+            (song_id, "extra", name, str(value))
+            for name, value in lyric.extra_info.items()
+        )
+        if lyric.whole_contexts:
+            meta_rows.append((song_id, "contexts", "", lyric.whole_contexts))
+        connection.executemany("INSERT INTO meta VALUES (?, ?, ?, ?)", meta_rows)
+
+        line_rows = []
+        word_rows = []
+        # 多个时间标签共用的词句只编码一次
+        bodies: Dict[int, str] = {}
+        for line_index, (start, block) in enumerate(lyric.lyrics.items()):
+            start_ms = start.in_milliseconds
+            body = bodies.get(id(block))
+            if body is None:
+                body = bodies[id(block)] = json.dumps(
+                    encode_block(block), ensure_ascii=False, separators=(",", ":")
+                )
+            line_rows.append(
+                (
+                    song_id,
+                    line_index,
+                    start_ms,
+                    (
+                        None
+                        if block.duration is None
+                        else block.duration.in_milliseconds
+                    ),
+                    str(block),
+                    body,
+                )
+            )
+            for row_index, line in enumerate(block.word_extension or ()):
+                for word_index, (time, parts) in enumerate(line.items()):
+                    word_rows.append(
+                        (
+                            song_id,
+                            line_index,
+                            row_index,
+                            word_index,
+                            time.in_milliseconds,
+                            "".join(parts),
+                        )
+                    )
+        connection.executemany(
+            "INSERT INTO lines (song_id, line_index, start_ms, duration_ms, text, body)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            line_rows,
+        )
+        connection.executemany("INSERT INTO words VALUES (?, ?, ?, ?, ?, ?)", word_rows)
+        if self.fts:
+            connection.execute(
+                "INSERT INTO lines_fts (rowid, text) "
+                "SELECT id, text FROM lines WHERE song_id = ?",
+                (song_id,),
+            )
+
+    def _add(self, key: str, lyric: Lyric, replace: bool) -> bool:
+        row = self._connection.execute(
+            "SELECT id FROM songs WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            if not replace:
+                return False
+            self._delete(row[0])
+        self._insert(key, lyric)
+        return True
+
+    def add(self, key: str, lyric: Lyric, replace: bool = True) -> bool:
+        """
+        写入一首歌曲
+
+        Parameters
+        ----------
+        key: str
+            歌曲标识
+        lyric: Lyric
+            歌词对象
+        replace: bool
+            已有同一标识的歌曲时，为 True 则替换，否则跳过
+
+        Returns
+        -------
+        bool
+            是否写入
+        """
+        return self.add_many([(key, lyric)], replace=replace) == 1
+
+    def add_many(
+        self,
+        songs: Union[Mapping[str, Lyric], Iterable[Tuple[str, Lyric]]],
+        batch_songs: int = DEFAULT_BATCH_SONGS,
+        replace: bool = True,
+    ) -> int:
+        """
+        批量写入歌曲，每 batch_songs 首为一个事务
+
+        Parameters
+        ----------
+        songs: Mapping[str, Lyric] | Iterable[Tuple[str, Lyric]]
+            歌曲，可为生成器以逐首读入
+        batch_songs: int
+            每个事务所含的歌曲数
+        replace: bool
+            已有同一标识的歌曲时，为 True 则替换，否则跳过
+
+        Returns
+        -------
+        int
+            写入的歌曲数
+        """
+        items = songs.items() if isinstance(songs, Mapping) else songs
+        execute = self._connection.execute
+        added = 0
+        pending = 0
+        execute("BEGIN")
+        try:
+            for key, lyric in items:
+                added += self._add(str(key), lyric, replace)
+                pending += 1
+                if pending >= batch_songs:
+                    execute("COMMIT")
+                    execute("BEGIN")
+                    pending = 0
+            execute("COMMIT")
+        except BaseException:
+            execute("ROLLBACK")
+            raise
+        return added
+
+    def remove(self, key: str):
+        """
+        删除一首歌曲
+
+        Raises
+        ------
+        KeyError
+            没有此歌曲
+        """
+        execute = self._connection.execute
+        execute("BEGIN")
+        try:
+            self._delete(self._song_id(key))
+            execute("COMMIT")
+        except BaseException:
+            execute("ROLLBACK")
+            raise
+
+    # 映射
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM songs").fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        # 先取出全部标识，以免遍历期间的写入影响游标
+        keys = self._connection.execute("SELECT key FROM songs ORDER BY id").fetchall()
+        return (key for (key,) in keys)
+
+    def __contains__(self, key) -> bool:
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM songs WHERE key = ?", (key,)
+            ).fetchone()
+            is not None
+        )
+
+    def __getitem__(self, key: str) -> Lyric:
+        return self.lyric(key)
+
+    # 还原
+
+    def _block(self, body: str) -> SubtitleBlock:
+        from .formats.json import decode_block
+
+        return decode_block(json.loads(body), self.text_pool)
+
+    def _meta(self, song_id: int) -> Tuple[MetaInfo, Dict[str, str], Optional[str]]:
+        meta_info = MetaInfo()
+        extra_info = {}
+        whole_contexts = None
+        for kind, name, value in self._connection.execute(
+            "SELECT kind, name, value FROM meta WHERE song_id = ?", (song_id,)
+        ):
+            if kind == "meta":
+                setattr(meta_info, name, value)
+            elif kind == "other":
+                meta_info.Other[name] = value
+            elif kind == "contexts":
+                whole_contexts = value
+            else:
+                extra_info[name] = value
+        return meta_info, extra_info, whole_contexts
+
+    def meta(self, key: str) -> MetaInfo:
+        """
+        取得一首歌曲的元信息，不读入词句
+
+        Raises
+        ------
+        KeyError
+            没有此歌曲
+        """
+        return self._meta(self._song_id(key))[0]
+
+    def lyric(self, key: str) -> Lyric:
+        """
+        由数据库还原一首歌曲的歌词对象
+
+        Parameters
+        ----------
+        key: str
+            歌曲标识
+
+        Returns
+        -------
+        Lyric
+            歌词对象
+
+        Raises
+        ------
+        KeyError
+            没有此歌曲
+        """
+        song_id = self._song_id(key)
+        meta_info, extra_info, whole_contexts = self._meta(song_id)
+        lyric = Lyric(meta_info=meta_info)
+        lyric.extra_info.update(extra_info)
+        items = []
+        contexts = []
+        # 未记有全文时由词句拼合；多个时间标签共用的词句写入时各占一行，只计一次
+        bodies = set()
+        for start_ms, text, body in self._connection.execute(
+            "SELECT start_ms, text, body FROM lines WHERE song_id = ? "
+            "ORDER BY start_ms, line_index",
+            (song_id,),
+        ):
+            items.append((TimeStamp(ms=start_ms), self._block(body)))
+            if whole_contexts is None and body not in bodies:
+                bodies.add(body)
+                contexts.append(text.replace(" ", ""))
+        lyric.lyrics.update(items)
+        lyric.whole_contexts = (
+            "".join(contexts) if whole_contexts is None else whole_contexts
+        )
+        return lyric
+
+    # 查询
+
+    def line_at(
+        self, key: str, time: TimeLike
+    ) -> Optional[Tuple[TimeStamp, SubtitleBlock]]:
+        """
+        取得某一时刻正在显示的词句，即开始时间不晚于此时的最后一句
+
+        Parameters
+        ----------
+        key: str
+            歌曲标识
+        time: TimeStamp | int
+            时刻，整数为毫秒数
+
+        Returns
+        -------
+        Tuple[TimeStamp, SubtitleBlock] | None
+            (开始时间, 词句)，此时尚无词句时为 None
+        """
+        row = self._connection.execute(
+            "SELECT start_ms, body FROM lines WHERE song_id = ? AND start_ms <= ? "
+            "ORDER BY start_ms DESC, line_index DESC LIMIT 1",
+            (self._song_id(key), _as_ms(time)),
+        ).fetchone()
+        if row is None:
+            return None
+        return TimeStamp(ms=row[0]), self._block(row[1])
+
+    def window(
+        self, key: str, start: TimeLike, stop: TimeLike
+    ) -> List[Tuple[TimeStamp, SubtitleBlock]]:
+        """
+        取得开始时间在 [start, stop) 之内的词句，同 Lyric 以切片取得的时间窗
+
+        Parameters
+        ----------
+        key: str
+            歌曲标识
+        start: TimeStamp | int
+            窗口的开始，整数为毫秒数
+        stop: TimeStamp | int
+            窗口的结束（不含），整数为毫秒数
+
+        Returns
+        -------
+        List[Tuple[TimeStamp, SubtitleBlock]]
+            按时间顺序的 (开始时间, 词句)
+        """
+        return [
+            (TimeStamp(ms=start_ms), self._block(body))
+            for start_ms, body in self._connection.execute(
+                "SELECT start_ms, body FROM lines "
+                "WHERE song_id = ? AND start_ms >= ? AND start_ms < ? "
+                "ORDER BY start_ms, line_index",
+                (self._song_id(key), _as_ms(start), _as_ms(stop)),
+            )
+        ]
+
+    def word_at(self, key: str, time: TimeLike) -> Optional[Tuple[TimeStamp, str]]:
+        """
+        取得某一时刻正在唱的字词，即开始时间不晚于此时的最后一个字词
+
+        Parameters
+        ----------
+        key: str
+            歌曲标识
+        time: TimeStamp | int
+            时刻，整数为毫秒数
+
+        Returns
+        -------
+        Tuple[TimeStamp, str] | None
+            (开始时间, 字词)，此时尚无字词时为 None
+        """
+        row = self._connection.execute(
+            "SELECT start_ms, text FROM words WHERE song_id = ? AND start_ms <= ? "
+            "ORDER BY start_ms DESC LIMIT 1",
+            (self._song_id(key), _as_ms(time)),
+        ).fetchone()
+        return None if row is None else (TimeStamp(ms=row[0]), row[1])
+
+    def find(
+        self, title: Optional[str] = None, artist: Optional[str] = None
+    ) -> List[str]:
+        """
+        按标题与歌手查找歌曲，均为完全匹配
+
+        Parameters
+        ----------
+        title: str, optional
+            标题，即元信息的 Title
+        artist: str, optional
+            歌手，即元信息的 Singer
+
+        Returns
+        -------
+        List[str]
+            符合条件的歌曲标识
+        """
+        conditions = []
+        arguments = []
+        if title is not None:
+            conditions.append("title = ?")
+            arguments.append(title)
+        if artist is not None:
+            conditions.append("artist = ?")
+            arguments.append(artist)
+        query = "SELECT key FROM songs"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return [
+            key
+            for (key,) in self._connection.execute(query + " ORDER BY id", arguments)
+        ]
+
+    def search(self, query: str, limit: int = 20) -> List[LineHit]:
+        """
+        全文检索词句
+
+        Parameters
+        ----------
+        query: str
+            FTS5 查询语句，如 "love AND night"、"\\"silver morning\\""；
+            以 trigram 分词时，每个检索词至少三个字
+        limit: int
+            至多返回的条数
+
+        Returns
+        -------
+        List[LineHit]
+            按相关程度排列的词句
+
+        Raises
+        ------
+        OuterlyError
+            歌词库未建立全文索引
+        """
+        if not self.fts:
+            raise OuterlyError("歌词库未建立全文索引")
+        return [
+            LineHit(key, line_index, TimeStamp(ms=start_ms), text)
+            for key, line_index, start_ms, text in self._connection.execute(
+                "SELECT songs.key, lines.line_index, lines.start_ms, lines.text "
+                "FROM lines_fts "
+                "JOIN lines ON lines.id = lines_fts.rowid "
+                "JOIN songs ON songs.id = lines.song_id "
+                "WHERE lines_fts MATCH ? ORDER BY lines_fts.rank LIMIT ?",
+                (query, limit),
+            )
+        ]
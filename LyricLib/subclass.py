@@ -20,6 +20,7 @@ Terms & Conditions: License.md in the root directory
 from enum import Enum
 from dataclasses import dataclass
 from typing import (
+    TYPE_CHECKING,
     Dict,
     List,
     Tuple,
@@ -35,19 +36,29 @@ from typing import (
 )
 
 import re
+from types import MappingProxyType
 from PIL import ImageColor, Image, ImageFont
 from datetime import time, timedelta
 
 from .types import CopyableSequence
 from .utils import _normalize_color
-from .exceptions import TimeTooPreciseError, LineSentenceFormatError
+from .instrument import logger
+from .exceptions import (
+    TimeTooPreciseError,
+    LineSentenceFormatError,
+    FrozenObjectError,
+)
 from .constants import HOUR, MINUTE, SECOND, MILLISECOND, CENTISECOND
 
-from .lrc.constants import LRC_ID_TAG2META_NAME, STABLE_LRC_TIME_FORMAT_STYLE
+from .lrc.constants import STABLE_LRC_TIME_FORMAT_STYLE
+from .lrc.tags import ID_TAGS
 from .lrc.exceptions import LrcDestroyedError, WordTagError
 
 from .lrc.utils import parse_lrc_time_tag
 
+if TYPE_CHECKING:
+    from .textpool import TextPool
+
 
 @dataclass(init=False)
 class TimeStamp:
@@ -77,12 +88,12 @@ class TimeStamp:
         if ms != int(ms):
             raise TimeTooPreciseError("毫秒不应为小数。")
 
-        millisec = ms + sec * 1000 + min * 60000 + hour * 360000
+        millisec = ms + sec * 1000 + min * 60000 + hour * 3600000
 
         self._milliseconds = int(millisec % 1000)
         self._seconds = int(millisec / 1000 % 60)
         self._minutes = int(millisec / 60000 % 60)
-        self._hours = int(millisec / 360000)
+        self._hours = int(millisec / 3600000)
 
     # 只读属性
     @property
@@ -111,8 +122,8 @@ class TimeStamp:
         return (
             self._hours
             + self._minutes / 60
-            + self._seconds / 360
-            + self._milliseconds / 360000
+            + self._seconds / 3600
+            + self._milliseconds / 3600000
         )
 
     @property
@@ -129,7 +140,7 @@ class TimeStamp:
     def in_seconds(self) -> float:
         """以秒为单位的时间戳"""
         return (
-            self._hours * 360
+            self._hours * 3600
             + self._minutes * 60
             + self._seconds
             + self._milliseconds / 1000
@@ -139,7 +150,7 @@ class TimeStamp:
     def in_milliseconds(self) -> int:
         """以毫秒为单位的时间戳"""
         return (
-            self._hours * 360000
+            self._hours * 3600000
             + self._minutes * 60000
             + self._seconds * 1000
             + self._milliseconds
@@ -181,15 +192,7 @@ class TimeStamp:
         判小于
         """
         if isinstance(other, TimeStamp):
-            if self._hours < other.hours:
-                return True
-            elif self._minutes < other.minutes:
-                return True
-            elif self._seconds < other.seconds:
-                return True
-            elif self._milliseconds < other.milliseconds:
-                return True
-            return False
+            return self.in_milliseconds < other.in_milliseconds
         else:
             return NotImplemented
 
@@ -210,6 +213,18 @@ class TimeStamp:
         else:
             return NotImplemented
 
+    def __sub__(self, other) -> "TimeStamp":
+        """
+        两时间戳之差；时间戳不能为负，差为负时抛出 ValueError
+        """
+        if isinstance(other, TimeStamp):
+            difference_ms = self.in_milliseconds - other.in_milliseconds
+            if difference_ms < 0:
+                raise ValueError("时间戳 {} 早于 {}，差为负".format(self, other))
+            return TimeStamp(ms=difference_ms)
+        else:
+            return NotImplemented
+
     # 打包支持 Pickle
 
     def _getstate(self):
@@ -243,14 +258,27 @@ class TimeStamp:
     def to_lrc_timetag(self, format_style: str = STABLE_LRC_TIME_FORMAT_STYLE) -> str:
         """
         以特定样式的LRC格式的时间标签返回字符串
+
+        样式中不含小时时，小时数折入分钟数，以免超过一小时的时间被截断；
+        样式以百分之一秒计时，先将时间舍入到百分之一秒，使进位落到秒、分与小时上
         """
 
+        time = self
+        if CENTISECOND in format_style:
+            time = TimeStamp(
+                ms=self.in_milliseconds
+                - self._milliseconds
+                + round(self._milliseconds / 10) * 10
+            )
+        values = time.__dict__()
+        if HOUR not in format_style:
+            values[MINUTE] += values[HOUR] * 60
         return format_style.format(
             **{
                 unit: value
                 for unit, value in {
-                    **self.__dict__(),
-                    **{CENTISECOND: self._milliseconds / 10},
+                    **values,
+                    **{CENTISECOND: time._milliseconds // 10},
                 }.items()
                 if unit in format_style
             }
@@ -1349,7 +1377,8 @@ class StyledString(str):
 class SubtitleBlock:
     """一块词，包括类似中西对照的多行字幕"""
 
-    location: LineLocation
+    location: Optional[LineLocation]
+    """显示位置，为 None 时由使用者决定"""
     context: List[List[StyledString]]
     """```
     [
@@ -1386,6 +1415,7 @@ class SubtitleBlock:
         extension: Optional[
             Sequence[Mapping[TimeStamp, Sequence[StyledString]]]
         ] = None,
+        location: Optional[LineLocation] = None,
     ):
         """
         建立一条词句
@@ -1401,6 +1431,8 @@ class SubtitleBlock:
             词句的持续时间
         extension: Sequence[Mapping[TimeStamp, Sequence[StyledString]]], optional
             词句的扩展
+        location: LineLocation, optional
+            词句的显示位置
 
         Raises
         ------
@@ -1409,9 +1441,12 @@ class SubtitleBlock:
         """
 
         if isinstance(sentence, str):
+            if not isinstance(sentence, StyledString):
+                sentence = StyledString(sentence)
             if "\n" in sentence:
-                self.context = [StyledString(sentence).split("\n")]
-            self.context = [[StyledString(sentence)]]
+                self.context = [[row] for row in sentence.split("\n")]
+            else:
+                self.context = [[sentence]]
         elif isinstance(sentence, Sequence):
             if all(isinstance(item, StyledString) for item in sentence):
                 self.context = [[item] for item in sentence]  # type: ignore
@@ -1420,6 +1455,7 @@ class SubtitleBlock:
         else:
             raise LineSentenceFormatError("类型：", type(sentence), "内容：", sentence)
 
+        self.location = location
         self.duration = duration
         self.word_extension = (
             extension
@@ -1463,6 +1499,8 @@ class SubtitleBlock:
         sentence: str,
         time_str_list: Sequence[str],
         splited_sentence: Sequence[str],
+        start: Optional[TimeStamp] = None,
+        text_pool: Optional["TextPool"] = None,
     ):
         """从LRC时间列表和单词列表中读入词句
 
@@ -1474,6 +1512,10 @@ class SubtitleBlock:
             LRC时间标签列表
         splited_sentence: Sequence[str]
             分词列表，表示依照时间标签进行分词的单行词句
+        start: TimeStamp, optional
+            词句的起始时间；给出时，末尾多出的时间标签将换算为相对于此的持续时间
+        text_pool: TextPool, optional
+            文本驻留池；给出时，词句与分词均从池中取得共用的 StyledString
         """
         if splited_sentence[-1]:
             word_list_length = len(splited_sentence)
@@ -1484,12 +1526,17 @@ class SubtitleBlock:
         time_list_length = len(time_str_list)
 
         if time_list_length == word_list_length:
-            print("数量相同的时间与字词")
+            logger.debug("字词标签与字词数量相同，无持续时间：%s", time_str_list)
             duration_time = None
-            print(time_str_list, splited_sentence)
         elif time_list_length == word_list_length + 1:
-            print("时间标签比字词多一个")
+            logger.debug("字词标签比字词多一个，末尾标签为结束时间：%s", time_str_list)
             duration_time = TimeStamp.from_lrc_timetag(time_str_list[-1])
+            if start is not None:
+                if duration_time < start:
+                    raise LrcDestroyedError(
+                        "结束时间标签早于词句的开始时间", time_str_list[-1]
+                    )
+                duration_time = duration_time - start
         else:
             raise WordTagError(
                 word_list_length < time_list_length,
@@ -1498,22 +1545,39 @@ class SubtitleBlock:
             )
         # SubtitleBlock(sentence=StyledString(sentence),duration=)
 
+        make_styled = StyledString if text_pool is None else text_pool.intern
+
         return cls(
-            sentence=StyledString(sentence),
+            sentence=make_styled(sentence),
             duration=duration_time,
             extension=[
                 {
                     TimeStamp.from_lrc_timetag(time_tag_str=time_str_list[i]): [
-                        StyledString(splited_sentence[i]),
+                        make_styled(splited_sentence[i]),
                     ]
                     for i in range(word_list_length)
                 }
             ],
         )
 
-    def to_lrc_str(self, format_style: str = STABLE_LRC_TIME_FORMAT_STYLE) -> str:
+    def freeze(self) -> "FrozenSubtitleBlock":
+        """返回不可修改的快照"""
+        return FrozenSubtitleBlock(self)
+
+    def thaw(self) -> "SubtitleBlock":
+        """返回可修改的词句，本身即可修改，故返回自身"""
+        return self
+
+    def to_lrc_str(
+        self,
+        format_style: str = STABLE_LRC_TIME_FORMAT_STYLE,
+        start: Optional[TimeStamp] = None,
+    ) -> str:
         """
         以特定样式的LRC格式的时间标签返回整句
+
+        start: TimeStamp, optional
+            词句的起始时间；给出时，持续时间将换算为末尾的绝对时间标签
         """
         if self.word_extension:
             return "\n".join(
@@ -1526,10 +1590,12 @@ class SubtitleBlock:
                 )
                 + (
                     "<{}>".format(
-                        self.duration.to_lrc_timetag(format_style=format_style)
-                        if self.duration
-                        else ""
+                        (
+                            self.duration if start is None else start + self.duration
+                        ).to_lrc_timetag(format_style=format_style)
                     )
+                    if self.duration
+                    else ""
                 )
                 for line in self.word_extension
             )
@@ -1537,10 +1603,116 @@ class SubtitleBlock:
             return "\n".join("".join(row) for row in self.context)
 
 
+class FrozenSubtitleBlock(SubtitleBlock):
+    """
+    不可修改的词句快照
+
+    各行以元组保存，字词标签以只读映射保存，可在多个线程间共用而无需复制
+    """
+
+    def __init__(self, block: SubtitleBlock):
+        """
+        由词句建立快照
+
+        Parameters
+        ----------
+        block: SubtitleBlock
+            词句，快照建立后对其的修改不影响快照
+        """
+        object.__setattr__(
+            self, "context", tuple(tuple(row) for row in block.context)
+        )
+        object.__setattr__(self, "duration", block.duration)
+        object.__setattr__(
+            self,
+            "word_extension",
+            (
+                None
+                if block.word_extension is None
+                else tuple(
+                    MappingProxyType(
+                        {time: tuple(words) for time, words in line.items()}
+                    )
+                    for line in block.word_extension
+                )
+            ),
+        )
+        object.__setattr__(self, "location", block.location)
+        object.__setattr__(self, "_hash", None)
+
+    def __setattr__(self, name: str, value: Any):
+        raise FrozenObjectError("词句快照不可修改：", name)
+
+    def __delattr__(self, name: str):
+        raise FrozenObjectError("词句快照不可修改：", name)
+
+    def _key(self) -> Tuple:
+        return (
+            self.context,
+            self.duration,
+            (
+                None
+                if self.word_extension is None
+                else tuple(tuple(line.items()) for line in self.word_extension)
+            ),
+            None if self.location is None else self.location.__tuple__(),
+        )
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(self._key()))
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, FrozenSubtitleBlock):
+            return self is other or self._key() == other._key()
+        if isinstance(other, SubtitleBlock):
+            return self._key() == FrozenSubtitleBlock(other)._key()
+        return NotImplemented
+
+    def freeze(self) -> "FrozenSubtitleBlock":
+        """本身即为快照，故返回自身"""
+        return self
+
+    def thaw(self) -> SubtitleBlock:
+        """返回内容相同、可修改的词句"""
+        return SubtitleBlock(
+            [list(row) for row in self.context],
+            self.duration,
+            self.word_extension,
+            self.location,
+        )
+
+    # 打包支持 Pickle
+
+    def __reduce__(self):
+        return (self.__class__, (self.thaw(),))
+
+
+META_FIELDS = (
+    "Singer",
+    "Album",
+    "Title",
+    "LyricAuthor",
+    "Composer",
+    "Arranger",
+    "Length",
+    "Recorder",
+    "Editor",
+    "Version",
+    "Offset",
+)
+"""MetaInfo 中除 Other 以外的各项元信息"""
+
+_META_FIELD_SET = frozenset(META_FIELDS)
+
+
 @dataclass(init=False)
 class MetaInfo:
     """歌词元信息"""
 
+    __slots__ = META_FIELDS + ("Other",)
+
     Singer: str
     Album: str
     Title: str
@@ -1567,7 +1739,7 @@ class MetaInfo:
         Editor: str = "",
         Version: str = "",
         Offset: str = "",
-        Other: Dict[str, str] = {},
+        Other: Optional[Dict[str, str]] = None,
     ) -> None:
         """建立一歌之元"""
         self.Singer = Singer
@@ -1581,71 +1753,100 @@ class MetaInfo:
         self.Editor = Editor
         self.Version = Version
         self.Offset = Offset
-        self.Other = Other
+        self.Other = {} if Other is None else Other
 
     def __dict__(self):
-        result = {
-            "Singer": self.Singer,
-            "Album": self.Album,
-            "Title": self.Title,
-            "LyricAuthor": self.LyricAuthor,
-            "Composer": self.Composer,
-            "Arranger": self.Arranger,
-            "Length": self.Length,
-            "Recorder": self.Recorder,
-            "Editor": self.Editor,
-            "Version": self.Version,
-            "Offset": self.Offset,
-        }
+        result = {name: getattr(self, name) for name in META_FIELDS}
         result.update(self.Other)
         return result
 
+    # 打包支持 Pickle
+
+    def _getstate(self):
+        return tuple(getattr(self, name) for name in META_FIELDS) + (self.Other,)
+
+    def __reduce__(self):
+        return (self.__class__, self._getstate())
+
+    def freeze(self) -> "FrozenMetaInfo":
+        """返回不可修改的快照"""
+        return FrozenMetaInfo(*self._getstate())
+
+    def thaw(self) -> "MetaInfo":
+        """返回可修改的元信息，本身即可修改，故返回自身"""
+        return self
+
     def set_meta(self, meta_name: str, meta_value: str):
-        """设置单个元信息"""
-        if meta_name == "Singer":
-            self.Singer = meta_value
-        elif meta_name == "Album":
-            self.Album = meta_value
-        elif meta_name == "Title":
-            self.Title = meta_value
-        elif meta_name == "LyricAuthor":
-            self.LyricAuthor = meta_value
-        elif meta_name == "Composer":
-            self.Composer = meta_value
-        elif meta_name == "Arranger":
-            self.Arranger = meta_value
-        elif meta_name == "Length":
-            self.Length = meta_value
-        elif meta_name == "Recorder":
-            self.Recorder = meta_value
-        elif meta_name == "Editor":
-            self.Editor = meta_value
-        elif meta_name == "Version":
-            self.Version = meta_value
-        elif meta_name == "Offset":
-            self.Offset = meta_value
+        """
+        设置单个元信息
+
+        meta_name 为属性名时写入该属性；为登记于 ID_TAGS 的自定义名称时原样写入 Other；
+        否则首字母大写后写入 Other
+        """
+        if meta_name in _META_FIELD_SET:
+            setattr(self, meta_name, meta_value)
+        elif ID_TAGS.id_tag(meta_name) is not None:
+            self.Other[meta_name] = meta_value
         else:
             self.Other[meta_name.capitalize()] = meta_value
 
-    def lrc_id_dict(self):
+    def lrc_id_dict(self) -> Dict[str, str]:
         """
         返回LRC文件中所需的ID字典
+
+        每项元信息仅以其规范标签给出（如 Version 仅有 ve 而无 ver），
+        Other 中未登记标签的项以其名称作为标签
         """
-        result = LRC_ID_TAG2META_NAME
-        now_d = {
-            "Singer": self.Singer,
-            "Album": self.Album,
-            "Title": self.Title,
-            "LyricAuthor": self.LyricAuthor,
-            "Composer": self.Composer,
-            "Arranger": self.Arranger,
-            "Length": self.Length,
-            "Recorder": self.Recorder,
-            "Editor": self.Editor,
-            "Version": self.Version,
-            "Offset": self.Offset,
-        }
-        for k in result.keys():
-            result[k] = now_d[result[k]]
-        result.update(self.Other)
+        result = {}
+        for tag, name in ID_TAGS.canonical_items():
+            result[tag] = (
+                getattr(self, name)
+                if name in _META_FIELD_SET
+                else self.Other.get(name, "")
+            )
+        for name, value in self.Other.items():
+            if ID_TAGS.id_tag(name) is None:
+                result[name] = value
         return result
+
+
+class FrozenMetaInfo(MetaInfo):
+    """不可修改的元信息快照"""
+
+    __slots__ = ("_hash", "_frozen")
+
+    def __init__(self, *args, **kwargs) -> None:
+        """参数同 MetaInfo"""
+        object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, "_frozen", False)
+        super().__init__(*args, **kwargs)
+        object.__setattr__(self, "Other", MappingProxyType(dict(self.Other)))
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name: str, value: Any):
+        if self._frozen:
+            raise FrozenObjectError("元信息快照不可修改：", name)
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str):
+        raise FrozenObjectError("元信息快照不可修改：", name)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            state = self._getstate()
+            object.__setattr__(
+                self, "_hash", hash(state[:-1] + (tuple(state[-1].items()),))
+            )
+        return self._hash
+
+    def _getstate(self):
+        state = super()._getstate()
+        return state[:-1] + (dict(state[-1]),)
+
+    def freeze(self) -> "FrozenMetaInfo":
+        """本身即为快照，故返回自身"""
+        return self
+
+    def thaw(self) -> MetaInfo:
+        """返回内容相同、可修改的元信息"""
+        return MetaInfo(*self._getstate())
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""
+跨歌词文档的文本驻留池
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import sys
+import threading
+from weakref import WeakValueDictionary
+from typing import Any, Dict
+
+from .subclass import StyledString
+
+
+class TextPool:
+    """
+    文本驻留池
+
+    将内容与样式均相同的 StyledString 归并为同一个对象，以便在多个歌词对象之间共用。
+    池中仅保存弱引用，不再被任何歌词使用的文本仍可被回收。
+
+    池中取出的 StyledString 会被多处共用，请勿直接修改其属性，
+    应以 bold、coloured、with_styles 等方法生成新的实例。
+    """
+
+    def __init__(self):
+        """建立一个文本驻留池"""
+
+        self._plain: "WeakValueDictionary[int, StyledString]" = WeakValueDictionary()
+        """默认样式的文本，以纯文本的哈希值为键，以免键再持有一份文本"""
+
+        self._styled: "WeakValueDictionary[int, StyledString]" = WeakValueDictionary()
+        """带样式的文本，以样式化哈希值为键"""
+
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        """查询次数"""
+        self.hits = 0
+        """命中次数"""
+        self.bytes_saved = 0
+        """命中时省去的字节数"""
+
+    def intern(self, text: str) -> StyledString:
+        """
+        取得默认样式、内容为 text 的共用 StyledString
+
+        Parameters
+        ----------
+        text: str
+            文本内容
+
+        Returns
+        -------
+        StyledString
+            池中共用的实例；若哈希冲突则返回新建的实例
+        """
+        text = str(text)
+        key = hash(text)
+        with self._lock:
+            self.lookups += 1
+            result = self._plain.get(key)
+            if result is None:
+                result = StyledString(text)
+                self._plain[key] = result
+                return result
+            if str.__eq__(result, text):
+                self.hits += 1
+                self.bytes_saved += sys.getsizeof(result)
+                return result
+            return StyledString(text)
+
+    def intern_styled(self, styled: StyledString) -> StyledString:
+        """
+        取得与 styled 内容、样式均相同的共用 StyledString
+
+        Parameters
+        ----------
+        styled: StyledString
+            带样式的文本
+
+        Returns
+        -------
+        StyledString
+            池中共用的实例；若哈希冲突则原样返回 styled
+        """
+        key = hash(styled)
+        with self._lock:
+            self.lookups += 1
+            result = self._styled.get(key)
+            if result is None:
+                self._styled[key] = styled
+                return styled
+            if result == styled:
+                self.hits += 1
+                self.bytes_saved += sys.getsizeof(result)
+                return result
+            return styled
+
+    def __len__(self) -> int:
+        """池中存活的文本数"""
+        return len(self._plain) + len(self._styled)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        返回驻留池的统计信息
+
+        Returns
+        -------
+        Dict[str, Any]
+            lookups 查询次数、hits 命中次数、hit_rate 命中率、
+            bytes_saved 省去的字节数、size 池中存活的文本数
+        """
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "size": len(self._plain) + len(self._styled),
+            }
+
+    def reset_stats(self):
+        """清空统计信息"""
+        with self._lock:
+            self.lookups = 0
+            self.hits = 0
+            self.bytes_saved = 0
+
+    def clear(self):
+        """清空驻留池，已取出的文本不受影响"""
+        with self._lock:
+            self._plain.clear()
+            self._styled.clear()
+
+
+DEFAULT_TEXT_POOL = TextPool()
+"""进程内共用的默认文本驻留池"""
@@ -18,11 +18,457 @@ Terms & Conditions: License.md in the root directory
 # 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
 
 
-
+from bisect import bisect_left, bisect_right
+from collections.abc import ItemsView, Mapping, MutableMapping, ValuesView
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from typing import Protocol, runtime_checkable
 
 @runtime_checkable
 class CopyableSequence(Protocol):
     def __len__(self) -> int: ...
     def __getitem__(self, i): ...
-    def copy(self): ...
\ No newline at end of file
+    def copy(self): ...
+
+
+class SortedDict(MutableMapping):
+    """
+    按键排序的字典
+
+    插入时以二分查找定位，依序插入时仅需追加，
+    遍历总按键的顺序进行，并可取出某一范围内的键值对而无需复制
+    """
+
+    def __init__(
+        self,
+        items: Optional[Iterable] = None,
+        key: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Parameters
+        ----------
+        items: Mapping | Iterable[Tuple[Any, Any]], optional
+            初始的键值对
+        key: Callable[[Any], Any], optional
+            由键求排序依据的函数，如 TimeStamp 的毫秒数；
+            比较键本身开销较大时给出，可使二分查找只比较排序依据；
+            为 None 时直接比较键
+        """
+        self._key = key
+        self._data: Dict = {} if items is None else dict(items)
+        self._keys: List = sorted(self._data, key=key)
+        # 与 _keys 一一对应的排序依据，不给出 key 时即为 _keys 本身
+        self._order: List = (
+            self._keys if key is None else [key(item) for item in self._keys]
+        )
+
+    def _order_of(self, key):
+        """键的排序依据"""
+        return key if self._key is None else self._key(key)
+
+    def _value(self, key, value):
+        """取出值时调用，供子类转换"""
+        return value
+
+    def _prepare_write(self):
+        """增删改之前调用，供子类复制"""
+
+    def __getitem__(self, key):
+        return self._value(key, self._data[key])
+
+    def __setitem__(self, key, value):
+        self._prepare_write()
+        if key not in self._data:
+            order = self._order_of(key)
+            if not self._order or self._order[-1] < order:
+                index = len(self._keys)
+            else:
+                index = bisect_right(self._order, order)
+            self._keys.insert(index, key)
+            if self._order is not self._keys:
+                self._order.insert(index, order)
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        self._prepare_write()
+        del self._data[key]
+        index = bisect_left(self._order, self._order_of(key))
+        del self._keys[index]
+        if self._order is not self._keys:
+            del self._order[index]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._keys)
+
+    def __reversed__(self) -> Iterator:
+        return reversed(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def _iter_items(self, indexes: Optional[range] = None) -> Iterator[Tuple]:
+        """按顺序遍历键值对，indexes 为 _keys 中的下标范围"""
+        keys = (
+            self._keys if indexes is None else self._keys[indexes.start : indexes.stop]
+        )
+        data = self._data
+        return ((key, data[key]) for key in keys)
+
+    def items(self) -> ItemsView:
+        return _SortedItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _SortedValuesView(self)
+
+    def _bounds(self, start=None, stop=None) -> Tuple[int, int]:
+        """[start, stop) 范围内的键在 _keys 中的下标范围"""
+        return (
+            0 if start is None else bisect_left(self._order, self._order_of(start)),
+            (
+                len(self._keys)
+                if stop is None
+                else bisect_left(self._order, self._order_of(stop))
+            ),
+        )
+
+    def irange(
+        self,
+        minimum=None,
+        maximum=None,
+        inclusive: Tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator:
+        """
+        按顺序遍历某一范围内的键
+
+        Parameters
+        ----------
+        minimum: optional
+            范围的下界，为 None 时不设下界
+        maximum: optional
+            范围的上界，为 None 时不设上界
+        inclusive: Tuple[bool, bool]
+            是否包含下界、上界
+        reverse: bool
+            是否倒序遍历
+
+        Returns
+        -------
+        Iterator
+            范围内的键
+        """
+        order = self._order
+        if minimum is None:
+            low = 0
+        else:
+            low = (bisect_left if inclusive[0] else bisect_right)(
+                order, self._order_of(minimum)
+            )
+        if maximum is None:
+            high = len(order)
+        else:
+            high = (bisect_right if inclusive[1] else bisect_left)(
+                order, self._order_of(maximum)
+            )
+        keys = self._keys
+        indexes = range(low, high)
+        return (keys[i] for i in (reversed(indexes) if reverse else indexes))
+
+    def window(self, start=None, stop=None) -> "SortedWindow":
+        """
+        取出键位于 [start, stop) 范围内的部分
+
+        Parameters
+        ----------
+        start: optional
+            范围的下界（含），为 None 时不设下界
+        stop: optional
+            范围的上界（不含），为 None 时不设上界
+
+        Returns
+        -------
+        SortedWindow
+            只读的视图，与本字典共用各值，随本字典的修改而变化
+        """
+        return SortedWindow(self, start, stop)
+
+    def first(self) -> Tuple[Any, Any]:
+        """键最小的键值对，字典为空时抛出 KeyError"""
+        if not self._keys:
+            raise KeyError("字典为空")
+        return self._keys[0], self[self._keys[0]]
+
+    def last(self) -> Tuple[Any, Any]:
+        """键最大的键值对，字典为空时抛出 KeyError"""
+        if not self._keys:
+            raise KeyError("字典为空")
+        return self._keys[-1], self[self._keys[-1]]
+
+    def floor(self, key) -> Tuple[Any, Any]:
+        """
+        不大于 key 的最大键及其值，如某一时刻正在显示的歌词
+
+        Parameters
+        ----------
+        key:
+            查找的键
+
+        Returns
+        -------
+        Tuple[Any, Any]
+            键值对，没有不大于 key 的键时抛出 KeyError
+        """
+        index = bisect_right(self._order, self._order_of(key))
+        if not index:
+            raise KeyError(key)
+        return self._keys[index - 1], self[self._keys[index - 1]]
+
+    def copy(self) -> "SortedDict":
+        return SortedDict(self.items(), self._key)
+
+    def __repr__(self) -> str:
+        return "{}({!r})".format(self.__class__.__name__, list(self.items()))
+
+    # 打包支持 Pickle
+
+    def _getstate(self):
+        return (list(self.items()), self._key)
+
+    def __reduce__(self):
+        return (SortedDict, self._getstate())
+
+
+class _SortedItemsView(ItemsView):
+    """按顺序遍历的键值对视图，不逐个经由 __getitem__ 取值"""
+
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+    def __reversed__(self):
+        mapping = self._mapping
+        return ((key, mapping[key]) for key in reversed(mapping))
+
+
+class _SortedValuesView(ValuesView):
+    """按顺序遍历的值视图"""
+
+    def __iter__(self):
+        return (value for _, value in self._mapping._iter_items())
+
+    def __reversed__(self):
+        mapping = self._mapping
+        return (mapping[key] for key in reversed(mapping))
+
+
+class SortedWindow(Mapping):
+    """
+    有序字典中某一键范围的只读视图
+
+    不复制任何键值对，每次访问时以二分查找求出范围，故总与原字典一致
+    """
+
+    def __init__(self, parent: SortedDict, start=None, stop=None):
+        """
+        Parameters
+        ----------
+        parent: SortedDict
+            原字典
+        start: optional
+            范围的下界（含），为 None 时不设下界
+        stop: optional
+            范围的上界（不含），为 None 时不设上界
+        """
+        self._parent = parent
+        self.start = start
+        self.stop = stop
+
+    def _in_range(self, key) -> bool:
+        order_of = self._parent._order_of
+        return (self.start is None or not order_of(key) < order_of(self.start)) and (
+            self.stop is None or order_of(key) < order_of(self.stop)
+        )
+
+    def _indexes(self) -> range:
+        return range(*self._parent._bounds(self.start, self.stop))
+
+    def __getitem__(self, key):
+        if not self._in_range(key):
+            raise KeyError(key)
+        return self._parent[key]
+
+    def __iter__(self) -> Iterator:
+        keys = self._parent._keys
+        return (keys[i] for i in self._indexes())
+
+    def __reversed__(self) -> Iterator:
+        keys = self._parent._keys
+        return (keys[i] for i in reversed(self._indexes()))
+
+    def __len__(self) -> int:
+        return len(self._indexes())
+
+    def __contains__(self, key) -> bool:
+        return self._in_range(key) and key in self._parent
+
+    def _iter_items(self) -> Iterator[Tuple]:
+        return self._parent._iter_items(self._indexes())
+
+    def items(self) -> ItemsView:
+        return _SortedItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _SortedValuesView(self)
+
+    def _clip(self, start, stop) -> Tuple[Any, Any]:
+        """将 [start, stop) 限制于本视图的范围之内"""
+        order_of = self._parent._order_of
+        if start is None or (
+            self.start is not None and order_of(start) < order_of(self.start)
+        ):
+            start = self.start
+        if stop is None or (
+            self.stop is not None and order_of(self.stop) < order_of(stop)
+        ):
+            stop = self.stop
+        return start, stop
+
+    def irange(
+        self,
+        minimum=None,
+        maximum=None,
+        inclusive: Tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator:
+        """按顺序遍历范围内的键，参数同 SortedDict.irange"""
+        return (
+            key
+            for key in self._parent.irange(minimum, maximum, inclusive, reverse)
+            if self._in_range(key)
+        )
+
+    def window(self, start=None, stop=None) -> "SortedWindow":
+        """取出键位于 [start, stop) 范围内的部分，范围不超出本视图"""
+        return SortedWindow(self._parent, *self._clip(start, stop))
+
+    def first(self) -> Tuple[Any, Any]:
+        """键最小的键值对，视图为空时抛出 KeyError"""
+        indexes = self._indexes()
+        if not indexes:
+            raise KeyError("视图为空")
+        key = self._parent._keys[indexes[0]]
+        return key, self._parent[key]
+
+    def last(self) -> Tuple[Any, Any]:
+        """键最大的键值对，视图为空时抛出 KeyError"""
+        indexes = self._indexes()
+        if not indexes:
+            raise KeyError("视图为空")
+        key = self._parent._keys[indexes[-1]]
+        return key, self._parent[key]
+
+    def floor(self, key) -> Tuple[Any, Any]:
+        """不大于 key 的最大键及其值，参数同 SortedDict.floor"""
+        order_of = self._parent._order_of
+        if self.stop is not None and not order_of(key) < order_of(self.stop):
+            return self.last()
+        result = self._parent.floor(key)
+        if not self._in_range(result[0]):
+            raise KeyError(key)
+        return result
+
+    def _share(self) -> Tuple[List, List, Dict]:
+        """供写时复制共用的键列表、排序依据与字典"""
+        parent = self._parent
+        low, high = parent._bounds(self.start, self.stop)
+        if low == 0 and high == len(parent._keys):
+            return parent._keys, parent._order, parent._data
+        keys = parent._keys[low:high]
+        order = keys if parent._order is parent._keys else parent._order[low:high]
+        return keys, order, {key: parent._data[key] for key in keys}
+
+    def __repr__(self) -> str:
+        return "{}({!r})".format(self.__class__.__name__, list(self.items()))
+
+
+class CopyOnWriteDict(SortedDict):
+    """
+    写时复制的有序字典
+
+    建立时不复制任何内容：键与值在首次增删改时才复制一份，
+    值在首次被取出时才以 thaw 转为可修改的对象，同一对象只转换一次，
+    故原先共用同一值的各键，转换后仍共用同一对象
+    """
+
+    def __init__(
+        self, base: Union[SortedDict, SortedWindow], thaw: Callable[[Any], Any]
+    ):
+        """
+        Parameters
+        ----------
+        base: SortedDict | SortedWindow
+            底层的有序字典或其视图，此后不应再被修改
+        thaw: Callable[[Any], Any]
+            将底层的值转为可修改对象的函数
+        """
+        if isinstance(base, SortedWindow):
+            self._key = base._parent._key
+            self._keys, self._order, self._data = base._share()
+        else:
+            self._key = base._key
+            self._keys, self._order, self._data = base._keys, base._order, base._data
+        self._base = self._data
+        self._owned = False
+        self._thaw = thaw
+        self._thawed: Dict[int, Any] = {}
+
+    def _prepare_write(self):
+        if not self._owned:
+            shared = self._order is self._keys
+            self._keys = list(self._keys)
+            self._order = self._keys if shared else list(self._order)
+            self._data = dict(self._data)
+            self._owned = True
+
+    def _from_base(self, key, value) -> bool:
+        """值是否仍为底层字典中的原值"""
+        return self._base.get(key, self) is value
+
+    def _value(self, key, value):
+        if not self._from_base(key, value):
+            return value
+        thawed = self._thawed.get(id(value))
+        if thawed is None:
+            thawed = self._thawed[id(value)] = self._thaw(value)
+        return thawed
+
+    def _iter_items(self, indexes: Optional[range] = None) -> Iterator[Tuple]:
+        return (
+            (key, self._value(key, value))
+            for key, value in super()._iter_items(indexes)
+        )
+
+    def raw_items(self) -> Iterator[Tuple[Any, Any]]:
+        """
+        按顺序遍历键值对，尚未取出过的值按底层的原样给出而不转换
+
+        Returns
+        -------
+        Iterator[Tuple[Any, Any]]
+            键与值，值为已转换的对象、底层的原值或之后写入的值
+        """
+        for key, value in super()._iter_items():
+            if self._from_base(key, value):
+                value = self._thawed.get(id(value), value)
+            yield key, value
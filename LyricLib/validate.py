@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+
+"""
+时间轴检查工具
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import re
+import codecs
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+from .subclass import TimeStamp
+from .exceptions import LyricBaseException
+from .lrc.constants import LRC_TAG_PATTERN, LRC_TIME_PATTERN
+from .lrc.utils import parse_lrc_length
+
+if TYPE_CHECKING:
+    from .main import Lyric
+
+
+# 问题等级
+
+ERROR = "error"
+"""错误"""
+
+WARNING = "warning"
+"""警告"""
+
+INFO = "info"
+"""提示"""
+
+# 问题代码
+
+NON_MONOTONIC = "non_monotonic"
+"""时间戳未按先后顺序排列"""
+
+DUPLICATE_TIMESTAMP = "duplicate_timestamp"
+"""重复的时间戳"""
+
+WORD_OUTSIDE_LINE = "word_outside_line"
+"""字词标签超出所在词句的时间范围"""
+
+DURATION_OVERLAP = "duration_overlap"
+"""词句的持续时间与下一句重叠"""
+
+EMPTY_SEGMENT = "empty_segment"
+"""空的词句"""
+
+LENGTH_TOO_SHORT = "length_too_short"
+"""[length:] 标签短于最后一个时间戳"""
+
+INVALID_LENGTH = "invalid_length"
+"""无法解析的 [length:] 标签"""
+
+UNKNOWN_TAG = "unknown_tag"
+"""未知标签"""
+
+PARSE_ERROR = "parse_error"
+"""文件无法解析"""
+
+READ_ERROR = "read_error"
+"""文件无法读取或解码"""
+
+
+@dataclass
+class ValidationIssue:
+    """检查出的单个问题"""
+
+    code: str
+    """问题代码"""
+    severity: str
+    """问题等级"""
+    message: str
+    """问题描述"""
+    time_ms: Optional[int] = None
+    """问题所在的时间（毫秒）"""
+    index: Optional[int] = None
+    """问题所在词句的序号；顺序类问题为时间标签在原文中的序号，其余为排序后的序号"""
+
+
+@dataclass
+class ValidationReport:
+    """时间轴检查报告"""
+
+    line_count: int = 0
+    """检查的词句数"""
+    issues: List[ValidationIssue] = field(default_factory=list)
+    """检查出的问题"""
+
+    @property
+    def ok(self) -> bool:
+        """是否不含错误级别的问题"""
+        return not any(issue.severity == ERROR for issue in self.issues)
+
+    def add(
+        self,
+        code: str,
+        severity: str,
+        message: str,
+        time_ms: Optional[int] = None,
+        index: Optional[int] = None,
+    ):
+        """记录一个问题"""
+        self.issues.append(ValidationIssue(code, severity, message, time_ms, index))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """返回仅由基本类型组成、可直接序列化为 JSON 的字典"""
+        return {
+            "ok": self.ok,
+            "line_count": self.line_count,
+            "issues": [asdict(issue) for issue in self.issues],
+        }
+
+
+def validate_lyric(
+    lyric: "Lyric",
+    check_words: bool = True,
+    check_length: bool = True,
+    check_unknown_tags: bool = True,
+) -> ValidationReport:
+    """
+    一次遍历检查歌词的时间轴
+
+    歌词字典总按时间排序，且同一时间戳只保留一句，
+    故时间标签的先后顺序与重复无从检查，须以 validate_lrc_str 依照原文检查
+
+    Parameters
+    ----------
+    lyric: Lyric
+        需要检查的歌词对象
+    check_words: bool
+        是否检查字词标签是否位于所在词句之内
+    check_length: bool
+        是否检查 [length:] 标签是否短于最后一个时间戳
+    check_unknown_tags: bool
+        是否将未知标签记入报告
+
+    Returns
+    -------
+    ValidationReport
+        检查报告
+    """
+    report = ValidationReport(line_count=len(lyric.lyrics))
+
+    entries = [(time.in_milliseconds, block) for time, block in lyric.lyrics.items()]
+    entries_num = len(entries)
+    for i in range(entries_num):
+        start_ms, block = entries[i]
+        next_ms = entries[i + 1][0] if i + 1 < entries_num else None
+
+        if not str(block).strip():
+            report.add(EMPTY_SEGMENT, INFO, "空的词句", start_ms, i)
+
+        if block.duration is not None and next_ms is not None:
+            if start_ms + block.duration.in_milliseconds > next_ms:
+                report.add(
+                    DURATION_OVERLAP,
+                    WARNING,
+                    "持续时间越过了下一句的开始",
+                    start_ms,
+                    i,
+                )
+
+        if check_words and block.word_extension:
+            end_ms = (
+                start_ms + block.duration.in_milliseconds
+                if block.duration is not None
+                else next_ms
+            )
+            for line in block.word_extension:
+                for word_time in line.keys():
+                    word_ms = word_time.in_milliseconds
+                    if word_ms < start_ms or (end_ms is not None and word_ms > end_ms):
+                        report.add(
+                            WORD_OUTSIDE_LINE,
+                            ERROR,
+                            "字词标签 {} 超出所在词句".format(word_time),
+                            word_ms,
+                            i,
+                        )
+
+    if check_length and lyric.meta_info.Length:
+        length_ms = parse_lrc_length(lyric.meta_info.Length)
+        if length_ms is None:
+            report.add(
+                INVALID_LENGTH,
+                WARNING,
+                "无法解析的歌曲长度：{}".format(lyric.meta_info.Length),
+            )
+        elif entries and length_ms < entries[-1][0]:
+            report.add(
+                LENGTH_TOO_SHORT,
+                ERROR,
+                "歌曲长度短于最后一个时间戳",
+                entries[-1][0],
+                entries_num - 1,
+            )
+
+    if check_unknown_tags:
+        for tag in lyric.extra_info.keys():
+            report.add(UNKNOWN_TAG, INFO, "未知标签：{}".format(tag))
+
+    return report
+
+
+def validate_lrc_str(lrc_raw_text: str, **kwargs) -> ValidationReport:
+    """
+    检查 LRC 歌词文本，参数同 validate_lyric
+
+    解析出错时不抛出，而是记入报告；
+    除 validate_lyric 的各项外，另依照原文检查时间标签的先后顺序与重复
+    """
+    from .main import Lyric
+
+    try:
+        lyric = Lyric.from_lrc_str(lrc_raw_text, strict=False)
+    except LyricBaseException as e:
+        report = ValidationReport()
+        report.add(PARSE_ERROR, ERROR, " ".join(str(arg) for arg in e.args))
+        return report
+
+    report = validate_lyric(lyric, **kwargs)
+
+    for diagnostic in lyric.diagnostics:
+        report.add(PARSE_ERROR, ERROR, str(diagnostic))
+
+    # 歌词字典按时间排序，且同一时间戳只能保留一个，故依照原文中时间标签的顺序
+    # 检查先后顺序，并找出被覆盖的词句
+    time_tags = [
+        tag[1:-1]
+        for tag in re.findall(LRC_TAG_PATTERN, lrc_raw_text)
+        if re.match(LRC_TIME_PATTERN, tag[1:-1])
+    ]
+    seen = set()
+    previous_ms = None
+    for i, tag in enumerate(time_tags):
+        try:
+            time_ms = TimeStamp.from_lrc_timetag(tag).in_milliseconds
+        except LyricBaseException:
+            # 无法解析的时间标签已作为解析错误记入
+            continue
+        if time_ms in seen:
+            report.add(
+                DUPLICATE_TIMESTAMP,
+                ERROR,
+                "时间标签 [{}] 重复出现，先前的词句已被覆盖".format(tag),
+                time_ms,
+                i,
+            )
+        elif previous_ms is not None and time_ms < previous_ms:
+            report.add(
+                NON_MONOTONIC,
+                WARNING,
+                "时间标签 [{}] 早于其前一个时间标签".format(tag),
+                time_ms,
+                i,
+            )
+        seen.add(time_ms)
+        previous_ms = time_ms
+
+    return report
+
+
+def validate_lrc_file(
+    lrc_path: str, lrc_encoding: str = "utf-8", **kwargs
+) -> Dict[str, Any]:
+    """
+    检查 LRC 歌词文件，返回可序列化为 JSON 的报告字典，参数同 validate_lyric
+    """
+    with codecs.open(lrc_path, "r", encoding=lrc_encoding) as f:
+        lrc_raw_text = f.read()
+
+    return validate_lrc_str(lrc_raw_text, **kwargs).to_dict()
+
+
+def _validate_lrc_file_or_report(
+    lrc_path: str, lrc_encoding: str = "utf-8"
+) -> Dict[str, Any]:
+    """检查单个文件；文件无法读取或解码时不抛出，而是记入此文件的报告"""
+    try:
+        return validate_lrc_file(lrc_path, lrc_encoding)
+    except Exception as e:
+        report = ValidationReport()
+        report.add(READ_ERROR, ERROR, "文件无法读取：{}".format(e))
+        return report.to_dict()
+
+
+def validate_lrc_files(
+    lrc_paths: Iterable[str],
+    lrc_encoding: str = "utf-8",
+    max_workers: Optional[int] = None,
+    chunksize: int = 16,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    以进程池批量检查 LRC 歌词文件
+
+    Parameters
+    ----------
+    lrc_paths: Iterable[str]
+        LRC歌词文件地址
+    lrc_encoding: str
+        LRC歌词文件所使用的字符编码
+    max_workers: int, optional
+        进程数，为 1 时不启用进程池
+    chunksize: int
+        每次分派给子进程的文件数
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        以文件地址对应其报告字典；
+        无法读取或解码的文件不会中断整批检查，其报告中记有 read_error
+    """
+    lrc_paths = list(lrc_paths)
+    encodings = [lrc_encoding] * len(lrc_paths)
+
+    if max_workers == 1:
+        return {
+            path: _validate_lrc_file_or_report(path, lrc_encoding) for path in lrc_paths
+        }
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(
+            zip(
+                lrc_paths,
+                executor.map(
+                    _validate_lrc_file_or_report,
+                    lrc_paths,
+                    encodings,
+                    chunksize=chunksize,
+                ),
+            )
+        )
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+
+"""
+字词时间插值：由单句标签生成字词标签
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import os
+import re
+import copy
+from itertools import accumulate
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Union, TYPE_CHECKING
+
+from .subclass import TimeStamp, StyledString
+from .lrc.utils import parse_lrc_length
+from .constants import CJK_CHARACTER_RANGE, CJK_PUNCTUATION_RANGE
+
+if TYPE_CHECKING:
+    from .main import Lyric
+
+
+WORD_PATTERN = re.compile(
+    r"[\s{p}]*(?:[{c}]|[^\s{c}{p}]+)[\s{p}]*|[\s{p}]+".format(
+        c=CJK_CHARACTER_RANGE, p=CJK_PUNCTUATION_RANGE
+    )
+)
+"""切分字词：中日韩文字逐字，其余以空白分词，空白与标点依附于相邻的字词"""
+
+SYLLABLE_PATTERN = re.compile(
+    r"[^aeiouy]*[aeiouy]+(?:[^aeiouy]*$|[^aeiouy](?=[^aeiouy]))?", re.IGNORECASE
+)
+"""粗略切分西文音节"""
+
+_VOWELS_PATTERN = re.compile(r"[aeiouy]+", re.IGNORECASE)
+
+
+def split_syllables(word: str) -> List[str]:
+    """
+    将一个西文单词粗略地切分为音节，无法切分时原样返回
+
+    Parameters
+    ----------
+    word: str
+        单词，可带有首尾的空白与标点
+
+    Returns
+    -------
+    List[str]
+        音节列表，首尾相接即为原单词
+    """
+    syllables = SYLLABLE_PATTERN.findall(word)
+    if len(syllables) > 1 and "".join(syllables) == word:
+        return syllables
+    return [word]
+
+
+def split_words(text: str, syllables: bool = False) -> List[str]:
+    """
+    将一句歌词切分为字词
+
+    Parameters
+    ----------
+    text: str
+        歌词文本
+    syllables: bool
+        是否将西文单词进一步切分为音节
+
+    Returns
+    -------
+    List[str]
+        字词列表，首尾相接即为原文本
+    """
+    words = WORD_PATTERN.findall(text)
+    if syllables:
+        return [part for word in words for part in split_syllables(word)]
+    return words
+
+
+def _uniform_weight(word: str) -> float:
+    return 1
+
+
+def _chars_weight(word: str) -> float:
+    return max(len(word.strip()), 1)
+
+
+def _vowels_weight(word: str) -> float:
+    if re.search("[{}]".format(CJK_CHARACTER_RANGE), word):
+        return 1
+    return max(len(_VOWELS_PATTERN.findall(word)), 1)
+
+
+WEIGHTINGS: Dict[str, Callable[[str], float]] = {
+    "uniform": _uniform_weight,
+    "chars": _chars_weight,
+    "vowels": _vowels_weight,
+}
+"""内置的字词权重：均分、按字符数、按元音数"""
+
+
+def distribute(start_ms: int, end_ms: int, weights: List[float]) -> List[int]:
+    """
+    按权重将一段时间分配给各字词
+
+    Parameters
+    ----------
+    start_ms: int
+        开始时间（毫秒）
+    end_ms: int
+        结束时间（毫秒）
+    weights: List[float]
+        各字词的权重
+
+    Returns
+    -------
+    List[int]
+        各字词的开始时间（毫秒），与开始时间均相差整百分之一秒，
+        故按 LRC 的百分之一秒精度写出再读入后不变
+    """
+    total = sum(weights)
+    if total <= 0:
+        return [start_ms] * len(weights)
+    span = end_ms - start_ms
+    return [
+        start_ms + int(span * before / total) // 10 * 10
+        for before in accumulate([0] + weights[:-1])
+    ]
+
+
+def fill_word_timing(
+    lyric: "Lyric",
+    weighting: Union[str, Callable[[str], float]] = "chars",
+    syllables: bool = False,
+    overwrite: bool = False,
+    fill_duration: bool = True,
+    tail_ms: int = 3000,
+) -> "Lyric":
+    """
+    为歌词中的每一句插值生成字词标签，结果写入各词句的 word_extension
+
+    每句的时间范围为本句开始至本句结束（持续时间）或下一句开始，
+    最后一句以 [length:] 标签为止，若无则持续 tail_ms 毫秒。
+
+    Parameters
+    ----------
+    lyric: Lyric
+        歌词对象，将被原地修改
+    weighting: str | Callable[[str], float]
+        字词权重，可为 "uniform"、"chars"、"vowels" 或自定义的函数
+    syllables: bool
+        是否将西文单词切分为音节
+    overwrite: bool
+        是否覆盖已有的字词标签
+    fill_duration: bool
+        是否为没有持续时间的词句补上持续时间，以便写出末尾的字词标签
+    tail_ms: int
+        最后一句没有其他结束依据时的持续毫秒数
+
+    Returns
+    -------
+    Lyric
+        传入的歌词对象
+    """
+    weight = WEIGHTINGS[weighting] if isinstance(weighting, str) else weighting
+
+    lines = sorted(
+        ((time.in_milliseconds, time, block) for time, block in lyric.lyrics.items()),
+        key=lambda line: line[0],
+    )
+    lines_num = len(lines)
+    length_ms = (
+        parse_lrc_length(lyric.meta_info.Length) if lyric.meta_info.Length else None
+    )
+    # 待插值的词句及其原有的持续时间
+    todo = {
+        id(block): block.duration
+        for _, _, block in lines
+        if overwrite or not block.word_extension
+    }
+    done = set()
+
+    for line_index in range(lines_num):
+        start_ms, time, block = lines[line_index]
+        if id(block) not in todo:
+            continue
+        if id(block) in done:
+            # 字词标签为绝对时间，多个时间标签共用的词句需各自拥有一份
+            duration = todo[id(block)]
+            block = copy.copy(block)
+            block.duration = duration
+            lyric.lyrics[time] = block
+        done.add(id(block))
+
+        if block.duration is not None:
+            end_ms = start_ms + block.duration.in_milliseconds
+        elif line_index + 1 < lines_num:
+            end_ms = lines[line_index + 1][0]
+        elif length_ms is not None and length_ms > start_ms:
+            end_ms = length_ms
+        else:
+            end_ms = start_ms + tail_ms
+
+        extension = []
+        for row in block.context:
+            row_words: Dict[TimeStamp, List[StyledString]] = {}
+            styled_words = []
+            for run in row:
+                styled = run if isinstance(run, StyledString) else StyledString(run)
+                styled_words.extend(
+                    styled._with_same_style(word)
+                    for word in split_words(str(styled), syllables)
+                )
+            starts = distribute(
+                start_ms, end_ms, [weight(str(word)) for word in styled_words]
+            )
+            for word_ms, word in zip(starts, styled_words):
+                # 时间过短时相邻字词可能落在同一时刻，此时归入同一标签
+                row_words.setdefault(TimeStamp(ms=word_ms), []).append(word)
+            extension.append(row_words)
+
+        if any(extension):
+            block.word_extension = extension
+            if fill_duration and block.duration is None:
+                block.duration = TimeStamp(ms=end_ms - start_ms)
+
+    return lyric
+
+
+def _fill_word_timing_file(
+    lrc_path: str, output_path: str, lrc_encoding: str, options: dict
+) -> Optional[str]:
+    """处理单个文件，返回错误信息或 None"""
+    from .main import Lyric
+    from .exceptions import LyricBaseException
+
+    try:
+        lyric = fill_word_timing(Lyric.from_lrc(lrc_path, lrc_encoding), **options)
+        with open(output_path, "w", encoding=lrc_encoding) as f:
+            lyric.to_lrc(f)
+    except (LyricBaseException, OSError) as e:
+        return " ".join(str(arg) for arg in e.args)
+    return None
+
+
+def fill_word_timing_files(
+    lrc_paths: Iterable[str],
+    output_dir: str,
+    lrc_encoding: str = "utf-8",
+    max_workers: Optional[int] = None,
+    chunksize: int = 16,
+    **options,
+) -> Dict[str, Optional[str]]:
+    """
+    以进程池批量为 LRC 歌词文件生成字词标签，另存为增强格式
+
+    Parameters
+    ----------
+    lrc_paths: Iterable[str]
+        LRC歌词文件地址
+    output_dir: str
+        输出目录，输出文件与原文件同名
+    lrc_encoding: str
+        LRC歌词文件所使用的字符编码
+    max_workers: int, optional
+        进程数，为 1 时不启用进程池
+    chunksize: int
+        每次分派给子进程的文件数
+    options:
+        传给 fill_word_timing 的参数
+
+    Returns
+    -------
+    Dict[str, Optional[str]]
+        以文件地址对应其错误信息，成功者为 None
+    """
+    lrc_paths = list(lrc_paths)
+    output_paths = [
+        os.path.join(output_dir, os.path.basename(path)) for path in lrc_paths
+    ]
+    encodings = [lrc_encoding] * len(lrc_paths)
+    options_list = [options] * len(lrc_paths)
+
+    if max_workers == 1:
+        return {
+            path: _fill_word_timing_file(path, output, lrc_encoding, options)
+            for path, output in zip(lrc_paths, output_paths)
+        }
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(
+            zip(
+                lrc_paths,
+                executor.map(
+                    _fill_word_timing_file,
+                    lrc_paths,
+                    output_paths,
+                    encodings,
+                    options_list,
+                    chunksize=chunksize,
+                ),
+            )
+        )
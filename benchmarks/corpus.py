@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""
+确定性的合成 LRC 语料
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import os
+import random
+from typing import Dict, List, Tuple
+
+KINDS = ("plain", "enhanced", "bilingual", "multitag")
+"""
+语料种类
+- plain 普通格式，中西文混排
+- enhanced 增强格式，每个字词带有时间标签
+- bilingual 中西对照，译文为紧随其后的无标签行
+- multitag 副歌反复，一行带有多个时间标签
+"""
+
+_WORDS = (
+    "love night heart light dream away baby fire time falling tonight "
+    "forever never again always stay alive stars rain shadow dance "
+    "remember running hold close wings across ocean silver morning"
+).split()
+
+_CHARS = (
+    "爱夜心光梦远风火时落今晚永远不再始终留活星雨影舞记得奔跑拥抱靠近翅膀穿越"
+    "海洋银色清晨城市街道回忆温柔等待思念天空花开"
+)
+
+_PUNCT = ("", "", "", ",", "!", "?", "...")
+
+
+def _timetag(ms: int) -> str:
+    """毫秒数转为 mm:ss.xx"""
+    return "{:02d}:{:02d}.{:02d}".format(ms // 60000, ms // 1000 % 60, ms // 10 % 100)
+
+
+def _english(rng: random.Random, words: Tuple[int, int]) -> List[str]:
+    sentence = [rng.choice(_WORDS) for _ in range(rng.randint(*words))]
+    sentence[0] = sentence[0].capitalize()
+    sentence[-1] += rng.choice(_PUNCT)
+    return sentence
+
+
+def _chinese(rng: random.Random, words: Tuple[int, int]) -> List[str]:
+    return [rng.choice(_CHARS) for _ in range(rng.randint(*words) + 2)]
+
+
+def _header(rng: random.Random, length_ms: int) -> List[str]:
+    return [
+        "[ti:合成歌曲 {}]".format(rng.randint(1, 9999)),
+        "[ar:基准测试]",
+        "[al:Synthetic Album]",
+        "[by:benchmarks]",
+        "[length:{}]".format(_timetag(length_ms)),
+        "[offset:0]",
+        "",
+    ]
+
+
+def generate_lrc(
+    kind: str = "plain",
+    lines: int = 1000,
+    seed: int = 0,
+    words: Tuple[int, int] = (4, 10),
+) -> str:
+    """
+    生成一份合成的 LRC 歌词，相同参数所得结果总是相同
+
+    Parameters
+    ----------
+    kind: str
+        语料种类，见 KINDS
+    lines: int
+        时间标签的数量（近似歌词行数）
+    seed: int
+        随机种子
+    words: Tuple[int, int]
+        每行字词数的范围
+
+    Returns
+    -------
+    str
+        LRC 文本
+    """
+    if kind not in KINDS:
+        raise ValueError("未知的语料种类：{}".format(kind))
+    rng = random.Random("{}:{}".format(kind, seed))
+
+    starts = []
+    now = 1000
+    for _ in range(lines):
+        starts.append(now)
+        now += rng.randint(1500, 5000)
+    result = _header(rng, now)
+
+    if kind == "multitag":
+        # 若干段副歌，每段在各处反复出现
+        chorus_num = max(lines // 8, 1)
+        choruses = [" ".join(_english(rng, words)) for _ in range(chorus_num)]
+        assigned: Dict[int, List[int]] = {}
+        for start in starts:
+            assigned.setdefault(rng.randrange(chorus_num), []).append(start)
+        for chorus_index, chorus_starts in sorted(assigned.items()):
+            result.append(
+                "".join("[{}]".format(_timetag(ms)) for ms in chorus_starts)
+                + choruses[chorus_index]
+            )
+        return "\n".join(result) + "\n"
+
+    for i in range(lines):
+        start = starts[i]
+        end = starts[i + 1] if i + 1 < lines else now
+        use_chinese = rng.random() < 0.5
+        sentence = _chinese(rng, words) if use_chinese else _english(rng, words)
+
+        if kind == "enhanced":
+            step = (end - start - 200) // len(sentence)
+            parts = []
+            for j in range(len(sentence)):
+                word = sentence[j] if use_chinese or j == 0 else " " + sentence[j]
+                parts.append("<{}>{}".format(_timetag(start + j * step), word))
+            parts.append("<{}>".format(_timetag(end - 200)))
+            result.append("[{}]{}".format(_timetag(start), "".join(parts)))
+        elif kind == "bilingual":
+            english = _english(rng, words)
+            result.append("[{}]{}".format(_timetag(start), " ".join(english)))
+            result.append("".join(_chinese(rng, words)))
+        else:
+            result.append(
+                "[{}]{}".format(
+                    _timetag(start),
+                    "".join(sentence) if use_chinese else " ".join(sentence),
+                )
+            )
+    return "\n".join(result) + "\n"
+
+
+def write_corpus(
+    directory: str, lines: int = 1000, seed: int = 0, kinds=KINDS
+) -> Dict[str, str]:
+    """
+    将各种语料写入目录
+
+    Parameters
+    ----------
+    directory: str
+        输出目录
+    lines: int
+        每份语料的时间标签数
+    seed: int
+        随机种子
+    kinds: Iterable[str]
+        语料种类
+
+    Returns
+    -------
+    Dict[str, str]
+        以语料种类对应其文件地址
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for kind in kinds:
+        path = os.path.join(directory, "{}-{}-{}.lrc".format(kind, lines, seed))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(generate_lrc(kind, lines, seed))
+        paths[kind] = path
+    return paths
@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+
+"""
+基准测试用例、计量与基线比对
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import io
+import gc
+import atexit
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from LyricLib import Lyric, TimeStamp, SubtitleBlock, __version__
+from LyricLib.subclass import StyledString
+from LyricLib.header import read_lrc_meta
+from LyricLib.formats.json import iterencode, from_json
+from LyricLib.lrc.utils import parse_lrc_enhanced_segment
+
+from .corpus import KINDS, generate_lrc
+
+Case = Callable[[int], Tuple[Callable[[], Any], int, int]]
+"""用例：由规模生成 (待测函数, 处理的行数, 处理的字节数)"""
+
+CASES: Dict[str, Case] = {}
+"""所有用例，以名称为键"""
+
+
+def case(name: str):
+    """注册用例"""
+
+    def decorator(function: Case) -> Case:
+        CASES[name] = function
+        return function
+
+    return decorator
+
+
+@dataclass
+class BenchResult:
+    """单个用例的结果"""
+
+    seconds: float
+    """单次运行的最短用时（秒）"""
+    lines: int
+    """单次运行处理的行数"""
+    bytes: int
+    """单次运行处理的字节数"""
+    peak_kb: float
+    """单次运行中 Python 分配内存的峰值（KiB）"""
+
+    @property
+    def lines_per_s(self) -> float:
+        return self.lines / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / self.seconds / 1e6 if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        result = asdict(self)
+        result["lines_per_s"] = self.lines_per_s
+        result["mb_per_s"] = self.mb_per_s
+        return result
+
+
+def _lrc_size(text: str) -> Tuple[int, int]:
+    return text.count("\n"), len(text.encode("utf-8"))
+
+
+# 解析与写出
+
+
+def _parse_case(kind: str) -> Case:
+    def setup(lines: int):
+        text = generate_lrc(kind, lines)
+        return (lambda: Lyric.from_lrc_str(text)), *_lrc_size(text)
+
+    return setup
+
+
+def _write_case(kind: str) -> Case:
+    def setup(lines: int):
+        text = generate_lrc(kind, lines)
+        lyric = Lyric.from_lrc_str(text)
+
+        def run():
+            lyric.to_lrc(io.StringIO())
+
+        return run, *_lrc_size(text)
+
+    return setup
+
+
+for _kind in KINDS:
+    case("parse_" + _kind)(_parse_case(_kind))
+    case("write_" + _kind)(_write_case(_kind))
+
+
+@case("from_lrc_file")
+def _from_lrc_file(lines: int):
+    text = generate_lrc("plain", lines)
+    handle, path = tempfile.mkstemp(suffix=".lrc")
+    with os.fdopen(handle, "w", encoding="utf-8") as f:
+        f.write(text)
+    atexit.register(os.remove, path)
+    return (lambda: Lyric.from_lrc(path)), *_lrc_size(text)
+
+
+@case("read_lrc_meta")
+def _read_lrc_meta(lines: int):
+    text = generate_lrc("plain", lines)
+    handle, path = tempfile.mkstemp(suffix=".lrc")
+    with os.fdopen(handle, "w", encoding="utf-8") as f:
+        f.write(text)
+    atexit.register(os.remove, path)
+    header = text[: text.index("\n[0")]
+    return (lambda: read_lrc_meta(path)), *_lrc_size(header)
+
+
+@case("json_encode")
+def _json_encode(lines: int):
+    lyric = Lyric.from_lrc_str(generate_lrc("enhanced", lines))
+    text = "".join(iterencode(lyric))
+    return (lambda: "".join(iterencode(lyric))), lines, len(text.encode("utf-8"))
+
+
+@case("json_decode")
+def _json_decode(lines: int):
+    text = "".join(iterencode(Lyric.from_lrc_str(generate_lrc("enhanced", lines))))
+    return (lambda: from_json(json.loads(text))), lines, len(text.encode("utf-8"))
+
+
+# 基础类型
+
+
+@case("timestamp_construct")
+def _timestamp_construct(lines: int):
+    rng = random.Random(0)
+    values = [rng.randrange(0, 3600000) for _ in range(lines * 10)]
+
+    def run():
+        for value in values:
+            TimeStamp(ms=value)
+
+    return run, len(values), 0
+
+
+@case("timestamp_parse")
+def _timestamp_parse(lines: int):
+    rng = random.Random(0)
+    tags = [
+        "{:02d}:{:02d}.{:02d}".format(m, s, c)
+        for m, s, c in (
+            (rng.randrange(60), rng.randrange(60), rng.randrange(100))
+            for _ in range(lines * 10)
+        )
+    ]
+
+    def run():
+        for tag in tags:
+            TimeStamp.from_lrc_timetag(tag)
+
+    return run, len(tags), sum(len(tag) for tag in tags)
+
+
+@case("timestamp_hash_compare")
+def _timestamp_hash_compare(lines: int):
+    rng = random.Random(0)
+    stamps = [TimeStamp(ms=rng.randrange(0, 3600000)) for _ in range(lines * 10)]
+
+    def run():
+        table = {stamp: None for stamp in stamps}
+        sorted(stamps)
+        return len(table)
+
+    return run, len(stamps), 0
+
+
+@case("styled_string_ops")
+def _styled_string_ops(lines: int):
+    rng = random.Random(0)
+    texts = [
+        StyledString(generate_lrc("plain", 1, seed).splitlines()[-1][10:])
+        for seed in range(min(lines, 200))
+    ]
+    texts = [texts[rng.randrange(len(texts))] for _ in range(lines)]
+
+    def run():
+        for text in texts:
+            styled = text.bold().coloured("#ffcc00").outline(2, "black")
+            styled[2:8]
+            styled.split(" ")
+            styled.upper().strip()
+            styled.with_styles(font_size=32)
+
+    return run, len(texts), sum(len(text.encode("utf-8")) for text in texts)
+
+
+@case("from_lrc_str_list")
+def _from_lrc_str_list(lines: int):
+    segments = [
+        line[line.index("]") + 1 :]
+        for line in generate_lrc("enhanced", lines).splitlines()
+        if line.startswith("[") and "<" in line
+    ]
+    parsed = [parse_lrc_enhanced_segment(segment) for segment in segments]
+    start = TimeStamp(ms=0)
+
+    def run():
+        for timestamps, parts in parsed:
+            SubtitleBlock.from_lrc_str_list(
+                "".join(parts), timestamps, parts[1:], start=start
+            )
+
+    return run, len(parsed), sum(len(segment.encode("utf-8")) for segment in segments)
+
+
+# 计量
+
+
+def measure(function: Callable[[], Any], repeat: int = 5) -> Tuple[float, float]:
+    """
+    计量一个函数
+
+    Parameters
+    ----------
+    function: Callable[[], Any]
+        待测函数
+    repeat: int
+        计时次数，取最短者
+
+    Returns
+    -------
+    Tuple[float, float]
+        最短用时（秒）与内存峰值（KiB）
+    """
+    function()  # 预热
+
+    best = float("inf")
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    # 内存计量会显著拖慢运行，单独进行一次
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1024
+
+
+def run_benchmarks(
+    lines: int = 2000,
+    repeat: int = 5,
+    names: Optional[List[str]] = None,
+) -> Dict[str, BenchResult]:
+    """
+    运行用例
+
+    Parameters
+    ----------
+    lines: int
+        语料规模（行数）
+    repeat: int
+        每个用例的计时次数
+    names: List[str], optional
+        仅运行名称包含其中任一字符串的用例
+
+    Returns
+    -------
+    Dict[str, BenchResult]
+        以用例名称对应其结果
+    """
+    results = {}
+    for name, setup in CASES.items():
+        if names and not any(part in name for part in names):
+            continue
+        function, line_count, byte_count = setup(lines)
+        seconds, peak_kb = measure(function, repeat)
+        results[name] = BenchResult(seconds, line_count, byte_count, peak_kb)
+    return results
+
+
+def compare(
+    results: Dict[str, BenchResult],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.15,
+) -> List[Tuple[str, float, float]]:
+    """
+    与基线比对
+
+    Parameters
+    ----------
+    results: Dict[str, BenchResult]
+        本次结果
+    baseline: Dict[str, Any]
+        基线文件的内容
+    tolerance: float
+        允许变慢的比例
+
+    Returns
+    -------
+    List[Tuple[str, float, float]]
+        变慢超出容许范围的用例：(名称, 基线用时, 本次用时)；基线中没有的用例不参与比对
+    """
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        # 规模不同时按每行用时比较
+        old_per_line = old["seconds"] / max(old["lines"], 1)
+        new_per_line = result.seconds / max(result.lines, 1)
+        if new_per_line > old_per_line * (1 + tolerance):
+            regressions.append((name, old["seconds"], result.seconds))
+    return regressions
+
+
+def to_json(results: Dict[str, BenchResult], lines: int) -> Dict[str, Any]:
+    """将结果整理为可存作基线的字典"""
+    return {
+        "meta": {
+            "lyriclib": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "lines": lines,
+        },
+        "results": {name: result.to_dict() for name, result in results.items()},
+    }
+
+
+def _report(results: Dict[str, BenchResult], baseline: Optional[Dict[str, Any]]) -> str:
+    rows = [
+        "{:<24} {:>10} {:>12} {:>9} {:>10} {:>9}".format(
+            "case", "ms", "lines/s", "MB/s", "peak KiB", "vs base"
+        )
+    ]
+    for name, result in results.items():
+        ratio = ""
+        if baseline is not None and name in baseline.get("results", {}):
+            old = baseline["results"][name]
+            old_per_line = old["seconds"] / max(old["lines"], 1)
+            if old_per_line:
+                ratio = "{:+.1%}".format(
+                    result.seconds / max(result.lines, 1) / old_per_line - 1
+                )
+        elif baseline is not None:
+            ratio = "n/a"
+        rows.append(
+            "{:<24} {:>10.2f} {:>12.0f} {:>9.2f} {:>10.1f} {:>9}".format(
+                name,
+                result.seconds * 1000,
+                result.lines_per_s,
+                result.mb_per_s,
+                result.peak_kb,
+                ratio,
+            )
+        )
+    return "\n".join(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口，有变慢超出容许范围的用例时返回 1"""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="词幕库性能基准测试"
+    )
+    parser.add_argument("--lines", type=int, default=2000, help="语料规模（行数）")
+    parser.add_argument("--repeat", type=int, default=5, help="每个用例的计时次数")
+    parser.add_argument(
+        "-k", "--filter", action="append", help="仅运行名称包含此字符串的用例"
+    )
+    parser.add_argument("--baseline", help="与此基线文件比对")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="允许变慢的比例")
+    parser.add_argument("--save", help="将本次结果存为基线文件")
+    parser.add_argument("--list", action="store_true", help="列出所有用例")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return 0
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = run_benchmarks(args.lines, args.repeat, args.filter)
+    print(_report(results, baseline), file=sys.stderr)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(to_json(results, args.lines), f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    if baseline is not None:
+        for name in results:
+            if name not in baseline.get("results", {}):
+                print("基线中没有此用例，未比对：{}".format(name), file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, old, new in regressions:
+            print(
+                "变慢：{} {:.2f}ms -> {:.2f}ms".format(name, old * 1000, new * 1000),
+                file=sys.stderr,
+            )
+        return 1 if regressions else 0
+    return 0
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+"""
+JSON 往返读写保留依原文顺序的全文
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import json
+
+from LyricLib import Lyric
+from LyricLib.formats.json import dumps, from_json, iterencode, loads, to_json
+
+SOURCE = "[00:01.00][00:03.00]A quick fox\n[00:02.00]二\n"
+
+
+def test_whole_contexts_round_trip():
+    lyric = Lyric.from_lrc_str(SOURCE)
+
+    assert lyric.whole_contexts == "Aquickfox二"
+    assert loads(dumps(lyric)).whole_contexts == lyric.whole_contexts
+    assert loads("".join(iterencode(lyric))).whole_contexts == lyric.whole_contexts
+
+
+def test_missing_contexts_counts_shared_lines_once():
+    data = json.loads(json.dumps(to_json(Lyric.from_lrc_str(SOURCE))))
+    del data["contexts"]
+
+    assert from_json(data).whole_contexts == "Aquickfox二"
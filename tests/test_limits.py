@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+"""
+解析限制按实际行数计算
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import pytest
+
+from LyricLib import Lyric
+from LyricLib.exceptions import LimitExceededError
+from LyricLib.limits import ParseLimits
+
+
+def test_trailing_newline_is_not_a_line():
+    lyric = Lyric.from_lrc_str(
+        "[00:01.00]a\n[00:02.00]b\n", limits=ParseLimits(max_lines=2)
+    )
+    assert len(lyric.lyrics) == 2
+
+
+def test_too_many_lines():
+    with pytest.raises(LimitExceededError):
+        Lyric.from_lrc_str(
+            "[00:01.00]a\n[00:02.00]b\nc", limits=ParseLimits(max_lines=2)
+        )
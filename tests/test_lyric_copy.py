@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+"""
+复制歌词对象时原对象保持不变，且两者互不影响
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+from LyricLib import Lyric, TimeStamp
+
+SOURCE = "[00:01.00]a\n[00:02.00]b\n[00:03.00]c\n"
+
+
+def test_copy_leaves_source_blocks_alone():
+    lyric = Lyric.from_lrc_str(SOURCE)
+    lyrics = lyric.lyrics
+    before = lyric[1000]
+
+    copied = lyric.copy()
+
+    assert lyric.lyrics is lyrics
+    assert lyric[1000] is before
+    assert copied[1000] is not before
+
+    before.duration = TimeStamp(ms=500)
+    assert copied[1000].duration is None
+
+    copied[2000].duration = TimeStamp(ms=700)
+    assert lyric[2000].duration is None
+
+
+def test_copy_keeps_source_windows_live():
+    lyric = Lyric.from_lrc_str(SOURCE)
+    window = lyric[1000:3000]
+
+    copied = lyric.copy()
+    added = lyric[3000]
+    lyric.lyrics[TimeStamp(ms=1500)] = added
+    del copied.lyrics[TimeStamp(sec=2)]
+
+    assert [time.in_milliseconds for time in window] == [1000, 1500, 2000]
+    assert window[TimeStamp(ms=1500)] is added
+    assert [time.in_milliseconds for time in copied.lyrics] == [1000, 3000]
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+多时间标签的增强格式词句的往返读写
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import io
+
+from LyricLib import Lyric, TimeStamp
+
+SOURCE = "[00:01.00][00:03.00]<00:01.00>a<00:02.00>b<00:02.50>\n[00:05.00]c\n"
+
+
+def _dump(lyric: Lyric, compact: bool) -> str:
+    buffer = io.StringIO()
+    lyric.to_lrc(buffer, compact=compact)
+    return buffer.getvalue()
+
+
+def test_each_tag_gets_rebased_word_tags():
+    lyric = Lyric.from_lrc_str(SOURCE)
+    first = lyric.lyrics[TimeStamp(sec=1)]
+    second = lyric.lyrics[TimeStamp(sec=3)]
+
+    assert first is not second
+    assert [time.in_milliseconds for time in first.word_extension[0]] == [1000, 2000]
+    assert [time.in_milliseconds for time in second.word_extension[0]] == [3000, 4000]
+    assert first.duration == second.duration == TimeStamp(ms=1500)
+    assert lyric.whole_contexts == "abc"
+
+
+def test_expanded_round_trip():
+    text = _dump(Lyric.from_lrc_str(SOURCE), compact=False)
+
+    assert text == (
+        "[00:01.00]<00:01.00>a<00:02.00>b<00:02.50>\n"
+        "[00:03.00]<00:03.00>a<00:04.00>b<00:04.50>\n"
+        "[00:05.00]c\n"
+    )
+    assert _dump(Lyric.from_lrc_str(text), compact=False) == text
+
+
+def test_compact_round_trip():
+    assert _dump(Lyric.from_lrc_str(SOURCE), compact=True) == SOURCE
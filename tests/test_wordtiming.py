@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+"""
+插值生成的字词标签按 LRC 格式写出再读入后不变
+"""
+
+"""
+版权所有 © 2025 金羿ELS
+Copyright © 2025 Eilles
+
+开源相关声明请见 仓库根目录下的 License.md
+Terms & Conditions: License.md in the root directory
+"""
+
+# 睿乐组织 开发交流群 861684859
+# Email TriM-Organization@hotmail.com
+# 若需转载或借鉴 许可声明请查看仓库目录下的 License.md
+
+import io
+
+from LyricLib import Lyric, TimeStamp
+from LyricLib.wordtiming import distribute, fill_word_timing
+
+SOURCE = (
+    "[00:01.00]天 地 玄 黄\n[00:02.99]宇宙洪荒 the quick brown fox\n[01:00.00]日月\n"
+)
+
+
+def _word_times(lyric: Lyric):
+    return [
+        [[time.in_milliseconds for time in row] for row in block.word_extension]
+        for block in lyric.lyrics.values()
+    ]
+
+
+def test_distribute_keeps_whole_centiseconds():
+    assert distribute(1000, 2995, [1, 1, 1]) == [1000, 1660, 2330]
+
+
+def test_timetag_carries_rounded_centiseconds():
+    assert TimeStamp(ms=1995).to_lrc_timetag() == "00:02.00"
+    assert TimeStamp(ms=59996).to_lrc_timetag() == "01:00.00"
+    assert TimeStamp(ms=1994).to_lrc_timetag() == "00:01.99"
+
+
+def test_filled_word_timing_round_trip():
+    lyric = fill_word_timing(Lyric.from_lrc_str(SOURCE))
+    buffer = io.StringIO()
+    lyric.to_lrc(buffer)
+
+    assert _word_times(Lyric.from_lrc_str(buffer.getvalue())) == _word_times(lyric)